@@ -117,6 +117,39 @@ def take_last(x, y):
     """Reducer function: takes the most recent value. Used with Annotated state fields."""
     return y
 
+def merge_dicts(x, y):
+    """Reducer function: merges dict updates, so parallel branches can each add their own keys."""
+    return {**(x or {}), **(y or {})}
+
+# Risk panel speakers, in transcript order
+RISK_SPEAKERS = ("risky", "safe", "neutral")
+
+def merge_risk_debate_state(current, update):
+    """
+    Reducer for risk_debate_state.
+
+    A full RiskDebateState (initial state) replaces the current value. A
+    speaker update ({"speaker", "argument", "response"}) from one of the
+    parallel risk debaters is folded into that speaker's history, and the
+    shared transcript is rebuilt in RISK_SPEAKERS order - so the history reads
+    Risky, Safe, Neutral whichever debater finished first.
+    """
+    if not update:
+        return current
+    if "speaker" not in update:
+        return update
+
+    merged = dict(current or {})
+    speaker = update["speaker"]
+    merged[f"{speaker}_history"] = merged.get(f"{speaker}_history", "") + update["argument"]
+    merged[f"current_{speaker}_response"] = update.get("response", "")
+    merged["count"] = merged.get("count", 0) + 1
+
+    spoken = [s for s in RISK_SPEAKERS if merged.get(f"{s}_history")]
+    merged["history"] = "".join(merged[f"{s}_history"] for s in spoken)
+    merged["latest_speaker"] = spoken[-1] if spoken else ""
+    return merged
+
 class AgentState(MessagesState):
     company_of_interest: str
     company_name: str  # ADDED: Verified company name to prevent LLM hallucination
@@ -131,10 +164,10 @@ class AgentState(MessagesState):
     investment_plan: Annotated[str, take_last]
     consultant_review: Annotated[str, take_last]  # ADDED: External consultant cross-validation
     trader_investment_plan: Annotated[str, take_last]
-    risk_debate_state: Annotated[RiskDebateState, take_last]
+    risk_debate_state: Annotated[RiskDebateState, merge_risk_debate_state]
     final_trade_decision: Annotated[str, take_last]
     tools_called: Annotated[Dict[str, Set[str]], take_last]
-    prompts_used: Annotated[Dict[str, Dict[str, str]], take_last]
+    prompts_used: Annotated[Dict[str, Dict[str, str]], merge_dicts]
 
     # Red-flag detection fields
     red_flags: Annotated[List[Dict[str, Any]], take_last]
@@ -150,6 +183,32 @@ def get_context_from_config(config: RunnableConfig) -> Optional[Any]:
     except (AttributeError, TypeError):
         return None
 
+def raise_if_resumable(config: RunnableConfig, error: Exception) -> None:
+    """
+    Re-raise a node failure when the run is checkpointed.
+
+    Otherwise nodes degrade to an "Error: ..." output and the graph finishes,
+    which would mark the run completed. Raising stops the run at the failing
+    node, so --resume can retry it from the last checkpoint.
+    """
+    context = get_context_from_config(config)
+    if context is not None and getattr(context, "resumable", False):
+        raise error
+
+def get_memory_from_config(config: RunnableConfig, role: str, default: Optional[Any] = None) -> Optional[Any]:
+    """
+    Resolve a memory instance for this run.
+
+    Ticker memories injected at invoke time via TradingContext.ticker_memories
+    (keyed by role, e.g. "bull_memory") take precedence over the instance the
+    node was built with, so one compiled graph can serve many tickers.
+    """
+    context = get_context_from_config(config)
+    memories = getattr(context, "ticker_memories", None) if context else None
+    if memories and memories.get(role) is not None:
+        return memories[role]
+    return default
+
 def get_analysis_context(ticker: str) -> str:
     """Generate contextual analysis guidance based on asset type (ETF vs individual stock)."""
     etf_indicators = ['VTI', 'SPY', 'QQQ', 'IWM', 'VOO', 'VEA', 'VWO', 'BND', 'AGG', 'EFA', 'EEM', 'TLT', 'GLD', 'DIA']
@@ -233,10 +292,13 @@ def create_analyst_node(llm, agent_key: str, tools: List[Any], output_field: str
             return new_state
         except Exception as e:
             logger.error(f"Analyst node error {output_field}: {str(e)}")
+            raise_if_resumable(config, e)
             return {"messages": [AIMessage(content=f"Error: {str(e)}")], output_field: f"Error: {str(e)}"}
     return analyst_node
 
 def create_researcher_node(llm, memory: Optional[Any], agent_key: str) -> Callable:
+    memory_role = agent_key.replace("_researcher", "_memory")
+
     async def researcher_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
         from src.prompts import get_prompt
         agent_prompt = get_prompt(agent_key)
@@ -256,11 +318,12 @@ def create_researcher_node(llm, memory: Optional[Any], agent_key: str) -> Callab
 
         # If we have memory, retrieve RELEVANT past insights for THIS ticker
         past_insights = ""
-        if memory:
+        run_memory = get_memory_from_config(config, memory_role, memory)
+        if run_memory:
             try:
                 # FIX: Strictly enforce metadata filtering
                 # CORRECTED PARAMETER NAME: metadata_filter (was filter_metadata in some versions)
-                relevant = await memory.query_similar_situations(
+                relevant = await run_memory.query_similar_situations(
                     f"risks and upside for {ticker}",
                     n_results=3,
                     metadata_filter={"ticker": ticker}
@@ -303,6 +366,7 @@ Only use data explicitly related to {ticker} ({company_name}).
             return {"investment_debate_state": debate_state}
         except Exception as e:
             logger.error(f"Researcher error {agent_key}: {str(e)}")
+            raise_if_resumable(config, e)
             return {"investment_debate_state": state.get('investment_debate_state', {})}
     return researcher_node
 
@@ -323,6 +387,8 @@ def create_research_manager_node(llm, memory: Optional[Any]) -> Callable:
             )
             return {"investment_plan": response.content}
         except Exception as e:
+            logger.error(f"Research manager error: {str(e)}")
+            raise_if_resumable(config, e)
             return {"investment_plan": f"Error: {str(e)}"}
     return research_manager_node
 
@@ -347,18 +413,28 @@ def create_trader_node(llm, memory: Optional[Any]) -> Callable:
             )
             return {"trader_investment_plan": response.content}
         except Exception as e:
+            logger.error(f"Trader error: {str(e)}")
+            raise_if_resumable(config, e)
             return {"trader_investment_plan": f"Error: {str(e)}"}
     return trader_node
 
 def create_risk_debater_node(llm, agent_key: str) -> Callable:
+    """
+    Factory function creating risk debater nodes (risky / safe / neutral).
+
+    The debaters run in parallel and each returns a speaker update; the
+    merge_risk_debate_state reducer assembles the transcript.
+    """
+    speaker = agent_key.replace("_analyst", "")
+
     async def risk_node(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
         from src.prompts import get_prompt
         agent_prompt = get_prompt(agent_key)
         if not agent_prompt:
-            risk_state = state.get('risk_debate_state', {}).copy()
-            risk_state['history'] += f"\n[SYSTEM]: Error - Missing prompt for {agent_key}"
-            risk_state['count'] += 1
-            return {"risk_debate_state": risk_state}
+            return {"risk_debate_state": {
+                "speaker": speaker,
+                "argument": f"\n[SYSTEM]: Error - Missing prompt for {agent_key}",
+            }}
 
         # Include consultant review if available (external cross-validation)
         consultant = state.get('consultant_review', '')
@@ -371,12 +447,16 @@ def create_risk_debater_node(llm, agent_key: str) -> Callable:
                 [HumanMessage(content=prompt)],
                 context=agent_prompt.agent_name
             )
-            risk_state = state.get('risk_debate_state', {}).copy()
-            risk_state['history'] += f"\n{agent_prompt.agent_name}: {response.content}\n"
-            risk_state['count'] += 1
-            return {"risk_debate_state": risk_state}
+            return {"risk_debate_state": {
+                "speaker": speaker,
+                "argument": f"\n{agent_prompt.agent_name}: {response.content}\n",
+                "response": response.content,
+            }}
         except Exception as e:
-            return {"risk_debate_state": state.get('risk_debate_state', {})}
+            # No update: a stale full state would overwrite the other debaters' turns
+            logger.error(f"Risk debater error {agent_key}: {str(e)}")
+            raise_if_resumable(config, e)
+            return {}
     return risk_node
 
 def create_portfolio_manager_node(llm, memory: Optional[Any]) -> Callable:
@@ -425,6 +505,7 @@ def create_portfolio_manager_node(llm, memory: Optional[Any]) -> Callable:
             return {"final_trade_decision": response.content}
         except Exception as e:
             logger.error(f"PM error: {str(e)}")
+            raise_if_resumable(config, e)
             return {"final_trade_decision": f"Error: {str(e)}"}
     return pm_node
 
@@ -0,0 +1,151 @@
+"""
+Multi-Ticker Batch Runner
+Runs many graph invocations concurrently in one event loop.
+
+All runs share the process-wide compiled graph, the market data fetcher and
+its caches (fundamentals, FX, news/search), and every Gemini call - LLM and
+embedding - goes through GLOBAL_RATE_LIMITER. The batch scheduler only
+decides how many tickers are in flight: enough that the shared RPM budget
+never idles between sequential runs, few enough that queued calls do not
+pile up far beyond it. With GEMINI_TPM_LIMIT set, a new ticker is also held
+back while the tokens used in the last minute (all runs) are at 80% of that
+budget. Each ticker's result is handed to on_result as soon as it completes.
+"""
+
+import asyncio
+import math
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+# Rough LLM request rate of one run while it is active (15+ calls over a few minutes)
+RUN_REQUESTS_PER_MINUTE = float(os.environ.get("BATCH_RUN_RPM_ESTIMATE", "6"))
+MAX_BATCH_CONCURRENCY = int(os.environ.get("BATCH_MAX_CONCURRENCY", "16"))
+# Gemini tokens-per-minute budget gating new runs (0 = no token gate)
+TPM_LIMIT = int(os.environ.get("GEMINI_TPM_LIMIT", "0"))
+TPM_POLL_SECONDS = 5.0
+
+
+def default_concurrency(rpm_limit: Optional[int] = None) -> int:
+    """
+    Number of tickers to keep in flight for the configured Gemini RPM.
+
+    The rate limiter admits 80% of GEMINI_RPM_LIMIT (see llms.py); one more
+    run than that budget strictly needs keeps the bucket saturated while
+    runs sit in non-LLM phases (data fetches, memory, report writing).
+    """
+    rpm = rpm_limit if rpm_limit is not None else config.gemini_rpm_limit
+    usable_rpm = rpm * 0.8
+    return max(1, min(MAX_BATCH_CONCURRENCY, math.ceil(usable_rpm / RUN_REQUESTS_PER_MINUTE) + 1))
+
+
+async def wait_for_token_budget(tpm_limit: int = TPM_LIMIT) -> float:
+    """
+    Wait until the last minute's token usage is below 80% of tpm_limit.
+
+    Only admission of new runs is gated; calls of runs already in flight are
+    paced by GLOBAL_RATE_LIMITER. Returns the seconds waited.
+    """
+    if tpm_limit <= 0:
+        return 0.0
+    from src.token_tracker import get_tracker
+    tracker = get_tracker()
+    start = time.monotonic()
+    while tracker.tokens_in_window(60) >= tpm_limit * 0.8:
+        await asyncio.sleep(TPM_POLL_SECONDS)
+    return time.monotonic() - start
+
+
+def load_tickers(tickers: Optional[str] = None, tickers_file: Optional[str] = None) -> List[str]:
+    """
+    Collect tickers from a comma/space separated string and/or a file.
+
+    The file holds one or more tickers per line; blank lines and '#' comments
+    are ignored. Order is preserved and duplicates are dropped.
+    """
+    raw: List[str] = []
+    if tickers:
+        raw.extend(tickers.replace(",", " ").split())
+    if tickers_file:
+        for line in Path(tickers_file).read_text().splitlines():
+            line = line.split("#", 1)[0]
+            raw.extend(line.replace(",", " ").split())
+
+    seen = set()
+    result = []
+    for ticker in raw:
+        ticker = ticker.strip().upper()
+        if ticker and ticker not in seen:
+            seen.add(ticker)
+            result.append(ticker)
+    return result
+
+
+async def run_batch(
+    tickers: Iterable[str],
+    run_one: Callable[[str], Awaitable[Optional[dict]]],
+    on_result: Optional[Callable[[str, Optional[dict], float], Awaitable[None]]] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Optional[dict]]:
+    """
+    Run run_one for every ticker with at most `concurrency` in flight.
+
+    Args:
+        tickers: Tickers to analyse
+        run_one: Coroutine function returning the final graph state (or None on failure)
+        on_result: Awaited with (ticker, result, elapsed_seconds) as each run finishes
+        concurrency: Tickers in flight (default: default_concurrency())
+
+    Returns:
+        Dict mapping ticker to its result (None for failed runs)
+    """
+    tickers = list(tickers)
+    limit = concurrency or default_concurrency()
+    semaphore = asyncio.Semaphore(limit)
+    results: Dict[str, Optional[dict]] = {}
+
+    logger.info(
+        "batch_started",
+        tickers=len(tickers),
+        concurrency=limit,
+        rpm_limit=config.gemini_rpm_limit,
+        tpm_limit=TPM_LIMIT or None
+    )
+    batch_start = time.monotonic()
+
+    async def _run(ticker: str) -> None:
+        async with semaphore:
+            waited = await wait_for_token_budget()
+            if waited:
+                logger.info("batch_ticker_waited_for_tpm", ticker=ticker, seconds=round(waited, 1))
+            start = time.monotonic()
+            try:
+                result = await run_one(ticker)
+            except Exception as e:
+                logger.error("batch_ticker_failed", ticker=ticker, error=str(e))
+                result = None
+            elapsed = time.monotonic() - start
+            results[ticker] = result
+            logger.info("batch_ticker_done", ticker=ticker, ok=result is not None, seconds=round(elapsed, 1))
+            if on_result is not None:
+                try:
+                    await on_result(ticker, result, elapsed)
+                except Exception as e:
+                    logger.error("batch_result_handler_failed", ticker=ticker, error=str(e))
+
+    await asyncio.gather(*(_run(ticker) for ticker in tickers))
+
+    logger.info(
+        "batch_completed",
+        tickers=len(tickers),
+        succeeded=sum(1 for r in results.values() if r is not None),
+        seconds=round(time.monotonic() - batch_start, 1)
+    )
+    return results
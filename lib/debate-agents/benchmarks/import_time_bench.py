@@ -0,0 +1,132 @@
+"""
+Import-time budget: fails when importing a src module gets slower than its
+budget or starts building heavy singletons again.
+
+Each module is imported in a fresh interpreter with `python -X importtime`;
+the cumulative time reported for the module itself is compared against
+IMPORT_BUDGETS_MS (best of --repeat runs, to absorb disk-cache noise). The
+same interpreter then asserts that the lazy singletons (market data fetcher,
+Tavily tool, default LLM clients) were not created by the import.
+
+Usage (from lib/debate-agents, with the package importable as `src`):
+    python -m src.benchmarks.import_time_bench [--repeat 3] [--scale 1.5]
+
+Exit status is 1 if any budget or laziness check fails. Budgets can be
+overridden per module with IMPORT_BUDGET_MS_<MODULE> (dots as underscores,
+e.g. IMPORT_BUDGET_MS_SRC_TOOLKIT=2500).
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Cumulative import time budgets in milliseconds. src.main, src.config and
+# src.report_generator cover `--help`, health checks and the quiet-mode
+# reporter, which must stay sub-second.
+#
+# Budget = measured x 1.5 (margin for host noise), rounded up to 50 ms. "measured" is the
+# slowest best-of-5 over five runs of this script (2026-10-16, Linux, 1 vCPU,
+# Python 3.11.7, langchain-core 1.6.9, langchain-google-genai 4.4.1,
+# pandas 3.0.6, yfinance 1.7.0, structlog 26.1.0, rich 15.0.0):
+#
+#   module                  measured ms (5 runs)        max   budget
+#   src.config              193 169 170 199 176         199      300
+#   src.report_generator     32  30  32  32  30          32       50
+#   src.main                197 172 190 205 194         205      350
+#   src.memory              209 215 176 206 192         215      350
+#   src.llms               1535 1379 1494 1480 1564    1564     2350
+#   src.toolkit             not measured (stockstats unavailable there)   3000
+#
+# src.toolkit keeps its provisional budget until it is measured the same way
+# on a host with stockstats installed. Re-measure after dependency upgrades.
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "src.config": 300,
+    "src.report_generator": 50,
+    "src.main": 350,
+    "src.memory": 350,
+    "src.llms": 2350,
+    "src.toolkit": 3000,
+}
+
+# Statements run after the import; each must hold for a lazy module
+LAZINESS_CHECKS: Dict[str, List[str]] = {
+    "src.toolkit": [
+        "import src.data.fetcher as m; assert m._fetcher is None, 'fetcher built at import'",
+        "import src.toolkit as m; assert not m._tavily_resolved, 'Tavily tool built at import'",
+    ],
+    "src.llms": [
+        "import src.llms as m; assert not m._default_llms, 'default LLMs built at import'",
+    ],
+    "src.memory": [
+        "import sys; assert 'langchain_google_genai' not in sys.modules, 'embeddings stack imported'",
+        "import src.memory as m; assert not m._chroma_clients, 'Chroma client opened at import'",
+    ],
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S.*)$")
+
+
+def budget_for(module: str, scale: float) -> float:
+    env_key = "IMPORT_BUDGET_MS_" + module.upper().replace(".", "_")
+    return float(os.environ.get(env_key, IMPORT_BUDGETS_MS[module])) * scale
+
+
+def measure(module: str) -> Tuple[Optional[float], Optional[str]]:
+    """Cumulative import time of module in ms, plus the first laziness failure (if any)."""
+    checks = "\n".join(LAZINESS_CHECKS.get(module, []))
+    code = f"import {module}\n{checks}"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env
+    )
+
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(3).strip() == module:
+            cumulative_us = int(match.group(2))
+
+    failure = None
+    if proc.returncode != 0:
+        failure = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+    return (cumulative_us / 1000.0 if cumulative_us is not None else None), failure
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the best one is kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow CI hosts)")
+    parser.add_argument("modules", nargs="*", help="Modules to check (default: all budgeted)")
+    args = parser.parse_args()
+
+    modules = args.modules or list(IMPORT_BUDGETS_MS)
+    failed = False
+    print(f"{'module':<24}{'best ms':>10}{'budget ms':>12}  result")
+    for module in modules:
+        timings, failure = [], None
+        for _ in range(args.repeat):
+            ms, failure = measure(module)
+            if failure:
+                break
+            if ms is not None:
+                timings.append(ms)
+
+        budget = budget_for(module, args.scale)
+        if failure:
+            failed = True
+            print(f"{module:<24}{'-':>10}{budget:>12.0f}  FAIL ({failure})")
+            continue
+        best = min(timings) if timings else float("nan")
+        ok = bool(timings) and best <= budget
+        failed = failed or not ok
+        print(f"{module:<24}{best:>10.0f}{budget:>12.0f}  {'ok' if ok else 'OVER BUDGET'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
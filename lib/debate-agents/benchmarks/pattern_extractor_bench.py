@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: FinancialPatternExtractor single-pass engine vs. sequential search.
+
+Builds Tavily-style search dumps (long single-line snippets of scraped finance
+pages, 15-50 KB) and times extract_from_text against the previous strategy of
+running every field pattern over the whole text. Also reports where the two
+disagree: expected only when the sequential search pairs a keyword with a
+number further than ANCHOR_WINDOW away (e.g. "est" in "interest" with an
+unrelated "19.7x" later on the line).
+
+Usage (from lib/debate-agents, with the package importable as `src`):
+    python -m src.benchmarks.pattern_extractor_bench [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.data.pattern_extractor import FinancialPatternExtractor
+
+FILLER = [
+    "Shares of the company rose in early trading as investors digested the latest quarterly update",
+    "the largest shareholders increased their interest in the stock over the past year",
+    "analysts at several brokerages said the estimate revisions reflect stronger demand in the US",
+    "management reiterated its guidance and highlighted the pricing environment in Europe and Asia",
+    "the best performing sectors this week included technology and consumer discretionary",
+    "revenue trends across the region were mixed, with the Americas offsetting softness elsewhere",
+    "the company trades on the main board and is a constituent of the benchmark index",
+    "price action remained choppy while volume was below the thirty day average",
+    "investors are watching the interest rate outlook and the latest inflation prints",
+    "Copyright 2025. All rights reserved. Terms of use. Privacy policy. Cookie settings",
+]
+
+FACTS = [
+    "Trailing P/E (TTM): 28.45",
+    "Forward P/E of 24.10x based on consensus estimates",
+    "Price to Book ratio: 5.62",
+    "Return on Equity (ROE) was 18.3% for the fiscal year",
+    "Market Cap 2,845.3B",
+    "EV/EBITDA 19.7x",
+    "covered by 34 analysts with a consensus rating of Buy",
+    "US revenue accounted for roughly 42.5% of total sales",
+]
+
+
+def make_dump(size: int, seed: int, with_facts: bool = True) -> str:
+    """One Tavily-style dump: a few very long lines, facts buried in filler."""
+    rng = random.Random(seed)
+    parts = []
+    while sum(len(p) for p in parts) < size:
+        parts.append(rng.choice(FILLER))
+        if with_facts and rng.random() < 0.02:
+            parts.append(rng.choice(FACTS))
+    # Tavily joins page snippets with newlines; each snippet is one long line
+    lines, line = [], []
+    for part in parts:
+        line.append(part)
+        if rng.random() < 0.01:
+            lines.append(". ".join(line))
+            line = []
+    lines.append(". ".join(line))
+    return "\n".join(lines)
+
+
+class SequentialExtractor(FinancialPatternExtractor):
+    """Previous behaviour: every pattern searched over the whole text."""
+
+    def _anchor_positions(self, content):
+        return {}
+
+    def _find(self, content, spec, positions):
+        return spec.regex.search(content)
+
+
+def bench(extractor, docs, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            extractor.extract_from_text(doc)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    docs = [make_dump(size, seed) for seed, size in enumerate([15_000, 25_000, 35_000, 50_000] * 3)]
+    docs += [make_dump(50_000, 100 + i, with_facts=False) for i in range(3)]  # no hits: worst case
+
+    single, sequential = FinancialPatternExtractor(), SequentialExtractor()
+
+    mismatches = 0
+    for doc in docs:
+        a, b = single.extract_from_text(doc), sequential.extract_from_text(doc)
+        if a != b:
+            mismatches += 1
+            print(f"  mismatch ({len(doc)} chars):\n    single-pass: {a}\n    sequential:  {b}")
+
+    new_median, new_max = bench(single, docs, args.repeat)
+    old_median, old_max = bench(sequential, docs, args.repeat)
+    total_kb = sum(len(d) for d in docs) / 1024
+
+    print(f"{len(docs)} dumps, {total_kb:.0f} KB total, {args.repeat} repeats")
+    print(f"sequential : median {old_median * 1000:8.1f} ms  max {old_max * 1000:8.1f} ms")
+    print(f"single-pass: median {new_median * 1000:8.1f} ms  max {new_max * 1000:8.1f} ms")
+    print(f"speedup    : {old_median / new_median:.1f}x   output mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Durable Graph Checkpoints
+SQLite-backed LangGraph checkpointer plus a small run index, both under
+config.data_cache_dir, so a run that dies mid-graph (429, timeout, crash)
+can be resumed from its last completed super-step instead of re-spending
+every LLM call.
+
+Each run is a LangGraph thread keyed by (ticker, trade_date, run_id). The
+run index records ticker, trade date, mode and status per thread so the CLI
+can find the latest unfinished run for a ticker and resume it.
+
+Requires the optional `langgraph-checkpoint-sqlite` package; without it runs
+proceed without checkpoints.
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+try:
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    CHECKPOINTS_AVAILABLE = True
+except ImportError:
+    AsyncSqliteSaver = None
+    CHECKPOINTS_AVAILABLE = False
+    logger.warning("langgraph_checkpoint_sqlite_not_available", msg="Graph runs will not be resumable")
+
+CHECKPOINT_DB_FILENAME = "checkpoints.sqlite"
+RUN_INDEX_DB_FILENAME = "runs.sqlite"
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+
+
+def new_run_id() -> str:
+    """Short random identifier for a graph run."""
+    return uuid.uuid4().hex[:12]
+
+
+def make_thread_id(ticker: str, trade_date: str, run_id: str) -> str:
+    """LangGraph thread_id for one run: ticker:trade_date:run_id."""
+    return f"{ticker.strip().upper()}:{trade_date}:{run_id}"
+
+
+class RunIndex:
+    """
+    Index of checkpointed runs (one row per thread), used to look up the
+    ticker, trade date and mode of a run before resuming it.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / RUN_INDEX_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                thread_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                trade_date TEXT NOT NULL,
+                quick_mode INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_ticker ON runs (ticker, updated_at);
+            """
+        )
+        self._conn.commit()
+
+    def start(self, run_id: str, ticker: str, trade_date: str, quick_mode: bool) -> str:
+        """Register a new run and return its thread_id."""
+        thread_id = make_thread_id(ticker, trade_date, run_id)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)",
+                (run_id, thread_id, ticker.strip().upper(), trade_date, int(quick_mode), RUN_RUNNING, now, now)
+            )
+            self._conn.commit()
+        return thread_id
+
+    def set_status(self, run_id: str, status: str, error: Optional[str] = None) -> None:
+        """Record the outcome of a run (running / completed / failed)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, error = ?, updated_at = ? WHERE run_id = ?",
+                (status, error, time.time(), run_id)
+            )
+            self._conn.commit()
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Run record by id, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def latest_unfinished(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Most recently updated run for ticker that did not complete, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM runs WHERE ticker = ? AND status != ? ORDER BY updated_at DESC LIMIT 1",
+                (ticker.strip().upper(), RUN_COMPLETED)
+            ).fetchone()
+        return dict(row) if row else None
+
+
+_run_index: Optional[RunIndex] = None
+
+
+def get_run_index() -> RunIndex:
+    """Process-wide RunIndex (lazy initialization)."""
+    global _run_index
+    if _run_index is None:
+        _run_index = RunIndex()
+    return _run_index
+
+
+@asynccontextmanager
+async def open_checkpointer(path: Optional[Path] = None) -> AsyncIterator[Optional[Any]]:
+    """
+    Open the SQLite checkpointer for the duration of a run.
+
+    Yields None when checkpoints are disabled (CHECKPOINTS_ENABLED=false) or
+    langgraph-checkpoint-sqlite is not installed, so callers can always use
+    `async with open_checkpointer() as saver:`.
+    """
+    if not (config.checkpoints_enabled and CHECKPOINTS_AVAILABLE):
+        yield None
+        return
+
+    db_path = Path(path) if path else Path(config.data_cache_dir) / CHECKPOINT_DB_FILENAME
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(str(db_path)) as saver:
+        yield saver
@@ -203,6 +203,15 @@ class Config:
     # Default: 15 RPM (free tier) - Set GEMINI_RPM_LIMIT in .env to override
     gemini_rpm_limit: int = int(os.environ.get("GEMINI_RPM_LIMIT", "15"))
 
+    # Worker threads for blocking yfinance/yahooquery calls (see data/executor.py)
+    market_data_io_workers: int = int(os.environ.get("MARKET_DATA_IO_WORKERS", "8"))
+
+    # Persistent fundamentals cache (SQLite under data_cache_dir)
+    fundamentals_cache_enabled: bool = os.environ.get("FUNDAMENTALS_CACHE", "true").lower() == "true"
+
+    # Durable graph checkpoints for resumable runs (SQLite under data_cache_dir, see checkpoints.py)
+    checkpoints_enabled: bool = os.environ.get("CHECKPOINTS_ENABLED", "true").lower() == "true"
+
     chroma_persist_directory: str = os.environ.get("CHROMA_PERSIST_DIR", "./chroma_db")
     environment: str = os.environ.get("ENVIRONMENT", "dev")
     
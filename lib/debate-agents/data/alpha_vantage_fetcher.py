@@ -3,7 +3,8 @@ Alpha Vantage Data Fetcher
 High-quality fundamental data source with strict rate limit handling.
 
 Free Tier Limits: 25 requests/day, 5 requests/minute.
-Strategy: Use until exhausted, then silent fail (Circuit Breaker).
+Strategy: Calls are rationed by the shared quota scheduler (src.data.quota);
+once the daily bucket is spent we silently skip until it resets.
 """
 
 import os
@@ -12,6 +13,9 @@ import asyncio
 import structlog
 from typing import Optional, Dict, Any
 
+from src.data.http_session import get_http_session
+from src.data.quota import get_quota_scheduler, ticker_priority
+
 logger = structlog.get_logger(__name__)
 
 
@@ -20,7 +24,7 @@ class AlphaVantageFetcher:
     Async client for Alpha Vantage with automatic rate limit handling.
 
     Features:
-    - Circuit breaker: stops after hitting rate limit
+    - Quota-aware: minute/day buckets shared across processes
     - Async requests with timeout
     - Field mapping to internal schema
     """
@@ -28,29 +32,24 @@ class AlphaVantageFetcher:
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('ALPHAVANTAGE_API_KEY')
         self.base_url = "https://www.alphavantage.co/query"
-        self._session = None
-        self._is_exhausted = False  # Circuit breaker
 
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
         return self
 
     async def __aexit__(self, *args):
-        if self._session:
-            await self._session.close()
+        # The shared HTTP session is closed at shutdown (close_http_session)
+        pass
 
     def is_available(self) -> bool:
         """Check if configured and quota remaining."""
-        has_key = self.api_key is not None and self.api_key != ""
-        not_exhausted = not self._is_exhausted
-
         # Only log unavailability reasons at debug level (respects --quiet flag)
-        if not has_key:
+        if not self.api_key:
             logger.debug("alpha_vantage_unavailable", reason="no_api_key")
-        elif self._is_exhausted:
+            return False
+        if not get_quota_scheduler().has_capacity('alpha_vantage'):
             logger.debug("alpha_vantage_unavailable", reason="rate_limit_exhausted")
-
-        return has_key and not_exhausted
+            return False
+        return True
 
     async def get_financial_metrics(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -65,8 +64,10 @@ class AlphaVantageFetcher:
         if not self.is_available():
             return None
 
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        if not await get_quota_scheduler().acquire('alpha_vantage', ticker_priority(symbol)):
+            return None
+
+        session = get_http_session()
 
         # Alpha Vantage uses standard ticker format (0005.HK, AAPL, etc.)
         params = {
@@ -78,7 +79,7 @@ class AlphaVantageFetcher:
         try:
             logger.debug("alpha_vantage_request", symbol=symbol)
 
-            async with self._session.get(
+            async with session.get(
                 self.base_url,
                 params=params,
                 timeout=aiohttp.ClientTimeout(total=10)
@@ -105,7 +106,7 @@ class AlphaVantageFetcher:
                         logger.info("alpha_vantage_rate_limit_hit",
                                    symbol=symbol,
                                    message="Daily quota exhausted (25 requests/day free tier)")
-                        self._is_exhausted = True
+                        get_quota_scheduler().report_exhausted('alpha_vantage')
                         return None
 
                 # Check for "Information" field (often used for errors)
@@ -0,0 +1,320 @@
+"""
+Persistent Fundamentals Cache
+SQLite store under config.data_cache_dir for merged fundamentals and raw per-source payloads.
+
+TTL classes:
+- price:     quote-driven fields (price, market cap, P/E...) - minutes
+- reference: descriptive fields (names, sector, currency...)  - one day
+- statement: ratios derived from filings (margins, growth, leverage, cash flow) - days
+
+Raw payloads are kept on their provider's clock, but price-class fields in
+them always expire on the price TTL: a statement-clock payload (FMP, EODHD,
+Alpha Vantage also report price / market cap) is served without its price
+fields once those are older than FUNDAMENTALS_PRICE_TTL.
+
+Merged fields keep the provenance produced by _smart_merge_with_quality
+(source name and quality score per field), so a cache hit is indistinguishable
+from a fresh merge. Raw payloads let the fetcher skip individual providers
+(in particular the quota-limited Alpha Vantage / EODHD / FMP feeds) while
+their data is still fresh.
+
+Web search results used for gap-filling are cached by normalized query string.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+CACHE_DB_FILENAME = "fundamentals.sqlite"
+
+TTL_SECONDS = {
+    'price': int(os.environ.get("FUNDAMENTALS_PRICE_TTL", str(15 * 60))),
+    'reference': int(os.environ.get("FUNDAMENTALS_REFERENCE_TTL", str(24 * 3600))),
+    'statement': int(os.environ.get("FUNDAMENTALS_STATEMENT_TTL", str(3 * 24 * 3600))),
+}
+
+PRICE_FIELDS = {
+    'currentPrice', 'regularMarketPrice', 'previousClose', 'open', 'dayHigh', 'dayLow',
+    'bid', 'ask', 'volume', 'regularMarketVolume', 'averageVolume', 'marketCap',
+    'enterpriseValue', 'trailingPE', 'forwardPE', 'priceToBook', 'pegRatio',
+    'priceToSalesTrailing12Months', 'enterpriseToEbitda', 'enterpriseToRevenue',
+    'fiftyDayAverage', 'twoHundredDayAverage', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow',
+    'dividendYield', 'beta',
+}
+
+STATEMENT_FIELDS = {
+    'returnOnEquity', 'returnOnAssets', 'profitMargins', 'operatingMargins', 'grossMargins',
+    'revenueGrowth', 'earningsGrowth', 'debtToEquity', 'currentRatio', 'quickRatio',
+    'freeCashflow', 'operatingCashflow', 'totalCash', 'totalDebt', 'totalRevenue',
+    'bookValue', 'ebitda', 'netIncomeToCommon', 'sharesOutstanding', 'us_revenue_pct',
+}
+
+SEARCH_RESULT_TTL_SECONDS = int(os.environ.get("SEARCH_RESULT_TTL", str(24 * 3600)))
+
+# Sources whose payloads are dominated by quotes refresh on the price clock;
+# fundamentals-only feeds (and the quota-limited ones) refresh on the statement
+# clock, minus their price fields (see without_stale_prices).
+SOURCE_TTL_CLASS = {
+    'yfinance': 'price',
+    'yahooquery': 'price',
+    'fmp': 'statement',
+    'eodhd': 'statement',
+    'alpha_vantage': 'statement',
+}
+
+
+def normalize_symbol(symbol: str) -> str:
+    """Cache key form of a ticker symbol."""
+    return (symbol or "").strip().upper()
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a search query: case- and whitespace-insensitive."""
+    return re.sub(r"\s+", " ", (query or "").strip().lower())
+
+
+def ttl_class_for_field(field: str, source_tag: Optional[str] = None) -> str:
+    """Classify a field into a TTL class, honouring statement-derived source tags."""
+    if field in PRICE_FIELDS:
+        return 'price'
+    if field in STATEMENT_FIELDS or (source_tag and 'statement' in source_tag):
+        return 'statement'
+    return 'reference'
+
+
+def without_stale_prices(payload: Dict[str, Any], age_seconds: float) -> Dict[str, Any]:
+    """Payload with its price-class fields (and their source tags) dropped once past the price TTL."""
+    if age_seconds <= TTL_SECONDS['price']:
+        return payload
+    return {
+        k: v for k, v in payload.items()
+        if k not in PRICE_FIELDS and not (k.startswith('_') and k.endswith('_source') and k[1:-7] in PRICE_FIELDS)
+    }
+
+
+class FundamentalsCache:
+    """
+    SQLite-backed cache shared by every fetcher in the process (and across
+    processes pointing at the same DATA_CACHE_DIR).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / CACHE_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fundamentals (
+                symbol TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT,
+                source TEXT,
+                quality REAL,
+                ttl_class TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (symbol, field)
+            );
+            CREATE TABLE IF NOT EXISTS source_payloads (
+                symbol TEXT NOT NULL,
+                source TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (symbol, source)
+            );
+            CREATE TABLE IF NOT EXISTS search_results (
+                query TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    # --- Merged fundamentals ---
+
+    def get_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached merged record if every data field is within its TTL.
+        Metadata fields (leading underscore) ride along with the data fields.
+        """
+        key = normalize_symbol(symbol)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT field, value, source, quality, ttl_class, fetched_at FROM fundamentals WHERE symbol = ?",
+                (key,)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        now = time.time()
+        data: Dict[str, Any] = {}
+        field_sources: Dict[str, str] = {}
+        field_quality: Dict[str, float] = {}
+
+        for field, value, source, quality, ttl_class, fetched_at in rows:
+            if ttl_class != 'meta' and now - fetched_at > TTL_SECONDS.get(ttl_class, 0):
+                return None
+            data[field] = json.loads(value)
+            if source:
+                field_sources[field] = source
+            if quality is not None:
+                field_quality[field] = quality
+
+        data['_field_sources'] = field_sources
+        data['_field_quality'] = field_quality
+        data['_cache_hit'] = True
+        return data
+
+    def put_fundamentals(
+        self,
+        symbol: str,
+        data: Dict[str, Any],
+        field_sources: Optional[Dict[str, str]] = None,
+        field_quality: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Store a merged record, replacing whatever was cached for the symbol."""
+        key = normalize_symbol(symbol)
+        field_sources = field_sources or {}
+        field_quality = field_quality or {}
+        now = time.time()
+
+        rows = []
+        for field, value in data.items():
+            if value is None or field in ('_field_sources', '_field_quality', '_cache_hit'):
+                continue
+            if field.startswith('_'):
+                ttl_class = 'meta'
+            else:
+                ttl_class = ttl_class_for_field(field, data.get(f"_{field}_source"))
+            rows.append((
+                key, field, json.dumps(value, default=str),
+                field_sources.get(field), field_quality.get(field), ttl_class, now
+            ))
+
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM fundamentals WHERE symbol = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO fundamentals (symbol, field, value, source, quality, ttl_class, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        except sqlite3.Error as e:
+            logger.warning("fundamentals_cache_write_failed", symbol=key, error=str(e))
+
+    # --- Raw per-source payloads ---
+
+    def get_source_payloads(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Unexpired raw payloads for a symbol, keyed by source name. Price
+        fields older than the price TTL are left out, so a stale quote can
+        never pass for a fresh one.
+        """
+        key = normalize_symbol(symbol)
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, payload, fetched_at FROM source_payloads WHERE symbol = ? AND expires_at > ?",
+                (key, now)
+            ).fetchall()
+        return {
+            source: without_stale_prices(json.loads(payload), now - fetched_at)
+            for source, payload, fetched_at in rows
+        }
+
+    def put_source_payload(self, symbol: str, source: str, payload: Dict[str, Any]) -> None:
+        """Store one provider's raw payload on that provider's TTL clock."""
+        if not payload:
+            return
+        key = normalize_symbol(symbol)
+        now = time.time()
+        ttl = TTL_SECONDS[SOURCE_TTL_CLASS.get(source, 'reference')]
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO source_payloads (symbol, source, payload, fetched_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, source, json.dumps(payload, default=str), now, now + ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning("source_payload_cache_write_failed", symbol=key, source=source, error=str(e))
+
+    # --- Web search results ---
+
+    def get_search_result(self, query: str) -> Optional[Any]:
+        """Unexpired cached result for a search query."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM search_results WHERE query = ? AND expires_at > ?",
+                (normalize_query(query), time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_search_result(self, query: str, payload: Any, ttl: int = SEARCH_RESULT_TTL_SECONDS) -> None:
+        """Store a search result under its normalized query."""
+        if not payload:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO search_results (query, payload, expires_at) VALUES (?, ?, ?)",
+                    (normalize_query(query), json.dumps(payload, default=str), time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning("search_result_cache_write_failed", error=str(e))
+
+    # --- Maintenance ---
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop cached data for one symbol, or everything."""
+        with self._lock, self._conn:
+            if symbol:
+                key = normalize_symbol(symbol)
+                self._conn.execute("DELETE FROM fundamentals WHERE symbol = ?", (key,))
+                self._conn.execute("DELETE FROM source_payloads WHERE symbol = ?", (key,))
+            else:
+                self._conn.execute("DELETE FROM fundamentals")
+                self._conn.execute("DELETE FROM source_payloads")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Row counts for monitoring."""
+        with self._lock:
+            symbols = self._conn.execute("SELECT COUNT(DISTINCT symbol) FROM fundamentals").fetchone()[0]
+            payloads = self._conn.execute("SELECT COUNT(*) FROM source_payloads").fetchone()[0]
+            searches = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+        return {'path': str(self.path), 'symbols': symbols, 'source_payloads': payloads, 'search_results': searches}
+
+
+# Singleton Pattern
+_fundamentals_cache: Optional[FundamentalsCache] = None
+
+
+def get_fundamentals_cache() -> Optional[FundamentalsCache]:
+    """
+    Get or create the process-wide cache.
+    Returns None (caching disabled) if the database cannot be opened.
+    """
+    global _fundamentals_cache
+    if _fundamentals_cache is None:
+        try:
+            _fundamentals_cache = FundamentalsCache()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("fundamentals_cache_unavailable", error=str(e))
+            return None
+    return _fundamentals_cache
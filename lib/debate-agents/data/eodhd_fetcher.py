@@ -5,7 +5,8 @@ High-quality, cost-effective fallback for international/ex-US equities.
 Handles:
 - Fundamentals (Valuation, Profitability, Growth)
 - Smart Ticker Normalization (YFinance -> EODHD format)
-- Rate Limit Circuit Breaking (stops requests after 429/402 errors)
+- Quota scheduling (src.data.quota): minute/day buckets shared across processes;
+  a 429 marks the day bucket spent until it resets
 
 Error Codes Handled (per EODHD Docs):
 - 401/403: Invalid Token
@@ -18,31 +19,32 @@ import aiohttp
 import logging
 from typing import Optional, Dict, Any
 
+from src.data.http_session import get_http_session
+from src.data.executor import run_blocking
+from src.data.quota import get_quota_scheduler, is_daily_limit_response, ticker_priority
+
 logger = logging.getLogger(__name__)
 
 class EODHDFetcher:
     """
     Async client for EOD Historical Data.
-    Maintains state to stop requests if API limits are hit.
+    Requests are rationed by the shared quota scheduler.
     """
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('EODHD_API_KEY')
         self.base_url = "https://eodhd.com/api"
-        self._session = None
-        self._is_exhausted = False  # Circuit breaker for rate limits
         
     async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
         return self
-    
+
     async def __aexit__(self, *args):
-        if self._session:
-            await self._session.close()
+        # The shared HTTP session is closed at shutdown (close_http_session)
+        pass
 
     def is_available(self) -> bool:
         """Check if configured and not rate-limited."""
-        return self.api_key is not None and not self._is_exhausted
+        return self.api_key is not None and get_quota_scheduler().has_capacity('eodhd')
 
     def _normalize_ticker(self, ticker: str) -> str:
         """
@@ -73,15 +75,17 @@ class EODHDFetcher:
         if not self.is_available():
             return None
 
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        if not await get_quota_scheduler().acquire('eodhd', ticker_priority(symbol)):
+            return None
+
+        session = get_http_session()
 
         eod_symbol = self._normalize_ticker(symbol)
         url = f"{self.base_url}/fundamentals/{eod_symbol}"
         params = {"api_token": self.api_key, "fmt": "json"}
 
         try:
-            async with self._session.get(url, params=params, timeout=10) as response:
+            async with session.get(url, params=params, timeout=10) as response:
 
                 # --- Error Handling & Circuit Breaking ---
                 if response.status == 200:
@@ -93,8 +97,13 @@ class EODHDFetcher:
                     return self._parse_fundamentals(data)
                 
                 elif response.status == 429:
-                    logger.error(f"EODHD API Limit Exceeded (429). Disabling EODHD for this session.")
-                    self._is_exhausted = True
+                    # EODHD answers 429 for the per-minute limit as well as the daily one
+                    if is_daily_limit_response(await response.text()):
+                        logger.error("EODHD daily API limit exceeded (429). Disabling EODHD until the daily quota resets.")
+                        await run_blocking(get_quota_scheduler().report_exhausted, 'eodhd')
+                    else:
+                        logger.warning(f"EODHD rate limit reached (429) for {eod_symbol}; backing off for the minute")
+                        await run_blocking(get_quota_scheduler().report_rate_limited, 'eodhd')
                     return None
                 
                 elif response.status == 402:
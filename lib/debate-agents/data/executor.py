@@ -0,0 +1,130 @@
+"""
+Bounded Executor for Blocking Market-Data I/O
+yfinance and yahooquery are synchronous HTTP clients. Every call into them
+(info, fast_info, statements, history, yahooquery modules) goes through this
+pool so async callers never block the event loop on network I/O.
+
+The pool is sized by MARKET_DATA_IO_WORKERS. Calls beyond that queue up;
+queue depth and time spent waiting for a worker are tracked so saturation
+shows up in get_stats() instead of as mysterious latency.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Waits above this are logged: the pool is saturated and should be resized
+SLOW_WAIT_WARNING_SECONDS = 1.0
+
+
+class BlockingIOExecutor:
+    """Size-bounded thread pool with queue-depth and wait-time metrics."""
+
+    def __init__(self, max_workers: int, name: str = "market-data-io"):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'max_queue_depth': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+        }
+
+    def _track_queued(self) -> None:
+        with self._lock:
+            self._queued += 1
+            self.stats['submitted'] += 1
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._queued)
+
+    def _untrack_cancelled(self, future: Future) -> None:
+        """Done-callback: a call cancelled before a worker picked it up leaves the queue here."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self.stats['cancelled'] += 1
+
+    def _call(self, func: Callable[..., T], submitted_at: float) -> T:
+        """Runs on a worker thread: record wait time, then do the blocking work."""
+        waited = time.monotonic() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self.stats['total_wait_seconds'] += waited
+            self.stats['max_wait_seconds'] = max(self.stats['max_wait_seconds'], waited)
+
+        if waited > SLOW_WAIT_WARNING_SECONDS:
+            logger.warning("blocking_io_queue_wait", executor=self.name, waited_s=round(waited, 2),
+                           queue_depth=self._queued, max_workers=self.max_workers)
+
+        try:
+            result = func()
+        except Exception:
+            with self._lock:
+                self.stats['failed'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.stats['completed'] += 1
+        return result
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the pool and await its result."""
+        # Carry context (structlog bindings, run-scoped state) into the worker
+        ctx = contextvars.copy_context()
+        call = partial(ctx.run, func, *args, **kwargs)
+        self._track_queued()
+        # Cancelling the awaiting task (wait_for expiry) cancels a call still
+        # queued, as does shutdown(); _call never runs for those
+        future = self._pool.submit(self._call, call, time.monotonic())
+        future.add_done_callback(self._untrack_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['queue_depth'] = self._queued
+            stats['running'] = self._running
+        stats['max_workers'] = self.max_workers
+        started = stats['completed'] + stats['running']
+        stats['avg_wait_seconds'] = stats['total_wait_seconds'] / started if started else 0.0
+        return stats
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton Pattern
+_market_data_executor: Optional[BlockingIOExecutor] = None
+
+
+def get_market_data_executor() -> BlockingIOExecutor:
+    """Get or create the process-wide executor for yfinance/yahooquery calls."""
+    global _market_data_executor
+    if _market_data_executor is None:
+        _market_data_executor = BlockingIOExecutor(config.market_data_io_workers)
+    return _market_data_executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Shorthand for get_market_data_executor().run(...)."""
+    return await get_market_data_executor().run(func, *args, **kwargs)
@@ -5,10 +5,15 @@ UPDATED: Integrated EOD Historical Data (EODHD) for international coverage.
 FIXED: Smart Merge logic now correctly respects field-specific quality tags.
 
 Strategy:
-1. Launch ALL sources in parallel (yfinance, yahooquery, FMP, EODHD, Alpha Vantage)
+1. Launch sources concurrently (yfinance, yahooquery, FMP, EODHD, Alpha Vantage)
+   under one shared deadline; return early once basics + target coverage are met.
+   Sources that historically add nothing for the exchange are skipped (data/routing.py)
 2. Enhance yfinance with financial statement extraction
 3. Smart merge with quality scoring (Statements > EODHD > Alpha Vantage/yfinance > FMP > Yahoo Info)
 4. Mandatory Tavily gap-fill if coverage <70%
+
+Watchlists go through get_financial_metrics_many(), which prefetches yahooquery
+modules for whole symbol batches in one call and streams per-ticker results.
 """
 
 import yfinance as yf
@@ -17,13 +22,20 @@ import numpy as np
 import asyncio
 import structlog
 import os
-import re
-from typing import Dict, Any, Optional, List, Tuple
+from functools import partial
+from typing import Dict, Any, Optional, List, Tuple, Iterable, AsyncIterator, Callable, Awaitable
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from collections import namedtuple
 
+from src.config import config
 from src.ticker_utils import generate_strict_search_query
+from src.data.cache import get_fundamentals_cache
+from src.data.executor import run_blocking, get_market_data_executor
+from src.data.singleflight import provider_call, get_provider_flight
+from src.data.price_store import get_price_store, is_supported_period, slice_history
+from src.data.routing import coverage_baselines, get_source_router, payload_fields
+from src.data.pattern_extractor import FinancialPatternExtractor
 
 logger = structlog.get_logger(__name__)
 
@@ -66,11 +78,28 @@ except ImportError:
 
 # Constants
 MIN_INFO_FIELDS = 3
-ROE_PERCENTAGE_THRESHOLD = 1.0
 DEBT_EQUITY_PERCENTAGE_THRESHOLD = 100.0
 PRICE_TO_BOOK_CURRENCY_MISMATCH_THRESHOLD = 5.0
 FX_CACHE_TTL_SECONDS = 3600
 PER_SOURCE_TIMEOUT = 15
+# Bound on the caller's wait for phase 1, slot queueing included; a little
+# above PER_SOURCE_TIMEOUT so a source that started at once ends inside it
+FETCH_DEADLINE = 20
+GAP_FILL_DEADLINE = 6
+EARLY_EXIT_COVERAGE = 0.70
+
+# Batch (watchlist) fetching
+YAHOOQUERY_BATCH_SIZE = 50
+BATCH_SYMBOL_CONCURRENCY = 8
+PROVIDER_CONCURRENCY = {
+    'yfinance': 8,
+    'yahooquery': 4,
+    'fmp': 4,
+    'eodhd': 4,
+    'alpha_vantage': 1,
+}
+TICKER_INFO_REUSE_SECONDS = 300
+YAHOOQUERY_MODULES = ['summary_profile', 'summary_detail', 'key_stats', 'financial_data', 'price']
 
 # Source quality rankings (higher = more reliable)
 SOURCE_QUALITY = {
@@ -108,124 +137,6 @@ class DataQuality:
         if self.suspicious_fields is None: self.suspicious_fields = []
 
 
-class FinancialPatternExtractor:
-    """Handles regex-based extraction of financial metrics from text."""
-    
-    def __init__(self):
-        self.patterns = {
-            'trailingPE': [
-                re.compile(r'(?:Trailing P/E|P/E \(TTM\)|P/E Ratio \(TTM\))(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'(?:P/E|est|trading at|valuation).*?\s+(\d+[\.,]\d+)x', re.IGNORECASE),
-                re.compile(r'P/E\s+(?:of|is|around)\s+(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'(?<!Forward\s)(?<!Fwd\s)(?:P/E|Price[- ]to[- ]Earnings)(?:.*?)(?:Ratio)?\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'\btrades?\s+at\s+(\d+[\.,]\d+)x', re.IGNORECASE),
-                re.compile(r'\bvalued\s+at\s+(\d+[\.,]\d+)x', re.IGNORECASE),
-                re.compile(r'\btrading\s+at\s+(\d+(?:[\.,]\d+)?)\s+times', re.IGNORECASE),
-            ],
-            'forwardPE': [
-                re.compile(r'(?:Forward P/E|Fwd P/E)(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'(?:Forward P/E|Fwd P/E).*?(\d+[\.,]\d+)x', re.IGNORECASE),
-                re.compile(r'est.*?P/E.*?(\d+[\.,]\d+)x', re.IGNORECASE)
-            ],
-            'priceToBook': [
-                re.compile(r'(?:P/B|Price[- ]to[- ]Book)(?:.*?)(?:Ratio)?\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'PB\s*Ratio\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'Price\s*/\s*Book\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'trading at\s+(\d+[\.,]\d+)x\s+book', re.IGNORECASE)
-            ],
-            'returnOnEquity': [
-                re.compile(r'(?:ROE|Return on Equity).*?(\d+[\.,]\d+)%?', re.IGNORECASE)
-            ],
-            'marketCap': [
-                re.compile(r'(?:Market Cap|Valuation).*?(\d{1,3}(?:[,\.]\d{3})*(?:[,\.]\d+)?)\s*([TBM])', re.IGNORECASE)
-            ],
-            'enterpriseToEbitda': [
-                re.compile(r'(?:EV/EBITDA|Enterprise Value/EBITDA)(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)', re.IGNORECASE),
-                re.compile(r'EV/EBITDA.*?(\d+[\.,]\d+)x', re.IGNORECASE)
-            ],
-            'numberOfAnalystOpinions': [
-                re.compile(r'(\d+)\s+analyst(?:s)?\s+cover', re.IGNORECASE),
-                re.compile(r'covered\s+by\s+(\d+)\s+analyst', re.IGNORECASE),
-                re.compile(r'(\d+)\s+analyst(?:s)?\s+rating', re.IGNORECASE),
-                re.compile(r'analyst\s+coverage:\s*(\d+)', re.IGNORECASE),
-                re.compile(r'based\s+on\s+(\d+)\s+analyst', re.IGNORECASE),
-                re.compile(r'consensus.*?(\d+)\s+analyst', re.IGNORECASE),
-                re.compile(r'(\d+)\s+wall\s+street\s+analyst', re.IGNORECASE)
-            ],
-            'us_revenue_pct': [
-                re.compile(r'US\s+revenue\s+.*?\s+(\d+(?:\.\d+)?)%', re.IGNORECASE),
-                re.compile(r'North\s+America\s+revenue\s+.*?\s+(\d+(?:\.\d+)?)%', re.IGNORECASE),
-                re.compile(r'revenue\s+from\s+.*?Americas.*?\s+(\d+(?:\.\d+)?)%', re.IGNORECASE)
-            ]
-        }
-        
-        self.multipliers = {'T': 1e12, 'B': 1e9, 'M': 1e6}
-    
-    def _normalize_number(self, val_str: str) -> float:
-        try:
-            val_str = val_str.strip()
-            val_str = re.sub(r'[xX%]$', '', val_str).strip()
-            
-            # Robust International Format Handling
-            if ',' in val_str and '.' in val_str:
-                if val_str.rfind(',') < val_str.rfind('.'):
-                    clean_str = val_str.replace(',', '') # US: 1,234.56
-                else:
-                    clean_str = val_str.replace('.', '').replace(',', '.') # EU: 1.234,56
-            elif ',' in val_str:
-                # Ambiguous: 1,234 vs 12,34. Assume comma as decimal if not xxx,xxx format
-                if re.match(r'^\d{1,3},\d{3}$', val_str):
-                    clean_str = val_str.replace(',', '')
-                else:
-                    clean_str = val_str.replace(',', '.')
-            else:
-                clean_str = val_str
-                
-            return float(clean_str)
-        except ValueError:
-            return 0.0
-
-    def extract_from_text(self, content: str, skip_fields: set = None) -> Dict[str, Any]:
-        skip_fields = skip_fields or set()
-        extracted = {}
-        
-        for field, pattern_list in self.patterns.items():
-            if field != 'forwardPE' and field in skip_fields:
-                continue
-                
-            for pattern in pattern_list:
-                match = pattern.search(content)
-                if match:
-                    try:
-                        val_str = match.group(1)
-                        val = self._normalize_number(val_str)
-                        
-                        if field == 'returnOnEquity' and val > ROE_PERCENTAGE_THRESHOLD:
-                            val = val / 100.0
-                        elif field == 'marketCap':
-                            suffix = match.group(2).upper()
-                            multiplier = self.multipliers.get(suffix, 1)
-                            val = val * multiplier
-                        elif field == 'numberOfAnalystOpinions':
-                            val = int(val)
-                            if val < 0 or val > 200: continue # Sanity check
-                        
-                        extracted[field] = val
-                        extracted[f'_{field}_source'] = 'web_search_extraction'
-                        break
-                    except (ValueError, IndexError):
-                        continue
-        
-        # Proxy fill
-        if ('trailingPE' not in skip_fields and 
-            'trailingPE' not in extracted and 
-            'forwardPE' in extracted):
-            extracted['trailingPE'] = extracted['forwardPE']
-            extracted['_trailingPE_source'] = 'proxy_from_forward_pe'
-        
-        return extracted
-
-
 class SmartMarketDataFetcher:
     """Intelligent multi-source fetcher with unified parallel approach."""
     
@@ -242,6 +153,14 @@ class SmartMarketDataFetcher:
         self.fx_cache = {}
         self.fx_cache_expiry_time = {}
 
+        # Persistent cache for merged fundamentals and raw per-source payloads
+        self.cache = get_fundamentals_cache() if config.fundamentals_cache_enabled else None
+        self._background_tasks = set()
+        self.price_store = get_price_store()
+        self.router = get_source_router()
+        self._provider_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop = None
+
         self.fmp_fetcher = get_fmp_fetcher() if FMP_AVAILABLE else None
         self.eodhd_fetcher = get_eodhd_fetcher() if EODHD_AVAILABLE else None
         self.av_fetcher = get_av_fetcher() if ALPHA_VANTAGE_AVAILABLE else None
@@ -257,6 +176,8 @@ class SmartMarketDataFetcher:
             'avg_coverage': 0.0,
             'sources': {'yfinance': 0, 'statements': 0, 'yahooquery': 0, 'fmp': 0, 'eodhd': 0, 'alpha_vantage': 0, 'web_search': 0, 'calculated': 0},
             'gaps_filled': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
         }
     
     def get_currency_rate(self, from_curr: str, to_curr: str) -> float:
@@ -406,15 +327,30 @@ class SmartMarketDataFetcher:
         
         return extracted
 
+    async def get_ticker_info(self, symbol: str) -> Dict[str, Any]:
+        """
+        yfinance `Ticker.info`, shared process-wide: concurrent requests for a
+        symbol coalesce into one call and the result is reused for
+        TICKER_INFO_REUSE_SECONDS. Treat the returned dict as read-only.
+        """
+        return await provider_call(
+            'yfinance', 'info', symbol,
+            partial(run_blocking, lambda: yf.Ticker(symbol).info or {}),
+            ttl=TICKER_INFO_REUSE_SECONDS
+        )
+
     async def _fetch_yfinance_enhanced(self, symbol: str) -> Optional[Dict]:
-        """Fetch yfinance data including statement calculation."""
+        """Fetch yfinance data including statement calculation (on the market-data executor)."""
         try:
-            ticker = yf.Ticker(symbol)
+            info = dict(await self.get_ticker_info(symbol))
+        except Exception:
             info = {}
-            try:
-                info = ticker.info
-            except Exception:
-                info = {}
+        return await run_blocking(self._fetch_yfinance_sync, symbol, info)
+
+    def _fetch_yfinance_sync(self, symbol: str, info: Dict[str, Any]) -> Optional[Dict]:
+        """Blocking yfinance fetch: fast_info fallback and statements on top of `info`."""
+        try:
+            ticker = yf.Ticker(symbol)
             
             has_price = False
             price_fields = ['currentPrice', 'regularMarketPrice', 'previousClose']
@@ -461,6 +397,24 @@ class SmartMarketDataFetcher:
             logger.error("yfinance_enhanced_failed", symbol=symbol, error=str(e))
             return None
 
+    def _combine_yahooquery_modules(self, modules: List[Any], symbol: str) -> Optional[Dict]:
+        """Flatten one symbol's entries from yahooquery module responses."""
+        combined = {}
+        for module in modules:
+            if isinstance(module, dict) and symbol in module:
+                data = module[symbol]
+                if isinstance(data, dict):
+                    combined.update(data)
+
+        if not combined or len(combined) < MIN_INFO_FIELDS:
+            return None
+
+        if 'currentPrice' not in combined and 'regularMarketPrice' in combined:
+            combined['currentPrice'] = combined['regularMarketPrice']
+
+        self.stats['sources']['yahooquery'] += 1
+        return combined
+
     def _fetch_yahooquery_fallback(self, symbol: str) -> Optional[Dict]:
         """Fallback: yahooquery."""
         if not YAHOOQUERY_AVAILABLE:
@@ -468,26 +422,33 @@ class SmartMarketDataFetcher:
         
         try:
             yq = YQTicker(symbol)
-            combined = {}
-            modules = [yq.summary_profile, yq.summary_detail, yq.key_stats, yq.financial_data, yq.price]
-            
-            for module in modules:
-                if isinstance(module, dict) and symbol in module:
-                    data = module[symbol]
-                    if isinstance(data, dict):
-                        combined.update(data)
-            
-            if not combined or len(combined) < MIN_INFO_FIELDS:
-                return None
-            
-            if 'currentPrice' not in combined and 'regularMarketPrice' in combined:
-                combined['currentPrice'] = combined['regularMarketPrice']
-            
-            self.stats['sources']['yahooquery'] += 1
-            return combined
+            modules = [getattr(yq, name) for name in YAHOOQUERY_MODULES]
+            return self._combine_yahooquery_modules(modules, symbol)
         except Exception:
             return None
 
+    def _fetch_yahooquery_batch(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        yahooquery for many symbols at once. Each module property is a single
+        multi-symbol request, so cost scales with the number of batches.
+        """
+        if not YAHOOQUERY_AVAILABLE or not symbols:
+            return {}
+
+        try:
+            yq = YQTicker(symbols, asynchronous=True)
+            modules = [getattr(yq, name) for name in YAHOOQUERY_MODULES]
+        except Exception as e:
+            logger.warning("yahooquery_batch_failed", symbols=len(symbols), error=str(e))
+            return {}
+
+        results = {}
+        for symbol in symbols:
+            data = self._combine_yahooquery_modules(modules, symbol)
+            if data:
+                results[symbol] = data
+        return results
+
     async def _fetch_fmp_fallback(self, symbol: str) -> Optional[Dict]:
         """Fallback: FMP."""
         if not FMP_AVAILABLE or not self.fmp_fetcher or not self.fmp_fetcher.is_available():
@@ -573,35 +534,206 @@ class SmartMarketDataFetcher:
             logger.warning("alpha_vantage_fetch_error", symbol=symbol, error=str(e))
             return None
 
-    async def _fetch_all_sources_parallel(self, symbol: str) -> Dict[str, Optional[Dict]]:
-        """PHASE 1: Launch all data sources in parallel."""
-        logger.info("launching_parallel_sources", symbol=symbol)
+    def _provider_semaphore(self, source_name: str) -> asyncio.Semaphore:
+        """Per-provider concurrency limit, recreated if the event loop changes."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._provider_semaphores = {
+                name: asyncio.Semaphore(limit) for name, limit in PROVIDER_CONCURRENCY.items()
+            }
+            self._semaphore_loop = loop
+        return self._provider_semaphores[source_name]
+
+    async def _limited(
+        self,
+        source_name: str,
+        factory: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a provider call under its concurrency limit. The timeout starts
+        once a slot is acquired, so time spent queued behind other symbols
+        (watchlists) never counts against the request itself.
+        """
+        async with self._provider_semaphore(source_name):
+            if timeout is None:
+                return await factory()
+            return await asyncio.wait_for(factory(), timeout=timeout)
 
-        tasks = {
-            'yfinance': self._fetch_yfinance_enhanced(symbol),
-            'yahooquery': asyncio.to_thread(self._fetch_yahooquery_fallback, symbol),
-            'fmp': self._fetch_fmp_fallback(symbol),
-            'eodhd': self._fetch_eodhd_fallback(symbol),
-            'alpha_vantage': self._fetch_av_fallback(symbol),
+    def _source_tasks(self, symbol: str) -> Dict[str, Callable[[], Awaitable[Optional[Dict]]]]:
+        """Coroutine factories for every provider, keyed by source name."""
+        return {
+            'yfinance': partial(self._fetch_yfinance_enhanced, symbol),
+            'yahooquery': partial(run_blocking, self._fetch_yahooquery_fallback, symbol),
+            'fmp': partial(self._fetch_fmp_fallback, symbol),
+            'eodhd': partial(self._fetch_eodhd_fallback, symbol),
+            'alpha_vantage': partial(self._fetch_av_fallback, symbol),
         }
-        
-        results = {}
-        for source_name, coro in tasks.items():
+
+    def _source_ready(self, source_name: str) -> bool:
+        """
+        False when a provider would be skipped without a request: library or
+        API key missing, circuit breaker open or quota exhausted.
+        """
+        if source_name == 'yahooquery':
+            return YAHOOQUERY_AVAILABLE
+        if source_name == 'fmp':
+            return FMP_AVAILABLE and bool(self.fmp_fetcher) and self.fmp_fetcher.is_available()
+        if source_name == 'eodhd':
+            return EODHD_AVAILABLE and bool(self.eodhd_fetcher) and self.eodhd_fetcher.is_available()
+        if source_name == 'alpha_vantage':
+            return ALPHA_VANTAGE_AVAILABLE and bool(self.av_fetcher) and self.av_fetcher.is_available()
+        return True
+
+    def _has_enough_data(self, source_results: Dict[str, Optional[Dict]]) -> bool:
+        """
+        Early-completion policy: REQUIRED_BASICS present and IMPORTANT_FIELDS
+        coverage at or above EARLY_EXIT_COVERAGE across the sources seen so far.
+        """
+        present = set()
+        for data in source_results.values():
+            if data:
+                present.update(k for k, v in data.items() if v is not None)
+
+        has_price = any(k in present for k in ['currentPrice', 'regularMarketPrice', 'previousClose'])
+        if not has_price or 'symbol' not in present or 'currency' not in present:
+            return False
+
+        covered = sum(1 for field in self.IMPORTANT_FIELDS if field in present)
+        return covered / len(self.IMPORTANT_FIELDS) >= EARLY_EXIT_COVERAGE
+
+    async def _get_warm_results(self, symbol: str) -> Dict[str, Dict]:
+        """Unexpired raw payloads from earlier fetches (including background completions)."""
+        if not self.cache:
+            return {}
+        return await run_blocking(self.cache.get_source_payloads, symbol)
+
+    async def _store_source_result(self, symbol: str, source_name: str, data: Optional[Dict]) -> None:
+        if data and self.cache:
+            await run_blocking(self.cache.put_source_payload, symbol, source_name, data)
+
+    def _finish_in_background(
+        self,
+        task: asyncio.Task,
+        source_name: str,
+        symbol: str,
+        baseline_fields: set
+    ) -> None:
+        """Let a slow source complete after early return and keep its payload warm."""
+        async def _store() -> None:
             try:
-                # Wait for each task with timeout
-                result = await asyncio.wait_for(coro, timeout=PER_SOURCE_TIMEOUT)
-                results[source_name] = result
-                if result:
-                    logger.info(f"{source_name}_success", symbol=symbol, fields=len(result))
-                else:
-                    logger.warning(f"{source_name}_returned_none", symbol=symbol)
-            except asyncio.TimeoutError:
-                logger.warning(f"{source_name}_timeout", symbol=symbol)
-                results[source_name] = None
-            except Exception as e:
-                logger.warning(f"{source_name}_error", symbol=symbol, error=str(e))
-                results[source_name] = None
-        
+                data = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                data = None
+            # A quota that ran out during the call is not a coverage failure
+            if data or self._source_ready(source_name):
+                self.router.record(symbol, source_name, data, baseline_fields, self.IMPORTANT_FIELDS)
+                await run_blocking(self.router.flush)
+            if data:
+                await self._store_source_result(symbol, source_name, data)
+                logger.debug("background_source_warmed", symbol=symbol, source=source_name, fields=len(data))
+
+        waiter = asyncio.create_task(_store())
+        self._background_tasks.add(waiter)
+        waiter.add_done_callback(self._background_tasks.discard)
+
+    async def _fetch_all_sources_parallel(
+        self,
+        symbol: str,
+        prefetched: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        PHASE 1: Launch all data sources concurrently.
+
+        Each source is bounded by PER_SOURCE_TIMEOUT from the moment it gets
+        a provider slot (see _limited). Sources are collected as they
+        complete until the merged view satisfies the early-completion policy
+        (see _has_enough_data) or FETCH_DEADLINE passes, which caps the wait
+        for sources still queued behind other symbols' calls (Alpha Vantage
+        runs one at a time). Either way we return without the stragglers;
+        they keep running, and their payloads are reused by the next fetch of
+        the same symbol.
+
+        `prefetched` carries payloads already obtained by a batch call
+        (see get_financial_metrics_many); those sources are not queried again,
+        and when they and the warm payloads already satisfy _has_enough_data
+        no provider is started at all.
+        """
+        logger.info("launching_parallel_sources", symbol=symbol)
+
+        results: Dict[str, Optional[Dict]] = dict(await self._get_warm_results(symbol))
+        for source_name, data in (prefetched or {}).items():
+            if data:
+                results[source_name] = data
+                await self._store_source_result(symbol, source_name, data)
+        if results:
+            logger.info("using_warm_sources", symbol=symbol, sources=list(results))
+            if self._has_enough_data(results):
+                # Warm / prefetched payloads already satisfy the policy: start no provider
+                logger.info("warm_sources_sufficient", symbol=symbol)
+                return results
+
+        factories = self._source_tasks(symbol)
+        # Unconfigured / quota-exhausted providers are neither queried nor recorded
+        candidates = [s for s in factories if s not in results and self._source_ready(s)]
+        routed = self.router.select_sources(symbol, candidates)
+
+        tasks = {}
+        for source_name in routed:
+            coro = self._limited(source_name, factories[source_name], timeout=PER_SOURCE_TIMEOUT)
+            tasks[asyncio.create_task(coro)] = source_name
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + FETCH_DEADLINE
+        pending = set(tasks)
+        finished: List[str] = []
+
+        while pending and not self._has_enough_data(results):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                source_name = tasks[task]
+                finished.append(source_name)
+                try:
+                    result = task.result()
+                    results[source_name] = result
+                    await self._store_source_result(symbol, source_name, result)
+                    if result:
+                        logger.info(f"{source_name}_success", symbol=symbol, fields=len(result))
+                    else:
+                        logger.warning(f"{source_name}_returned_none", symbol=symbol)
+                except asyncio.TimeoutError:
+                    logger.warning(f"{source_name}_timeout", symbol=symbol)
+                    results[source_name] = None
+                except Exception as e:
+                    logger.warning(f"{source_name}_error", symbol=symbol, error=str(e))
+                    results[source_name] = None
+
+        # Feed the router: each finished source vs. the primary and higher-ranked sources
+        fields_by_source = {
+            name: payload_fields(data, self.IMPORTANT_FIELDS) for name, data in results.items()
+        }
+        baselines = coverage_baselines(fields_by_source, list(factories))
+        for source_name in finished:
+            data = results.get(source_name)
+            if data or self._source_ready(source_name):
+                self.router.record(symbol, source_name, data, baselines[source_name], self.IMPORTANT_FIELDS)
+        if finished:
+            await run_blocking(self.router.flush)
+
+        if pending:
+            logger.info("early_completion", symbol=symbol,
+                        reason="enough_data" if self._has_enough_data(results) else "deadline",
+                        pending_sources=sorted(tasks[t] for t in pending))
+            for task in pending:
+                results[tasks[task]] = None
+                self._finish_in_background(task, tasks[task], symbol, baselines[tasks[task]])
+
         return results
 
     def _smart_merge_with_quality(self, source_results: Dict[str, Optional[Dict]], symbol: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
@@ -698,8 +830,33 @@ class SmartMarketDataFetcher:
         ]
         return [f for f in critical if f not in data or data[f] is None]
 
-    async def _fetch_tavily_gaps(self, symbol: str, missing_fields: List[str]) -> Dict[str, Any]:
-        """PHASE 5: Tavily gap-filling."""
+    async def _search_gap_field(self, query: str) -> Optional[str]:
+        """One Tavily search, served from the on-disk cache when fresh."""
+        if self.cache:
+            cached = await run_blocking(self.cache.get_search_result, query)
+            if cached is not None:
+                return cached
+
+        result = await asyncio.to_thread(self.tavily_client.search, query, max_results=3)
+        if not result or 'results' not in result:
+            return None
+
+        combined = "\n".join([i.get('content', '') for i in result['results']])
+        if self.cache:
+            await run_blocking(self.cache.put_search_result, query, combined)
+        return combined
+
+    async def _fetch_tavily_gaps(
+        self,
+        symbol: str,
+        missing_fields: List[str],
+        company_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        PHASE 5: Tavily gap-filling.
+        Field searches run concurrently under one GAP_FILL_DEADLINE; searches
+        still running at the deadline are dropped.
+        """
         DANGEROUS_FIELDS = ['trailingPE', 'forwardPE', 'pegRatio', 'currentPrice', 'marketCap']
         safe_missing_fields = [f for f in missing_fields if f not in DANGEROUS_FIELDS]
         
@@ -709,48 +866,51 @@ class SmartMarketDataFetcher:
         if not self.tavily_client or not safe_missing_fields:
             return {}
         
-        try:
-            import yfinance as yf
-            ticker_obj = yf.Ticker(symbol)
-            company_name = (ticker_obj.info.get('longName') or ticker_obj.info.get('shortName') or symbol)
-        except:
-            company_name = symbol
+        if not company_name:
+            # Single-flight info is normally still warm from the yfinance source
+            try:
+                info = await self.get_ticker_info(symbol)
+                company_name = (info.get('longName') or info.get('shortName') or symbol)
+            except:
+                company_name = symbol
         
         fields_to_search = safe_missing_fields[:5]
-        search_results = {}
         
+        # Map internal field names to search terms
+        field_terms = {
+            'trailingPE': "trailing P/E ratio price earnings",
+            'forwardPE': "forward P/E ratio estimate",
+            'priceToBook': "price to book ratio P/B",
+            'returnOnEquity': "ROE return on equity",
+            'debtToEquity': "debt to equity ratio leverage",
+            'numberOfAnalystOpinions': "analyst coverage count",
+            'revenueGrowth': "revenue growth year over year",
+        }
+        
+        tasks = {}
         for field in fields_to_search:
-            # Map internal field names to search terms
-            field_terms = {
-                'trailingPE': "trailing P/E ratio price earnings",
-                'forwardPE': "forward P/E ratio estimate",
-                'priceToBook': "price to book ratio P/B",
-                'returnOnEquity': "ROE return on equity",
-                'debtToEquity': "debt to equity ratio leverage",
-                'numberOfAnalystOpinions': "analyst coverage count",
-                'revenueGrowth': "revenue growth year over year",
-            }
-            
             if field == 'us_revenue_pct':
                 query = f'"{company_name}" annual report revenue by geography North America United States'
             else:
                 term = field_terms.get(field, field)
                 query = generate_strict_search_query(symbol, company_name, term)
-            
-            try:
-                result = await asyncio.wait_for(
-                    asyncio.to_thread(self.tavily_client.search, query, max_results=3),
-                    timeout=5
-                )
-                if result and 'results' in result:
-                    combined = "\n".join([i.get('content', '') for i in result['results']])
-                    search_results[field] = combined
-            except:
-                pass
+            tasks[asyncio.create_task(self._search_gap_field(query))] = field
+        
+        done, pending = await asyncio.wait(tasks, timeout=GAP_FILL_DEADLINE)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.debug("gap_fill_deadline_reached", symbol=symbol,
+                         dropped=sorted(tasks[t] for t in pending))
+        
+        search_results = {}
+        for task in done:
+            if task.exception() is None and task.result():
+                search_results[tasks[task]] = task.result()
         
         if not search_results: return {}
         
-        all_text = "\n\n".join(search_results.values())
+        all_text = "\n\n".join(search_results[f] for f in fields_to_search if f in search_results)
         return self.pattern_extractor.extract_from_text(all_text, skip_fields=set())
 
     def _merge_gap_fill_data(self, merged: Dict[str, Any], gap_fill_data: Dict[str, Any], merge_metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -871,7 +1031,12 @@ class SmartMarketDataFetcher:
         
         return quality
 
-    async def get_financial_metrics(self, ticker: str, timeout: int = 30) -> Dict[str, Any]:
+    async def get_financial_metrics(
+        self,
+        ticker: str,
+        timeout: int = 30,
+        prefetched: Optional[Dict[str, Dict]] = None
+    ) -> Dict[str, Any]:
         """
         UNIFIED APPROACH: Main entry point with parallel sources and mandatory gap-filling.
         Includes EODHD fallback.
@@ -880,8 +1045,17 @@ class SmartMarketDataFetcher:
         start_time = datetime.now()
         
         try:
+            # PHASE 0: Persistent cache (every field within its TTL class)
+            if self.cache:
+                cached = await run_blocking(self.cache.get_fundamentals, ticker)
+                if cached:
+                    self.stats['cache_hits'] += 1
+                    logger.info("fundamentals_cache_hit", symbol=ticker, fields=len(cached))
+                    return cached
+                self.stats['cache_misses'] += 1
+
             # PHASE 1: Parallel source execution
-            source_results = await self._fetch_all_sources_parallel(ticker)
+            source_results = await self._fetch_all_sources_parallel(ticker, prefetched)
             
             # PHASE 3: Smart merge with quality scoring
             merged, merge_metadata = self._smart_merge_with_quality(source_results, ticker)
@@ -894,7 +1068,9 @@ class SmartMarketDataFetcher:
                 logger.warning("data_vacuum_detected", symbol=ticker, 
                              msg="Triggering Panic Mode for Asian ticker")
                 all_critical = self.IMPORTANT_FIELDS + self.REQUIRED_BASICS
-                tavily_rescue = await self._fetch_tavily_gaps(ticker, all_critical)
+                tavily_rescue = await self._fetch_tavily_gaps(
+                    ticker, all_critical, company_name=merged.get('longName') or merged.get('shortName')
+                )
                 if tavily_rescue:
                     merged = self._merge_gap_fill_data(merged, tavily_rescue, merge_metadata)
                     if 'currentPrice' not in merged and 'price' in tavily_rescue:
@@ -909,7 +1085,9 @@ class SmartMarketDataFetcher:
             
             # PHASE 5: Mandatory Tavily gap-filling if needed
             if coverage < 0.70 and gaps:
-                tavily_data = await self._fetch_tavily_gaps(ticker, gaps)
+                tavily_data = await self._fetch_tavily_gaps(
+                    ticker, gaps, company_name=merged.get('longName') or merged.get('shortName')
+                )
                 if tavily_data:
                     merged = self._merge_gap_fill_data(merged, tavily_data, merge_metadata)
             
@@ -920,7 +1098,8 @@ class SmartMarketDataFetcher:
                 merged = result.data
                 merge_metadata['gaps_filled'] += result.gaps_filled
             
-            merged = self._normalize_data_integrity(merged, ticker)
+            # FX lookups inside normalization hit yfinance synchronously
+            merged = await run_blocking(self._normalize_data_integrity, merged, ticker)
             
             # Validate
             quality = self._validate_basics(merged, ticker)
@@ -939,6 +1118,16 @@ class SmartMarketDataFetcher:
                     'sources_used': quality.sources_used,
                 }
             })
+
+            if self.cache:
+                await run_blocking(
+                    self.cache.put_fundamentals,
+                    ticker, merged,
+                    field_sources=merge_metadata['field_sources'],
+                    field_quality=merge_metadata['field_quality']
+                )
+            merged['_field_sources'] = merge_metadata['field_sources']
+            merged['_field_quality'] = merge_metadata['field_quality']
             
             return merged
             
@@ -946,11 +1135,107 @@ class SmartMarketDataFetcher:
             logger.error("unexpected_fetch_error", ticker=ticker, error=str(e))
             return {"error": str(e), "symbol": ticker}
 
-    async def get_historical_prices(self, ticker: str, period: str = "1y") -> pd.DataFrame:
-        """Fetch historical price data."""
+    async def _prefetch_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """Batch-capable providers for a chunk of symbols: {symbol: {source: payload}}."""
+        async with self._provider_semaphore('yahooquery'):
+            yq_results = await run_blocking(self._fetch_yahooquery_batch, symbols)
+
+        logger.info("batch_prefetch_complete", symbols=len(symbols), yahooquery=len(yq_results))
+        return {symbol: {'yahooquery': data} for symbol, data in yq_results.items()}
+
+    async def get_financial_metrics_many(
+        self,
+        tickers: Iterable[str],
+        concurrency: int = BATCH_SYMBOL_CONCURRENCY,
+        batch_size: int = YAHOOQUERY_BATCH_SIZE
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Batch entry point for watchlists. Yields (ticker, metrics) as each
+        ticker finishes, in completion order.
+
+        Cached tickers are yielded immediately. The rest are prefetched in
+        chunks of `batch_size` through multi-symbol provider calls, then
+        completed per ticker (at most `concurrency` at a time) with the
+        batch payloads supplied so those providers are not queried again.
+        Per-symbol providers stay bounded by PROVIDER_CONCURRENCY.
+        """
+        symbols = list(dict.fromkeys(t.strip() for t in tickers if t and t.strip()))
+
+        remaining = []
+        for symbol in symbols:
+            cached = await run_blocking(self.cache.get_fundamentals, symbol) if self.cache else None
+            if cached:
+                self.stats['cache_hits'] += 1
+                yield symbol, cached
+            else:
+                remaining.append(symbol)
+
+        if not remaining:
+            return
+
+        logger.info("batch_fetch_started", symbols=len(symbols), uncached=len(remaining), batch_size=batch_size)
+        limiter = asyncio.Semaphore(concurrency)
+
+        async def _complete(symbol: str, prefetched: Optional[Dict[str, Dict]]) -> Tuple[str, Dict[str, Any]]:
+            async with limiter:
+                return symbol, await self.get_financial_metrics(symbol, prefetched=prefetched)
+
+        batches = {
+            asyncio.create_task(self._prefetch_batch(remaining[i:i + batch_size])): remaining[i:i + batch_size]
+            for i in range(0, len(remaining), batch_size)
+        }
+        per_symbol = set()
+
+        try:
+            while batches or per_symbol:
+                done, _ = await asyncio.wait(set(batches) | per_symbol, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task in batches:
+                        chunk = batches.pop(task)
+                        try:
+                            prefetched = task.result()
+                        except Exception as e:
+                            logger.warning("batch_prefetch_failed", symbols=len(chunk), error=str(e))
+                            prefetched = {}
+                        for symbol in chunk:
+                            per_symbol.add(asyncio.create_task(_complete(symbol, prefetched.get(symbol))))
+                    else:
+                        per_symbol.discard(task)
+                        yield task.result()
+        finally:
+            for task in list(batches) + list(per_symbol):
+                task.cancel()
+
+    async def get_historical_prices(
+        self,
+        ticker: str,
+        period: str = "1y",
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch historical daily bars. Served from the incremental price store,
+        which only asks yfinance for bars it does not already hold.
+        """
+        if start is not None or is_supported_period(period):
+            try:
+                return await run_blocking(self.price_store.get_history, ticker, period, start, end)
+            except Exception as e:
+                logger.warning("price_store_failed", ticker=ticker, error=str(e))
+
         try:
             stock = yf.Ticker(ticker)
-            hist = await asyncio.to_thread(stock.history, period=period)
+            if start is not None:
+                # Same [start, end) window the price store would have served
+                hist = await provider_call(
+                    'yfinance', f'history:{start}:{end}', ticker,
+                    partial(run_blocking, stock.history, start=start, end=end)
+                )
+                return slice_history(hist, start, end)
+            hist = await provider_call(
+                'yfinance', f'history:{period}', ticker,
+                partial(run_blocking, stock.history, period=period)
+            )
             return hist
         except Exception as e:
             logger.error("history_fetch_failed", ticker=ticker, error=str(e))
@@ -958,18 +1243,43 @@ class SmartMarketDataFetcher:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics on fetcher performance."""
-        return self.stats.copy()
+        stats = self.stats.copy()
+        stats['executor'] = get_market_data_executor().get_stats()
+        stats['singleflight'] = get_provider_flight().get_stats()
+        stats['price_store'] = self.price_store.get_stats()
+        stats['routing'] = self.router.get_stats()
+        return stats
     
     def clear_fx_cache(self):
         """Clear FX rate cache."""
         self.fx_cache = {}
         self.fx_cache_expiry_time = {}
 
+    def clear_fundamentals_cache(self, ticker: Optional[str] = None):
+        """Clear persisted fundamentals for one ticker, or all of them."""
+        if self.cache:
+            self.cache.clear(ticker)
+
+
+# Singleton instance (lazy initialization: importing this module builds nothing)
+_fetcher: Optional[SmartMarketDataFetcher] = None
+
+
+def get_fetcher() -> SmartMarketDataFetcher:
+    """Get the process-wide SmartMarketDataFetcher, creating it on first use."""
+    global _fetcher
+    if _fetcher is None:
+        _fetcher = SmartMarketDataFetcher()
+    return _fetcher
+
 
-# Singleton instance
-fetcher = SmartMarketDataFetcher()
+def __getattr__(name: str):
+    # Backward compatibility: `from src.data.fetcher import fetcher`
+    if name == "fetcher":
+        return get_fetcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Backward compatibility
 async def fetch_ticker_data(ticker: str) -> Dict[str, Any]:
-    return await fetcher.get_financial_metrics(ticker)
+    return await get_fetcher().get_financial_metrics(ticker)
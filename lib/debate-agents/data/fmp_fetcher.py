@@ -26,6 +26,10 @@ import aiohttp
 import logging
 from typing import Optional, Dict, Any
 
+from src.data.http_session import get_http_session
+from src.data.executor import run_blocking
+from src.data.quota import get_quota_scheduler, is_daily_limit_response, ticker_priority
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,18 +50,15 @@ class FMPFetcher:
         """
         self.api_key = api_key or os.getenv('FMP_API_KEY')
         self.base_url = "https://financialmodelingprep.com/stable"
-        self._session = None
         self._key_validated = False
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self._session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, *args):
-        """Async context manager exit."""
-        if self._session:
-            await self._session.close()
+        """Async context manager exit (the shared HTTP session is closed at shutdown)."""
+        pass
     
     def is_available(self) -> bool:
         """Check if FMP is configured (API key present)."""
@@ -80,14 +81,16 @@ class FMPFetcher:
         if not self.is_available():
             return None
         
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        if not await get_quota_scheduler().acquire('fmp', ticker_priority(params.get('symbol', ''))):
+            return None
+        
+        session = get_http_session()
         
         url = f"{self.base_url}/{endpoint}"
         params["apikey"] = self.api_key
         
         try:
-            async with self._session.get(url, params=params, timeout=10) as response:
+            async with session.get(url, params=params, timeout=10) as response:
                 if response.status == 200:
                     try:
                         data = await response.json()
@@ -97,6 +100,16 @@ class FMPFetcher:
                     self._key_validated = True
                     return data
                     
+                elif response.status == 429:
+                    # FMP answers 429 for the per-minute limit as well as the daily one
+                    if is_daily_limit_response(await response.text()):
+                        logger.warning(f"FMP daily limit reached (429) for {endpoint}")
+                        await run_blocking(get_quota_scheduler().report_exhausted, 'fmp')
+                    else:
+                        logger.warning(f"FMP rate limit reached (429) for {endpoint}; backing off for the minute")
+                        await run_blocking(get_quota_scheduler().report_rate_limited, 'fmp')
+                    return None
+                    
                 elif response.status == 403:
                     if not self._key_validated:
                         # Key is invalid - this is a configuration error
@@ -0,0 +1,92 @@
+"""
+Shared HTTP Session
+One pooled aiohttp.ClientSession for every HTTP provider client (EODHD,
+Alpha Vantage, FMP, StockTwits).
+
+The connector keeps connections alive between requests, caches DNS lookups
+and caps connections per host, so repeated calls to the same provider reuse
+an open TLS connection instead of handshaking again. Call
+close_http_session() once at shutdown.
+"""
+
+import asyncio
+import os
+from typing import Dict
+
+import aiohttp
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", "10"))
+DNS_CACHE_TTL_SECONDS = 300
+KEEPALIVE_TIMEOUT_SECONDS = 30
+
+
+class HTTPSessionManager:
+    """
+    Owns the process-wide sessions, one per event loop (aiohttp sessions are
+    bound to the loop they were created on, e.g. across successive
+    asyncio.run() calls). Sessions of loops that have since closed are
+    released when the next session is requested, so they do not leak as
+    "Unclosed client session".
+    """
+
+    def __init__(self):
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    def get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        self._release_dead_loops()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+                keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+            logger.debug("http_session_created", limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST)
+        return session
+
+    def _release_dead_loops(self) -> None:
+        """Drop sessions whose event loop has closed (close() can no longer be awaited there)."""
+        for loop in [l for l in self._sessions if l.is_closed()]:
+            session = self._sessions.pop(loop)
+            if session.closed:
+                continue
+            # Detach marks the session closed; then drop its pooled connections
+            connector = session.connector
+            session.detach()
+            if connector is not None and not connector.closed:
+                try:
+                    connector._close()
+                except RuntimeError:
+                    # Transports of a closed loop cannot schedule their close; they are dead anyway
+                    pass
+            logger.debug("http_session_released", reason="event loop closed")
+
+    async def close(self) -> None:
+        """Close the running loop's session and release those of closed loops."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        self._release_dead_loops()
+        if session and not session.closed:
+            await session.close()
+            logger.debug("http_session_closed")
+
+
+# Singleton Pattern
+_session_manager = HTTPSessionManager()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared pooled session for the running event loop."""
+    return _session_manager.get_session()
+
+
+async def close_http_session() -> None:
+    """Close the shared session (call once at shutdown)."""
+    await _session_manager.close()
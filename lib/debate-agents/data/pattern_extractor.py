@@ -0,0 +1,239 @@
+"""
+Financial Pattern Extractor
+Regex extraction of financial metrics from web search text (Tavily gap-fill).
+
+Single-pass engine:
+1. The text is lowercased once and one prefilter regex (a zero-width
+   lookahead over every anchor keyword) records where each keyword occurs.
+2. Each field pattern is then only tried at its own anchor positions, inside
+   a bounded window (ANCHOR_WINDOW characters), instead of being searched
+   over the whole 15-50 KB payload. Patterns run case-sensitively against
+   the lowercased text; IGNORECASE matching is several times slower.
+
+Patterns are tried in the same order as before and the first (leftmost)
+match per field wins, so results match a plain pattern.search() whenever
+the value sits within the window of its keyword. The window also bounds
+worst-case time: `.*?` can no longer backtrack across an entire line of
+scraped text.
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+# ROE above this is a percentage (15.2) rather than a fraction (0.152)
+ROE_PERCENTAGE_THRESHOLD = 1.0
+
+# Characters after an anchor keyword a pattern may span
+ANCHOR_WINDOW = 300
+
+# Characters before the anchor for patterns whose match starts with the number
+NUMBER_LOOKBACK = 32
+
+# "24.1x": required inside the window by the loosely anchored valuation-multiple patterns
+MULTIPLE_MARKER = r'\d[\.,]\d+x'
+
+
+class FieldPattern(NamedTuple):
+    regex: Pattern              # as written, IGNORECASE (searches raw text)
+    lowered: Pattern            # lowercased, case-sensitive (runs on lowercased text)
+    anchors: Tuple[str, ...]    # lowercase keywords; every match contains one
+    lookback: int = 0           # 0: match starts at the anchor
+    requires: Optional[Pattern] = None  # must also occur in the window, else the anchor is skipped
+
+
+def _p(pattern: str, anchors: Tuple[str, ...], lookback: int = 0, requires: Optional[str] = None) -> FieldPattern:
+    # Lowercasing the source would turn \S, \D, \W, \B into their opposites
+    if re.search(r'\\[A-Z]', pattern):
+        raise ValueError(f"Uppercase escape in field pattern: {pattern}")
+    return FieldPattern(
+        re.compile(pattern, re.IGNORECASE), re.compile(pattern.lower()), anchors, lookback,
+        re.compile(requires) if requires else None
+    )
+
+
+PE_ANCHORS = ('p/e', 'price-to-earnings', 'price to earnings')
+PB_ANCHORS = ('p/b', 'price-to-book', 'price to book')
+
+FIELD_PATTERNS: Dict[str, List[FieldPattern]] = {
+    'trailingPE': [
+        _p(r'(?:Trailing P/E|P/E \(TTM\)|P/E Ratio \(TTM\))(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)',
+           ('trailing p/e', 'p/e (ttm)', 'p/e ratio (ttm)')),
+        _p(r'(?:P/E|est|trading at|valuation).*?\s+(\d+[\.,]\d+)x', ('p/e', 'est', 'trading at', 'valuation'),
+           requires=MULTIPLE_MARKER),
+        _p(r'P/E\s+(?:of|is|around)\s+(\d+[\.,]\d+)', ('p/e',)),
+        _p(r'(?<!Forward\s)(?<!Fwd\s)(?:P/E|Price[- ]to[- ]Earnings)(?:.*?)(?:Ratio)?\s*[:=]?\s*(\d+[\.,]\d+)',
+           PE_ANCHORS),
+        _p(r'\btrades?\s+at\s+(\d+[\.,]\d+)x', ('trade',)),
+        _p(r'\bvalued\s+at\s+(\d+[\.,]\d+)x', ('valued',)),
+        _p(r'\btrading\s+at\s+(\d+(?:[\.,]\d+)?)\s+times', ('trading',)),
+    ],
+    'forwardPE': [
+        _p(r'(?:Forward P/E|Fwd P/E)(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)', ('forward p/e', 'fwd p/e')),
+        _p(r'(?:Forward P/E|Fwd P/E).*?(\d+[\.,]\d+)x', ('forward p/e', 'fwd p/e')),
+        _p(r'est.*?P/E.*?(\d+[\.,]\d+)x', ('est',), requires=MULTIPLE_MARKER),
+    ],
+    'priceToBook': [
+        _p(r'(?:P/B|Price[- ]to[- ]Book)(?:.*?)(?:Ratio)?\s*[:=]?\s*(\d+[\.,]\d+)', PB_ANCHORS),
+        _p(r'PB\s*Ratio\s*[:=]?\s*(\d+[\.,]\d+)', ('pb',)),
+        _p(r'Price\s*/\s*Book\s*[:=]?\s*(\d+[\.,]\d+)', ('price',)),
+        _p(r'trading at\s+(\d+[\.,]\d+)x\s+book', ('trading at',)),
+    ],
+    'returnOnEquity': [
+        _p(r'(?:ROE|Return on Equity).*?(\d+[\.,]\d+)%?', ('roe', 'return on equity')),
+    ],
+    'marketCap': [
+        _p(r'(?:Market Cap|Valuation).*?(\d{1,3}(?:[,\.]\d{3})*(?:[,\.]\d+)?)\s*([TBM])', ('market cap', 'valuation')),
+    ],
+    'enterpriseToEbitda': [
+        _p(r'(?:EV/EBITDA|Enterprise Value/EBITDA)(?:.*?)\s*[:=]?\s*(\d+[\.,]\d+)', ('ev/ebitda', 'enterprise value/ebitda')),
+        _p(r'EV/EBITDA.*?(\d+[\.,]\d+)x', ('ev/ebitda',)),
+    ],
+    'numberOfAnalystOpinions': [
+        _p(r'(\d+)\s+analyst(?:s)?\s+cover', ('analyst',), NUMBER_LOOKBACK),
+        _p(r'covered\s+by\s+(\d+)\s+analyst', ('covered',)),
+        _p(r'(\d+)\s+analyst(?:s)?\s+rating', ('analyst',), NUMBER_LOOKBACK),
+        _p(r'analyst\s+coverage:\s*(\d+)', ('analyst',)),
+        _p(r'based\s+on\s+(\d+)\s+analyst', ('based',)),
+        _p(r'consensus.*?(\d+)\s+analyst', ('consensus',)),
+        _p(r'(\d+)\s+wall\s+street\s+analyst', ('wall',), NUMBER_LOOKBACK),
+    ],
+    'us_revenue_pct': [
+        _p(r'US\s+revenue\s+.*?\s+(\d+(?:\.\d+)?)%', ('us',)),
+        _p(r'North\s+America\s+revenue\s+.*?\s+(\d+(?:\.\d+)?)%', ('north',)),
+        _p(r'revenue\s+from\s+.*?Americas.*?\s+(\d+(?:\.\d+)?)%', ('revenue',)),
+    ],
+}
+
+ALL_ANCHORS = sorted({a for patterns in FIELD_PATTERNS.values() for p in patterns for a in p.anchors},
+                     key=len, reverse=True)
+
+# Zero-width, so overlapping keywords ("forward p/e" and the "p/e" inside it) are all found.
+# Longest first: the group holds the longest keyword starting at each position.
+ANCHOR_PREFILTER = re.compile(r'(?=(' + '|'.join(re.escape(a) for a in ALL_ANCHORS) + r'))')
+
+# Shorter keywords that are a prefix of a longer one ("p/e" of "p/e (ttm)") start at the same position
+ANCHOR_PREFIXES: Dict[str, Tuple[str, ...]] = {
+    anchor: tuple(a for a in ALL_ANCHORS if a != anchor and anchor.startswith(a))
+    for anchor in ALL_ANCHORS
+}
+
+
+class FinancialPatternExtractor:
+    """Handles regex-based extraction of financial metrics from text."""
+
+    def __init__(self):
+        self.field_patterns = FIELD_PATTERNS
+        # Plain compiled patterns per field (kept for callers/benchmarks that search directly)
+        self.patterns = {field: [p.regex for p in specs] for field, specs in FIELD_PATTERNS.items()}
+        self.multipliers = {'T': 1e12, 'B': 1e9, 'M': 1e6}
+
+    def _normalize_number(self, val_str: str) -> float:
+        try:
+            val_str = val_str.strip()
+            val_str = re.sub(r'[xX%]$', '', val_str).strip()
+
+            # Robust International Format Handling
+            if ',' in val_str and '.' in val_str:
+                if val_str.rfind(',') < val_str.rfind('.'):
+                    clean_str = val_str.replace(',', '') # US: 1,234.56
+                else:
+                    clean_str = val_str.replace('.', '').replace(',', '.') # EU: 1.234,56
+            elif ',' in val_str:
+                # Ambiguous: 1,234 vs 12,34. Assume comma as decimal if not xxx,xxx format
+                if re.match(r'^\d{1,3},\d{3}$', val_str):
+                    clean_str = val_str.replace(',', '')
+                else:
+                    clean_str = val_str.replace(',', '.')
+            else:
+                clean_str = val_str
+
+            return float(clean_str)
+        except ValueError:
+            return 0.0
+
+    @staticmethod
+    def _lowercase(content: str) -> str:
+        lowered = content.lower()
+        if len(lowered) != len(content):
+            # A few non-ASCII characters lengthen when lowercased; offsets must line up
+            lowered = ''.join(c if len(c.lower()) != 1 else c.lower() for c in content)
+        return lowered
+
+    def _anchor_positions(self, lowered: str) -> Dict[str, List[int]]:
+        """One pass over the lowercased text: every start position of every anchor keyword."""
+        positions = defaultdict(list)
+        for match in ANCHOR_PREFILTER.finditer(lowered):
+            start = match.start()
+            anchor = match.group(1)
+            positions[anchor].append(start)
+            for prefix in ANCHOR_PREFIXES[anchor]:
+                positions[prefix].append(start)
+        return positions
+
+    def _find(self, lowered: str, spec: FieldPattern, positions: Dict[str, List[int]]) -> Optional[re.Match]:
+        """Leftmost match of one pattern, tried only around its anchors."""
+        candidates = sorted({pos for anchor in spec.anchors for pos in positions.get(anchor, ())})
+        markers = None
+        if spec.requires is not None and candidates:
+            # Marker positions are found once per text and shared by every pattern requiring them
+            markers = positions.get(spec.requires.pattern)
+            if markers is None:
+                markers = positions[spec.requires.pattern] = [m.start() for m in spec.requires.finditer(lowered)]
+        length = len(lowered)
+        for pos in candidates:
+            end = min(length, pos + ANCHOR_WINDOW)
+            if markers is not None:
+                i = bisect_left(markers, pos)
+                if i == len(markers) or markers[i] >= end:
+                    continue
+            if spec.lookback:
+                match = spec.lowered.search(lowered, max(0, pos - spec.lookback), end)
+            else:
+                match = spec.lowered.match(lowered, pos, end)
+            if match:
+                return match
+        return None
+
+    def extract_from_text(self, content: str, skip_fields: set = None) -> Dict[str, Any]:
+        skip_fields = skip_fields or set()
+        extracted = {}
+        lowered = self._lowercase(content)
+        positions = self._anchor_positions(lowered)
+
+        for field, specs in self.field_patterns.items():
+            if field != 'forwardPE' and field in skip_fields:
+                continue
+
+            for spec in specs:
+                match = self._find(lowered, spec, positions)
+                if match:
+                    try:
+                        val_str = match.group(1)
+                        val = self._normalize_number(val_str)
+
+                        if field == 'returnOnEquity' and val > ROE_PERCENTAGE_THRESHOLD:
+                            val = val / 100.0
+                        elif field == 'marketCap':
+                            suffix = match.group(2).upper()
+                            multiplier = self.multipliers.get(suffix, 1)
+                            val = val * multiplier
+                        elif field == 'numberOfAnalystOpinions':
+                            val = int(val)
+                            if val < 0 or val > 200: continue # Sanity check
+
+                        extracted[field] = val
+                        extracted[f'_{field}_source'] = 'web_search_extraction'
+                        break
+                    except (ValueError, IndexError):
+                        continue
+
+        # Proxy fill
+        if ('trailingPE' not in skip_fields and
+            'trailingPE' not in extracted and
+            'forwardPE' in extracted):
+            extracted['trailingPE'] = extracted['forwardPE']
+            extracted['_trailingPE_source'] = 'proxy_from_forward_pe'
+
+        return extracted
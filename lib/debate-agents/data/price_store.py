@@ -0,0 +1,277 @@
+"""
+Incremental OHLCV Price Store
+One daily bar series per symbol, persisted as Parquet under
+config.data_cache_dir/prices and kept in memory for the life of the process.
+
+Any period / start / end request is served as a slice of the stored series.
+yfinance is only asked for what is missing:
+- backfill when a request reaches further back than anything fetched so far
+- one small delta request (from the last stored bar) per symbol per day
+
+At most PRICE_STORE_MAX_SYMBOLS series are held in memory (least recently
+used evicted first; they reload from Parquet on next use), and callers get
+copies, so they can never alter the stored series.
+
+Without pyarrow the store still works, but only in memory.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import pandas as pd
+import structlog
+import yfinance as yf
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+# --- Optional Dependencies ---
+try:
+    import pyarrow  # noqa: F401  (pandas Parquet engine)
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+    logger.warning("pyarrow_not_available", msg="Price store will not persist to disk")
+
+PRICE_STORE_DIRNAME = "prices"
+# Symbol series kept in memory (least recently used evicted first)
+PRICE_STORE_MAX_SYMBOLS = int(os.environ.get("PRICE_STORE_MAX_SYMBOLS", "256"))
+
+# Earliest date used for period="max"
+MAX_HISTORY_START = date(1950, 1, 1)
+
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+def is_supported_period(period: str) -> bool:
+    return period in PERIOD_OFFSETS or period in ('max', 'ytd')
+
+
+def period_start(period: str, today: Optional[date] = None) -> date:
+    """First calendar date covered by a yfinance-style period string."""
+    today = today or date.today()
+    if period == 'max':
+        return MAX_HISTORY_START
+    if period == 'ytd':
+        return date(today.year, 1, 1)
+    offset = PERIOD_OFFSETS.get(period)
+    if offset is None:
+        raise ValueError(f"Unsupported period: {period}")
+    return (pd.Timestamp(today) - offset).date()
+
+
+def _to_date(value: DateLike) -> date:
+    return pd.Timestamp(value).date()
+
+
+def slice_history(
+    series: pd.DataFrame,
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None
+) -> pd.DataFrame:
+    """Copy of the bars from start (inclusive) to end (exclusive, as in yfinance)."""
+    if series.empty:
+        return series.copy()
+    tz = series.index.tz
+    lower = pd.Timestamp(_to_date(start), tz=tz) if start is not None else None
+    upper = pd.Timestamp(_to_date(end), tz=tz) - pd.Timedelta(1, 'ns') if end is not None else None
+    return series.loc[lower:upper].copy()
+
+
+class PriceStore:
+    """Per-symbol daily bar series with incremental refresh."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else Path(config.data_cache_dir) / PRICE_STORE_DIRNAME
+        self.root.mkdir(parents=True, exist_ok=True)
+        # LRU order: most recently used last
+        self._series: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {'hits': 0, 'delta_fetches': 0, 'backfills': 0, 'bars_appended': 0, 'evictions': 0}
+
+    # --- Persistence ---
+
+    def _key(self, symbol: str) -> str:
+        return symbol.strip().upper()
+
+    def _paths(self, key: str):
+        safe = key.replace('/', '_').replace('^', '_')
+        return self.root / f"{safe}.parquet", self.root / f"{safe}.json"
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load(self, key: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Series and metadata of a symbol, from memory or else from disk."""
+        with self._cache_lock:
+            if key in self._series:
+                self._series.move_to_end(key)
+                return self._series[key], self._meta[key]
+
+        series, meta = pd.DataFrame(), {}
+        data_path, meta_path = self._paths(key)
+        if PARQUET_AVAILABLE and data_path.exists() and meta_path.exists():
+            try:
+                series = pd.read_parquet(data_path)
+                meta = json.loads(meta_path.read_text())
+            except Exception as e:
+                logger.warning("price_store_load_failed", symbol=key, error=str(e))
+                series, meta = pd.DataFrame(), {}
+        self._remember(key, series, meta)
+        return series, meta
+
+    def _remember(self, key: str, series: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        """Hold a series in memory, evicting the least recently used beyond the limit."""
+        with self._cache_lock:
+            self._series[key] = series
+            self._meta[key] = meta
+            self._series.move_to_end(key)
+            while len(self._series) > PRICE_STORE_MAX_SYMBOLS:
+                evicted, _ = self._series.popitem(last=False)
+                self._meta.pop(evicted, None)
+                self.stats['evictions'] += 1
+
+    def _save(self, key: str, series: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        if not PARQUET_AVAILABLE:
+            return
+        data_path, meta_path = self._paths(key)
+        try:
+            tmp = data_path.with_suffix('.parquet.tmp')
+            series.to_parquet(tmp)
+            tmp.replace(data_path)
+            meta_path.write_text(json.dumps(meta))
+        except Exception as e:
+            logger.warning("price_store_save_failed", symbol=key, error=str(e))
+
+    # --- Fetching ---
+
+    def _download(self, symbol: str, start: date, end: Optional[date] = None) -> pd.DataFrame:
+        """Blocking yfinance history request for [start, end)."""
+        kwargs = {'start': start.isoformat()}
+        if end:
+            kwargs['end'] = end.isoformat()
+        return yf.Ticker(symbol).history(**kwargs)
+
+    def _merge(self, current: pd.DataFrame, bars: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+        """Merge new bars into a series (newer bars win); returns the merged series and bars added."""
+        if bars is None or bars.empty:
+            return current, 0
+        if current.empty:
+            merged = bars
+        else:
+            merged = pd.concat([current, bars])
+            merged = merged[~merged.index.duplicated(keep='last')]
+        merged = merged.sort_index()
+        return merged, len(merged) - len(current)
+
+    def _ensure(self, symbol: str, start: date) -> pd.DataFrame:
+        """Make sure the stored series covers `start`..today, fetching only what is missing."""
+        key = self._key(symbol)
+        with self._lock_for(key):
+            series, meta = self._load(key)
+            meta = dict(meta)
+            today = date.today()
+            changed = False
+
+            covered_from = meta.get('covered_from')
+            if covered_from is None or start < date.fromisoformat(covered_from):
+                # Backfill: everything from `start` up to what we already hold
+                end = date.fromisoformat(covered_from) + timedelta(days=1) if covered_from else None
+                bars = self._download(symbol, start, end)
+                if bars.empty and covered_from is None:
+                    return series
+                self.stats['backfills'] += 1
+                series, added = self._merge(series, bars)
+                self.stats['bars_appended'] += added
+                meta['covered_from'] = start.isoformat()
+                if covered_from is None:
+                    meta['refreshed_on'] = today.isoformat()
+                changed = True
+
+            if meta.get('refreshed_on') != today.isoformat() and not series.empty:
+                # Delta: re-request the last stored bar (it may have been partial) onward
+                last_bar = series.index[-1].date()
+                bars = self._download(symbol, last_bar)
+                self.stats['delta_fetches'] += 1
+                series, added = self._merge(series, bars)
+                self.stats['bars_appended'] += added
+                meta['refreshed_on'] = today.isoformat()
+                changed = True
+                logger.debug("price_store_delta", symbol=key, from_date=last_bar.isoformat(), added=added)
+
+            if changed:
+                self._remember(key, series, meta)
+                self._save(key, series, meta)
+            else:
+                self.stats['hits'] += 1
+            return series
+
+    def get_history(
+        self,
+        symbol: str,
+        period: Optional[str] = "1y",
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None
+    ) -> pd.DataFrame:
+        """
+        Blocking: daily bars for a period, or for an explicit start/end
+        (end exclusive, as in yfinance). Returns a copy of that slice of the
+        stored series.
+        """
+        start_date = _to_date(start) if start is not None else period_start(period or "1y")
+        series = self._ensure(symbol, start_date)
+        return slice_history(series, start_date, end)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop stored series for one symbol, or all of them."""
+        with self._cache_lock:
+            keys = [self._key(symbol)] if symbol else list(self._series) + [
+                p.stem for p in self.root.glob("*.parquet")
+            ]
+            for key in set(keys):
+                self._series.pop(key, None)
+                self._meta.pop(key, None)
+        for key in set(keys):
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['symbols_loaded'] = len(self._series)
+        stats['max_symbols'] = PRICE_STORE_MAX_SYMBOLS
+        stats['persistent'] = PARQUET_AVAILABLE
+        return stats
+
+
+# Singleton Pattern
+_price_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """Get or create the process-wide price store."""
+    global _price_store
+    if _price_store is None:
+        _price_store = PriceStore()
+    return _price_store
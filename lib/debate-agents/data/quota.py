@@ -0,0 +1,337 @@
+"""
+Provider Quota Scheduler
+Per-provider minute and day buckets for the quota-limited fundamentals APIs
+(Alpha Vantage, EODHD, FMP), persisted in SQLite under config.data_cache_dir
+so every process sharing DATA_CACHE_DIR draws from the same buckets.
+
+- Calls are only made when both buckets have room, so we stop hitting 429s
+  instead of reacting to them.
+- A provider that reports exhaustion is marked spent until its day bucket
+  resets (UTC midnight) - for every process, not just the one that saw it.
+  A plain 429 only fills the minute bucket: these APIs answer 429 for the
+  per-minute limit too, and only a response naming the daily limit (see
+  is_daily_limit_response) spends the day.
+- Waiters are served highest priority first, and a slice of each day bucket
+  (DAILY_RESERVE_FRACTION) is held back for high-priority tickers: ex-US
+  names, where yfinance coverage is poor and these feeds matter most.
+- SQLite is never touched on the event loop: acquire() runs its bucket
+  transaction in the market-data executor, and has_capacity() answers from
+  an in-memory snapshot of each day bucket, refreshed in the background.
+
+Limits default to the free tiers and can be raised per provider with
+<PROVIDER>_PER_MINUTE / <PROVIDER>_PER_DAY (e.g. EODHD_PER_DAY=100000).
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from src.config import config
+from src.data.executor import run_blocking
+from src.data.routing import exchange_suffix
+
+logger = structlog.get_logger(__name__)
+
+QUOTA_DB_FILENAME = "provider_quota.sqlite"
+
+PRIORITY_HIGH = 1.0
+PRIORITY_NORMAL = 0.0
+
+# Share of each daily bucket only high-priority requests may use
+DAILY_RESERVE_FRACTION = float(os.environ.get("QUOTA_DAILY_RESERVE_FRACTION", "0.4"))
+
+# How long acquire() waits for a minute bucket to refill before giving up
+DEFAULT_ACQUIRE_TIMEOUT = 10.0
+POLL_INTERVAL_SECONDS = 0.25
+# Age after which has_capacity() refreshes its day-bucket snapshot (picks up other processes)
+CAPACITY_SNAPSHOT_SECONDS = 5.0
+
+# Wording providers use in a 429 body when the daily (not per-minute) limit is spent
+DAILY_LIMIT_MARKERS = ('daily', 'per day')
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    per_minute: int
+    per_day: int
+
+
+def _limits(name: str, per_minute: int, per_day: int) -> ProviderLimits:
+    prefix = name.upper()
+    return ProviderLimits(
+        per_minute=int(os.environ.get(f"{prefix}_PER_MINUTE", str(per_minute))),
+        per_day=int(os.environ.get(f"{prefix}_PER_DAY", str(per_day))),
+    )
+
+
+PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    'alpha_vantage': _limits('alpha_vantage', 5, 25),
+    'eodhd': _limits('eodhd', 60, 20),
+    'fmp': _limits('fmp', 60, 250),
+}
+
+
+def ticker_priority(symbol: str) -> float:
+    """Ex-US listings get first claim on scarce fundamentals calls."""
+    return PRIORITY_HIGH if exchange_suffix(symbol) != 'US' else PRIORITY_NORMAL
+
+
+def is_daily_limit_response(body: str) -> bool:
+    """True when a rate-limit response body says the daily limit is reached."""
+    body = (body or "").lower()
+    return any(marker in body for marker in DAILY_LIMIT_MARKERS)
+
+
+def _minute_window(now: float) -> int:
+    return int(now // 60)
+
+
+def _day_window(now: float) -> int:
+    return int(now // 86400)
+
+
+class QuotaScheduler:
+    """Cross-process minute/day buckets with a priority wait queue."""
+
+    def __init__(self, path: Optional[Path] = None, limits: Optional[Dict[str, ProviderLimits]] = None):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / QUOTA_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.limits = limits or PROVIDER_LIMITS
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                provider TEXT PRIMARY KEY,
+                minute_window INTEGER NOT NULL,
+                minute_used INTEGER NOT NULL,
+                day_window INTEGER NOT NULL,
+                day_used INTEGER NOT NULL
+            )
+            """
+        )
+        # provider -> (time read, day_used) as last seen in SQLite
+        self._day_snapshot: Dict[str, Tuple[float, int]] = {}
+        # Background snapshot refreshes in flight (strong references)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, List[Tuple[float, int]]] = {}
+        self._seq = itertools.count()
+        self.stats = {
+            'granted': 0, 'denied_daily': 0, 'timed_out': 0,
+            'exhausted_reports': 0, 'rate_limited_reports': 0,
+        }
+
+    # --- Bucket state (one short IMMEDIATE transaction each) ---
+
+    def _read(self, provider: str, now: float) -> Tuple[int, int]:
+        """Current (minute_used, day_used), with expired windows reset. Caller holds the txn."""
+        row = self._conn.execute(
+            "SELECT minute_window, minute_used, day_window, day_used FROM quota_usage WHERE provider = ?",
+            (provider,)
+        ).fetchone()
+        if not row:
+            return 0, 0
+        minute_window, minute_used, day_window, day_used = row
+        if minute_window != _minute_window(now):
+            minute_used = 0
+        if day_window != _day_window(now):
+            day_used = 0
+        self._day_snapshot[provider] = (now, day_used)
+        return minute_used, day_used
+
+    def _write(self, provider: str, now: float, minute_used: int, day_used: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO quota_usage (provider, minute_window, minute_used, day_window, day_used) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (provider, _minute_window(now), minute_used, _day_window(now), day_used)
+        )
+        self._day_snapshot[provider] = (now, day_used)
+
+    def _day_allowance(self, provider: str, priority: float) -> int:
+        per_day = self.limits[provider].per_day
+        if priority >= PRIORITY_HIGH:
+            return per_day
+        return int(per_day * (1 - DAILY_RESERVE_FRACTION))
+
+    def try_acquire(self, provider: str, priority: float = PRIORITY_NORMAL) -> Tuple[bool, Optional[float]]:
+        """
+        Take one call from the buckets if both have room.
+        Returns (granted, retry_after): retry_after is the wait until the
+        minute bucket refills, or None when the day allowance is spent.
+        """
+        if provider not in self.limits:
+            return True, 0.0
+        limits = self.limits[provider]
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                minute_used, day_used = self._read(provider, now)
+                if day_used >= self._day_allowance(provider, priority):
+                    self._conn.execute("COMMIT")
+                    return False, None
+                if minute_used >= limits.per_minute:
+                    self._conn.execute("COMMIT")
+                    return False, 60 - (now % 60)
+                self._write(provider, now, minute_used + 1, day_used + 1)
+                self._conn.execute("COMMIT")
+                return True, 0.0
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def has_capacity(self, provider: str, priority: float = PRIORITY_HIGH) -> bool:
+        """
+        Non-binding check: is there any day allowance left at this priority?
+
+        Answered from the day-bucket snapshot; a stale one is refreshed in the
+        background when called on an event loop. With no snapshot yet (or one
+        from a previous day) there is assumed to be room; acquire() has the
+        final say.
+        """
+        if provider not in self.limits:
+            return True
+        now = time.time()
+        snapshot = self._day_snapshot.get(provider)
+        if snapshot is None or now - snapshot[0] > CAPACITY_SNAPSHOT_SECONDS:
+            self._refresh_snapshot(provider)
+            snapshot = self._day_snapshot.get(provider)
+        if snapshot is None or _day_window(snapshot[0]) != _day_window(now):
+            return True
+        return snapshot[1] < self._day_allowance(provider, priority)
+
+    def _read_day_used(self, provider: str) -> None:
+        with self._lock:
+            self._read(provider, time.time())
+
+    def _refresh_snapshot(self, provider: str) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous caller: reading inline blocks nobody
+            self._read_day_used(provider)
+            return
+        task = self._refreshing.get(provider)
+        if task is not None and task.get_loop() is loop and not task.done():
+            return
+
+        async def _refresh() -> None:
+            try:
+                await run_blocking(self._read_day_used, provider)
+            except Exception as e:
+                logger.debug("provider_quota_snapshot_failed", provider=provider, error=str(e))
+            finally:
+                if self._refreshing.get(provider) is asyncio.current_task():
+                    del self._refreshing[provider]
+
+        self._refreshing[provider] = asyncio.create_task(_refresh())
+
+    def report_exhausted(self, provider: str) -> None:
+        """Provider says the daily quota is spent: mark the day bucket full for every process."""
+        if provider not in self.limits:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                minute_used, _ = self._read(provider, now)
+                self._write(provider, now, minute_used, self.limits[provider].per_day)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.stats['exhausted_reports'] += 1
+        logger.info("provider_quota_exhausted", provider=provider, resets_in_s=int(86400 - now % 86400))
+
+    def report_rate_limited(self, provider: str) -> None:
+        """Provider answered 429 for its per-minute limit: mark the minute bucket full for every process."""
+        if provider not in self.limits:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                _, day_used = self._read(provider, now)
+                self._write(provider, now, self.limits[provider].per_minute, day_used)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.stats['rate_limited_reports'] += 1
+        logger.info("provider_quota_rate_limited", provider=provider, resets_in_s=int(60 - now % 60))
+
+    # --- Priority wait queue (per process) ---
+
+    async def acquire(
+        self,
+        provider: str,
+        priority: float = PRIORITY_NORMAL,
+        timeout: float = DEFAULT_ACQUIRE_TIMEOUT
+    ) -> bool:
+        """
+        Wait (up to `timeout`) for a call slot. Higher-priority waiters are
+        served first when the minute bucket refills. Returns False without
+        waiting once the day allowance for this priority is spent.
+        """
+        entry = (-priority, next(self._seq))
+        queue = self._waiters.setdefault(provider, [])
+        heapq.heappush(queue, entry)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                if queue[0] == entry:
+                    granted, retry_after = await run_blocking(self.try_acquire, provider, priority)
+                    if granted:
+                        self.stats['granted'] += 1
+                        return True
+                    if retry_after is None:
+                        self.stats['denied_daily'] += 1
+                        logger.debug("provider_quota_daily_denied", provider=provider, priority=priority)
+                        return False
+                    wait = min(retry_after, POLL_INTERVAL_SECONDS * 4)
+                else:
+                    wait = POLL_INTERVAL_SECONDS
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['timed_out'] += 1
+                    logger.debug("provider_quota_wait_timeout", provider=provider, priority=priority)
+                    return False
+                await asyncio.sleep(min(wait, remaining))
+        finally:
+            queue.remove(entry)
+            heapq.heapify(queue)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        now = time.time()
+        with self._lock:
+            for provider, limits in self.limits.items():
+                minute_used, day_used = self._read(provider, now)
+                stats[provider] = {
+                    'minute_used': minute_used, 'per_minute': limits.per_minute,
+                    'day_used': day_used, 'per_day': limits.per_day,
+                }
+        return stats
+
+
+# Singleton Pattern
+_quota_scheduler: Optional[QuotaScheduler] = None
+
+
+def get_quota_scheduler() -> QuotaScheduler:
+    """Get or create the process-wide quota scheduler."""
+    global _quota_scheduler
+    if _quota_scheduler is None:
+        _quota_scheduler = QuotaScheduler()
+    return _quota_scheduler
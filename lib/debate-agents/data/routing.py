@@ -0,0 +1,237 @@
+"""
+Adaptive Source Routing
+Learns, per (exchange suffix, source), how often a provider returns data and
+how many fields it contributes beyond the primary source and the sources
+ranked ahead of it (marginal coverage; see coverage_baselines). Only fields
+the merge cares about count (the caller passes them, e.g. the fetcher's
+IMPORTANT_FIELDS); a provider padding its payload with extras the merge
+ignores earns no credit for them. Ranking the comparison means that of two
+providers supplying the same fields yfinance lacks, the first keeps the
+credit and stays routed in. Statistics are exponentially weighted, kept in
+memory and persisted under config.data_cache_dir in batches (see flush) so
+they carry across runs without a SQLite write per completed source.
+
+Only real attempts are recorded: a provider skipped for a missing API key or
+an exhausted quota is not counted as a failure, so it is back in rotation as
+soon as its quota resets.
+
+The routing policy skips a source once it has enough samples and its expected
+marginal contribution (success rate x marginal fields) is below
+MIN_EXPECTED_MARGINAL_FIELDS - e.g. FMP on listings it does not cover, or
+yahooquery on US names already fully served by yfinance. A small exploration
+rate keeps skipped sources sampled so the router notices when they improve.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+ROUTING_DB_FILENAME = "source_routing.sqlite"
+ROUTING_TABLE = "source_routing_v3"
+
+MIN_SAMPLES = 5
+EWMA_ALPHA = 0.2
+MIN_EXPECTED_MARGINAL_FIELDS = float(os.environ.get("ROUTING_MIN_MARGINAL_FIELDS", "0.5"))
+EXPLORE_RATE = float(os.environ.get("ROUTING_EXPLORE_RATE", "0.1"))
+
+# Never routed away: the primary source every merge is built on
+ALWAYS_QUERY = {'yfinance'}
+
+
+def exchange_suffix(symbol: str) -> str:
+    """Exchange suffix of a yfinance-style symbol ('0005.HK' -> 'HK'); bare symbols are 'US'."""
+    symbol = (symbol or "").upper()
+    return symbol.rsplit('.', 1)[1] if '.' in symbol else 'US'
+
+
+def payload_fields(data: Optional[Dict[str, Any]], relevant: Optional[Iterable[str]] = None) -> Set[str]:
+    """Data fields (non-metadata, non-null) in a source payload, limited to `relevant` if given."""
+    if not data:
+        return set()
+    fields = {k for k, v in data.items() if v is not None and not k.startswith('_')}
+    return fields & set(relevant) if relevant is not None else fields
+
+
+def coverage_baselines(fields_by_source: Dict[str, Set[str]], priority: Iterable[str]) -> Dict[str, Set[str]]:
+    """
+    Fields each source's marginal coverage is measured against.
+
+    A fallback is compared with the primary sources plus every source ranked
+    ahead of it in priority; a primary source only with the other primaries.
+    """
+    primary = set().union(*(f for name, f in fields_by_source.items() if name in ALWAYS_QUERY))
+    baselines: Dict[str, Set[str]] = {}
+    ahead = set(primary)
+    for source in priority:
+        if source in ALWAYS_QUERY:
+            baselines[source] = set().union(
+                *(f for name, f in fields_by_source.items() if name in ALWAYS_QUERY and name != source)
+            )
+            continue
+        baselines[source] = set(ahead)
+        ahead |= fields_by_source.get(source, set())
+    return baselines
+
+
+@dataclass
+class SourceStats:
+    attempts: int = 0
+    success_rate: float = 1.0
+    marginal_fields: float = 0.0
+
+    @property
+    def expected_marginal(self) -> float:
+        return self.success_rate * self.marginal_fields
+
+
+class SourceRouter:
+    """Per-(suffix, source) hit-rate / marginal-coverage tracker and policy."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / ROUTING_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stats: Dict[tuple, SourceStats] = {}
+        self._dirty: Set[tuple] = set()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {ROUTING_TABLE} (
+                    suffix TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    success_rate REAL NOT NULL,
+                    marginal_fields REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (suffix, source)
+                )
+                """
+            )
+            for suffix, source, attempts, success, marginal in self._conn.execute(
+                f"SELECT suffix, source, attempts, success_rate, marginal_fields FROM {ROUTING_TABLE}"
+            ):
+                self._stats[(suffix, source)] = SourceStats(attempts, success, marginal)
+        except sqlite3.Error as e:
+            logger.warning("source_routing_persistence_unavailable", error=str(e))
+            self._conn = None
+
+    def select_sources(self, symbol: str, candidates: Iterable[str]) -> List[str]:
+        """Sources worth querying for this symbol, in the given order."""
+        suffix = exchange_suffix(symbol)
+        selected, skipped = [], []
+        for source in candidates:
+            stats = self._stats.get((suffix, source))
+            if (
+                source in ALWAYS_QUERY
+                or stats is None
+                or stats.attempts < MIN_SAMPLES
+                or stats.expected_marginal >= MIN_EXPECTED_MARGINAL_FIELDS
+                or random.random() < EXPLORE_RATE
+            ):
+                selected.append(source)
+            else:
+                skipped.append(source)
+
+        if skipped:
+            logger.info("sources_skipped_by_routing", symbol=symbol, suffix=suffix, skipped=skipped)
+        return selected
+
+    def record(
+        self,
+        symbol: str,
+        source: str,
+        data: Optional[Dict[str, Any]],
+        baseline_fields: Set[str],
+        relevant_fields: Iterable[str]
+    ) -> None:
+        """
+        Fold one real attempt into the (suffix, source) statistics, in memory
+        only; flush() persists them.
+
+        Callers must not record sources that were skipped for configuration
+        or quota reasons; those say nothing about the provider's coverage.
+        """
+        key = (exchange_suffix(symbol), source)
+        success = 1.0 if payload_fields(data) else 0.0
+        marginal = float(len(payload_fields(data, relevant_fields) - baseline_fields))
+
+        with self._lock:
+            stats = self._stats.setdefault(key, SourceStats())
+            if stats.attempts == 0:
+                stats.success_rate, stats.marginal_fields = success, marginal
+            else:
+                stats.success_rate += EWMA_ALPHA * (success - stats.success_rate)
+                if success:
+                    stats.marginal_fields += EWMA_ALPHA * (marginal - stats.marginal_fields)
+            stats.attempts += 1
+            self._dirty.add(key)
+
+    def flush(self) -> int:
+        """
+        Persist every (suffix, source) updated since the last flush in one
+        transaction; returns the number of rows written. Blocking: async
+        callers go through run_blocking.
+        """
+        if self._conn is None:
+            return 0
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                now = time.time()
+                rows = []
+                for key in self._dirty:
+                    stats = self._stats[key]
+                    rows.append((*key, stats.attempts, stats.success_rate, stats.marginal_fields, now))
+                self._dirty.clear()
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO {ROUTING_TABLE} "
+                        "(suffix, source, attempts, success_rate, marginal_fields, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logger.debug("source_routing_write_failed", error=str(e))
+                with self._lock:
+                    self._dirty.update((suffix, source) for suffix, source, *_ in rows)
+                return 0
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                f"{suffix}:{source}": {
+                    'attempts': s.attempts,
+                    'success_rate': round(s.success_rate, 3),
+                    'marginal_fields': round(s.marginal_fields, 2),
+                }
+                for (suffix, source), s in sorted(self._stats.items())
+            }
+
+
+# Singleton Pattern
+_source_router: Optional[SourceRouter] = None
+
+
+def get_source_router() -> SourceRouter:
+    """Get or create the process-wide source router."""
+    global _source_router
+    if _source_router is None:
+        _source_router = SourceRouter()
+    return _source_router
@@ -0,0 +1,136 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same (provider, endpoint, symbol) share one
+in-flight call and its result instead of racing to make duplicate requests.
+
+A completed result can optionally be kept for a short `ttl`, so callers that
+arrive just after the call finished (e.g. the News and Fundamentals tools in
+the same graph run) reuse it too. Failures are never retained. Expired
+results are swept whenever a new one is retained, and at most
+MAX_RETAINED_RESULTS are kept (oldest dropped first).
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound on results retained for reuse, per SingleFlight
+MAX_RETAINED_RESULTS = 1024
+
+
+class SingleFlight:
+    """Keyed coalescing of async calls."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {'calls': 0, 'executed': 0, 'coalesced': 0, 'reused': 0}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]], ttl: float = 0) -> T:
+        """
+        Return the result for `key`, running `factory()` only if no identical
+        call is in flight (or retained within `ttl` seconds).
+        """
+        result, _ = await self.do_shared(key, factory, ttl=ttl)
+        return result
+
+    async def do_shared(self, key: Hashable, factory: Callable[[], Awaitable[T]], ttl: float = 0) -> Tuple[T, bool]:
+        """
+        Like do(), also telling this caller's role: shared is False for the
+        caller that ran factory(), True for one that joined an in-flight call
+        or reused a retained result.
+        """
+        self.stats['calls'] += 1
+
+        recent = self._recent.get(key)
+        if recent:
+            expires_at, result = recent
+            if time.monotonic() < expires_at:
+                self.stats['reused'] += 1
+                return result, True
+            del self._recent[key]
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is loop:
+            self.stats['coalesced'] += 1
+            logger.debug("singleflight_coalesced", key=key)
+            # Shield so one caller's cancellation doesn't cancel the shared call
+            return await asyncio.shield(task), True
+
+        task = loop.create_task(factory())
+        self._inflight[key] = task
+        self.stats['executed'] += 1
+
+        def _done(done: asyncio.Task) -> None:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+            # Always retrieve the outcome: every caller may have been cancelled
+            # while the shielded call ran on
+            if done.cancelled() or done.exception() is not None:
+                return
+            if ttl > 0:
+                self._retain(key, done.result(), ttl)
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task), False
+
+    def _retain(self, key: Hashable, result: Any, ttl: float) -> None:
+        """Keep a result for reuse, sweeping expired entries and enforcing the size cap."""
+        now = time.monotonic()
+        for stale in [k for k, (expires_at, _) in self._recent.items() if expires_at <= now]:
+            del self._recent[stale]
+        self._recent.pop(key, None)
+        while len(self._recent) >= MAX_RETAINED_RESULTS:
+            # Dicts keep insertion order: the first entry is the oldest
+            del self._recent[next(iter(self._recent))]
+        self._recent[key] = (now + ttl, result)
+
+    def cancel_inflight(self) -> int:
+        """Cancel every call still in flight; returns how many were cancelled."""
+        tasks = [task for task in self._inflight.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        return len(tasks)
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """Drop retained results for one key, or all of them."""
+        if key is None:
+            self._recent.clear()
+        else:
+            self._recent.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats['in_flight'] = len(self._inflight)
+        return stats
+
+
+# Singleton Pattern
+_provider_flight: Optional[SingleFlight] = None
+
+
+def get_provider_flight() -> SingleFlight:
+    """Get or create the process-wide single-flight group for provider calls."""
+    global _provider_flight
+    if _provider_flight is None:
+        _provider_flight = SingleFlight()
+    return _provider_flight
+
+
+async def provider_call(
+    provider: str,
+    endpoint: str,
+    symbol: str,
+    factory: Callable[[], Awaitable[T]],
+    ttl: float = 0
+) -> T:
+    """Coalesce a provider call keyed by (provider, endpoint, symbol)."""
+    key = (provider, endpoint, (symbol or "").strip().upper())
+    return await get_provider_flight().do(key, factory, ttl=ttl)
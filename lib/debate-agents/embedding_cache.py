@@ -0,0 +1,182 @@
+"""
+Content-Addressed Embedding Cache
+Persistent cache for memory embeddings keyed by (model, task_type,
+sha256(text)). Bull and Bear researchers send the same query every debate
+round and every memory instance used to embed the same init probe; with the
+cache an identical text costs no API call and no GLOBAL_RATE_LIMITER token.
+
+Vectors are stored compactly as float32 blobs in SQLite under
+DATA_CACHE_DIR. Each entry records its last use, and the least recently used
+entries are evicted once the cache holds more than
+EMBEDDING_CACHE_MAX_ENTRIES vectors.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+
+from src.config import config
+
+logger = structlog.get_logger(__name__)
+
+EMBEDDING_CACHE_DB_FILENAME = "embeddings.sqlite"
+EMBEDDING_CACHE_ENABLED = os.environ.get("EMBEDDING_CACHE", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+# Evict only when this far over the limit, so eviction is not run on every write
+EVICTION_SLACK = 0.05
+
+
+def content_key(model: str, task_type: str, text: str) -> str:
+    """Cache key for one text: model, task type and the SHA-256 of the exact text."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}|{task_type}|{digest}"
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """SQLite store of float32 embedding vectors with LRU eviction (blocking; async callers use a thread)."""
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / EMBEDDING_CACHE_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+            """
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evicted': 0}
+
+    def get_many(self, model: str, task_type: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for texts (None where missing), refreshing their LRU position."""
+        keys = [content_key(model, task_type, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        try:
+            with self._lock, self._conn:
+                unique = list(dict.fromkeys(keys))
+                for start in range(0, len(unique), 500):
+                    chunk = unique[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    found.update((key, _unpack(blob)) for key, blob in rows)
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found]
+                    )
+        except sqlite3.Error as e:
+            logger.warning("embedding_cache_read_failed", error=str(e))
+
+        result = [found.get(key) for key in keys]
+        hits = sum(1 for vector in result if vector is not None)
+        self.stats['hits'] += hits
+        self.stats['misses'] += len(result) - hits
+        return result
+
+    def get(self, model: str, task_type: str, text: str) -> Optional[List[float]]:
+        return self.get_many(model, task_type, [text])[0]
+
+    def put_many(self, model: str, task_type: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store vectors for texts, evicting least recently used entries when full."""
+        now = time.time()
+        rows = [
+            (content_key(model, task_type, text), len(vector), _pack(vector), now)
+            for text, vector in zip(texts, vectors) if vector
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                inserted = 0
+                for key, dim, blob, last_used in rows:
+                    # Insert new keys; an existing key is overwritten in place, so only
+                    # real inserts grow the entry count
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO embeddings (key, dim, vector, last_used) VALUES (?, ?, ?, ?)",
+                        (key, dim, blob, last_used)
+                    )
+                    if cursor.rowcount:
+                        inserted += 1
+                    else:
+                        self._conn.execute(
+                            "UPDATE embeddings SET dim = ?, vector = ?, last_used = ? WHERE key = ?",
+                            (dim, blob, last_used, key)
+                        )
+                self.stats['writes'] += len(rows)
+                self._count += inserted
+                if self._count > self.max_entries * (1 + EVICTION_SLACK):
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.warning("embedding_cache_write_failed", error=str(e))
+
+    def put(self, model: str, task_type: str, text: str, vector: Sequence[float]) -> None:
+        self.put_many(model, task_type, [text], [vector])
+
+    def _evict(self) -> None:
+        """Drop least recently used entries down to max_entries (caller holds the lock)."""
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._count -= excess
+        self.stats['evicted'] += excess
+        logger.info("embedding_cache_evicted", count=excess, remaining=self._count)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['entries'] = self._count
+        return stats
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Process-wide EmbeddingCache, or None when disabled (EMBEDDING_CACHE=false)."""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _embedding_cache is None:
+        try:
+            _embedding_cache = EmbeddingCache()
+        except sqlite3.Error as e:
+            logger.warning("embedding_cache_unavailable", error=str(e))
+            return None
+    return _embedding_cache
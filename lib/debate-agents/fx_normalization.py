@@ -15,6 +15,8 @@ import structlog
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 
+from src.data.executor import run_blocking
+
 logger = structlog.get_logger(__name__)
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -45,7 +47,7 @@ async def get_fx_rate_yfinance(from_currency: str, to_currency: str = "USD") ->
     try:
         import yfinance as yf
 
-        # Use async thread pool to avoid blocking
+        # Blocking yfinance call runs on the shared market-data executor
         def _fetch_rate():
             ticker = yf.Ticker(fx_ticker)
             # Try fast_info first (faster)
@@ -56,7 +58,7 @@ async def get_fx_rate_yfinance(from_currency: str, to_currency: str = "USD") ->
             return info.get('regularMarketPrice') or info.get('previousClose')
 
         rate = await asyncio.wait_for(
-            asyncio.to_thread(_fetch_rate),
+            run_blocking(_fetch_rate),
             timeout=3.0  # Quick timeout - we have fallbacks
         )
 
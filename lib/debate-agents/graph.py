@@ -4,13 +4,19 @@ Updated for Gemini 3.0 Routing and LangGraph 1.x compatibility.
 FIXED: Tool routing now tracks which agent called the tool via sender field.
 FIXED: Added ticker logging to track contamination issues.
 UPDATED: Added ticker-specific memory isolation to prevent cross-contamination.
+UPDATED: Analysts run as parallel branches (own message scope and tool loop each);
+         News and Fundamentals share one branch node, so Fundamentals waits only for
+         News; a join barrier precedes the validator.
+UPDATED: Risky / Safe / Neutral debaters run in parallel and join before the Portfolio Manager.
+UPDATED: get_trading_graph() compiles once per process; ticker memories are injected per run.
+UPDATED: A Data Prefetch node at START warms the run's tool cache while analysts take their first turn.
 """
 
-from typing import Literal, Dict, Optional
+from typing import Any, Literal, Dict, Optional
 from dataclasses import dataclass
 import structlog
 
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langgraph.types import RunnableConfig
 # Modern ToolNode import for LangGraph 1.x
 from langgraph.prebuilt import ToolNode
@@ -20,15 +26,16 @@ from src.agents import (
     AgentState, create_analyst_node, create_researcher_node,
     create_research_manager_node, create_trader_node,
     create_risk_debater_node, create_portfolio_manager_node,
-    create_state_cleaner_node, create_financial_health_validator_node,
-    create_consultant_node
+    create_financial_health_validator_node, create_consultant_node
 )
+from src.config import config as app_config
 from src.llms import create_quick_thinking_llm, create_deep_thinking_llm, get_consultant_llm
 from src.toolkit import toolkit
+from src.prefetch import create_prefetch_node
 from src.token_tracker import TokenTrackingCallback, get_tracker
 from src.memory import (
     create_memory_instances, cleanup_all_memories, FinancialSituationMemory,
-    sanitize_ticker_for_collection
+    sanitize_ticker_for_collection, MEMORY_ROLES
 )
 
 logger = structlog.get_logger(__name__)
@@ -51,6 +58,8 @@ class TradingContext:
     ticker_memories: Optional[Dict[str, any]] = None
     # NEW: Whether to cleanup previous ticker memories
     cleanup_previous_memories: bool = True
+    # Checkpointed run: node failures propagate so the run stays resumable
+    resumable: bool = False
 
 def should_continue_analyst(state: AgentState, config: RunnableConfig) -> Literal["tools", "continue"]:
     """
@@ -68,36 +77,85 @@ def should_continue_analyst(state: AgentState, config: RunnableConfig) -> Litera
         return "tools"
     return "continue"
 
-def route_tools(state: AgentState) -> str:
+def create_analyst_branch(llm, agent_key: str, tools: list, output_field: str):
     """
-    Route back to the agent that called the tool.
-    Uses the 'sender' field from the state to determine which agent to return to.
+    Wrap one analyst and its tool loop into an isolated branch node.
+
+    The analyst runs in its own compiled subgraph (agent <-> ToolNode) with a
+    private message list seeded from the run's opening request, so parallel
+    analysts never see each other's tool calls. Only the report field and the
+    prompt metadata are written back to the parent graph.
 
     Args:
-        state: Current agent state with sender information
+        llm: LLM for this analyst
+        agent_key: Prompt key (e.g. "market_analyst")
+        tools: Tools available to this analyst
+        output_field: State field the finished report is written to
 
     Returns:
-        Name of the node to return to after tool execution
+        Async node function for the parent StateGraph
     """
-    sender = state.get("sender", "")
-
-    # Map internal agent keys to Node Names
-    agent_map = {
-        "market_analyst": "Market Analyst",
-        "sentiment_analyst": "Social Analyst",
-        "news_analyst": "News Analyst",
-        "fundamentals_analyst": "Fundamentals Analyst"
-    }
-
-    node_name = agent_map.get(sender, "Market Analyst")
-
-    logger.debug(
-        "tool_routing",
-        sender=sender,
-        routing_to=node_name
-    )
+    analyst = create_analyst_node(llm, agent_key, tools, output_field)
+
+    branch = StateGraph(AgentState)
+    branch.add_node("agent", analyst)
+    branch.add_node("tools", ToolNode(tools))
+    branch.add_edge(START, "agent")
+    branch.add_conditional_edges("agent", should_continue_analyst, {"tools": "tools", "continue": END})
+    branch.add_edge("tools", "agent")
+    compiled_branch = branch.compile()
+
+    async def analyst_branch(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        opening = [m for m in state.get("messages", []) if isinstance(m, HumanMessage)][:1]
+        scoped_state = {
+            "messages": opening,
+            "company_of_interest": state.get("company_of_interest", ""),
+            "company_name": state.get("company_name", ""),
+            "trade_date": state.get("trade_date", ""),
+            "sender": agent_key,
+            "prompts_used": {},
+            # Fundamentals Analyst reads the News report (its only upstream dependency)
+            "news_report": state.get("news_report", ""),
+        }
+        result = await compiled_branch.ainvoke(scoped_state, config)
+
+        logger.debug(
+            "analyst_branch_complete",
+            agent=agent_key,
+            ticker=scoped_state["company_of_interest"],
+            scoped_messages=len(result.get("messages", []))
+        )
+        return {
+            output_field: result.get(output_field, ""),
+            "prompts_used": result.get("prompts_used", {}),
+        }
+
+    return analyst_branch
 
-    return node_name
+
+def chain_branches(*branches):
+    """
+    Run analyst branches one after another inside a single parent node.
+
+    LangGraph starts a node only after the whole previous superstep has
+    finished, so an edge News -> Fundamentals would also make Fundamentals
+    wait for Market and Social. Chaining them in one node starts Fundamentals
+    as soon as News is done; each branch sees the reports written before it.
+
+    Returns:
+        Async node function writing every branch's report and prompt metadata
+    """
+    async def chained(state: AgentState, config: RunnableConfig) -> Dict[str, Any]:
+        update: Dict[str, Any] = {}
+        prompts_used: Dict[str, Any] = {}
+        for branch in branches:
+            result = await branch({**state, **update}, config)
+            prompts_used.update(result.get("prompts_used", {}))
+            update.update(result)
+        update["prompts_used"] = prompts_used
+        return update
+
+    return chained
 
 
 def validator_router(state: AgentState, config: RunnableConfig) -> Literal["Portfolio Manager", "Bull Researcher"]:
@@ -139,6 +197,59 @@ def validator_router(state: AgentState, config: RunnableConfig) -> Literal["Port
     # Normal flow - proceed to debate
     return "Bull Researcher"
 
+def create_ticker_memories(ticker: str, cleanup_previous: bool = False) -> Dict[str, FinancialSituationMemory]:
+    """
+    Create the ticker-specific memories for one run, keyed by role.
+
+    The result is meant for TradingContext.ticker_memories, which nodes of a
+    shared compiled graph read at invoke time.
+
+    Args:
+        ticker: Stock ticker symbol (e.g., "0005.HK", "AAPL")
+        cleanup_previous: If True, deletes this ticker's previous memories first
+
+    Returns:
+        Dict mapping role (e.g. "bull_memory") to its FinancialSituationMemory
+
+    Raises:
+        ValueError: If any role's memory instance could not be created
+    """
+    if cleanup_previous:
+        logger.info(
+            "cleaning_previous_memories",
+            ticker=ticker,
+            message="Deleting previous memory collections for THIS ticker to prevent contamination"
+        )
+        # UPDATED: Pass ticker to scoped cleanup
+        cleanup_all_memories(days=0, ticker=ticker)
+
+    logger.info(
+        "creating_ticker_memories",
+        ticker=ticker,
+        message="Creating ticker-specific memory collections"
+    )
+    memories = create_memory_instances(ticker)
+
+    # CRITICAL: Must use same sanitization as create_memory_instances()
+    safe_ticker = sanitize_ticker_for_collection(ticker)
+    role_memories = {role: memories.get(f"{safe_ticker}_{role}") for role in MEMORY_ROLES}
+
+    # Verify all memories were successfully created
+    missing = [role for role, memory in role_memories.items() if not memory]
+    if missing:
+        raise ValueError(
+            f"Failed to create memory instances for ticker {ticker}. "
+            f"Missing: {', '.join(missing)}. "
+            f"Available keys: {list(memories.keys())}"
+        )
+
+    logger.info(
+        "ticker_memories_ready",
+        ticker=ticker,
+        **{f"{role}_available": memory.available for role, memory in role_memories.items()}
+    )
+    return role_memories
+
 def create_trading_graph(
     max_debate_rounds: int = 2,
     max_risk_discuss_rounds: int = 1,
@@ -152,6 +263,8 @@ def create_trading_graph(
     Create the multi-agent trading analysis graph with ticker-specific memory isolation.
 
     UPDATED: Now supports ticker-specific memories to prevent cross-contamination.
+    For long-lived processes prefer get_trading_graph() with per-run memories
+    passed in TradingContext.ticker_memories.
 
     Args:
         ticker: Stock ticker symbol (e.g., "0005.HK", "AAPL"). If provided, creates
@@ -183,54 +296,7 @@ def create_trading_graph(
     # Determine which memories to use
     if ticker and enable_memory:
         # RECOMMENDED: Create ticker-specific memories
-        if cleanup_previous:
-            logger.info(
-                "cleaning_previous_memories",
-                ticker=ticker,
-                message="Deleting previous memory collections for THIS ticker to prevent contamination"
-            )
-            # UPDATED: Pass ticker to scoped cleanup
-            cleanup_all_memories(days=0, ticker=ticker)
-        
-        logger.info(
-            "creating_ticker_memories",
-            ticker=ticker,
-            message="Creating ticker-specific memory collections"
-        )
-        memories = create_memory_instances(ticker)
-
-        # Extract specific memories for each agent
-        # CRITICAL: Must use same sanitization as create_memory_instances()
-        safe_ticker = sanitize_ticker_for_collection(ticker)
-        bull_memory = memories.get(f"{safe_ticker}_bull_memory")
-        bear_memory = memories.get(f"{safe_ticker}_bear_memory")
-        invest_judge_memory = memories.get(f"{safe_ticker}_invest_judge_memory")
-        trader_memory = memories.get(f"{safe_ticker}_trader_memory")
-        risk_manager_memory = memories.get(f"{safe_ticker}_risk_manager_memory")
-
-        # Verify all memories were successfully created
-        if not all([bull_memory, bear_memory, invest_judge_memory, trader_memory, risk_manager_memory]):
-            missing = []
-            if not bull_memory: missing.append("bull_memory")
-            if not bear_memory: missing.append("bear_memory")
-            if not invest_judge_memory: missing.append("invest_judge_memory")
-            if not trader_memory: missing.append("trader_memory")
-            if not risk_manager_memory: missing.append("risk_manager_memory")
-            raise ValueError(
-                f"Failed to create memory instances for ticker {ticker}. "
-                f"Missing: {', '.join(missing)}. "
-                f"Available keys: {list(memories.keys())}"
-            )
-
-        logger.info(
-            "ticker_memories_ready",
-            ticker=ticker,
-            bull_available=bull_memory.available,
-            bear_available=bear_memory.available,
-            judge_available=invest_judge_memory.available,
-            trader_available=trader_memory.available,
-            risk_available=risk_manager_memory.available
-        )
+        memories = create_ticker_memories(ticker, cleanup_previous=cleanup_previous)
     else:
         # LEGACY: Use global memories (will cause cross-contamination!)
         logger.warning(
@@ -241,11 +307,7 @@ def create_trading_graph(
                     "Use ticker-specific memories by passing ticker parameter."
         )
         # Manually create legacy instances since they are no longer global
-        bull_memory = FinancialSituationMemory("legacy_bull_memory")
-        bear_memory = FinancialSituationMemory("legacy_bear_memory")
-        invest_judge_memory = FinancialSituationMemory("legacy_invest_judge_memory")
-        trader_memory = FinancialSituationMemory("legacy_trader_memory")
-        risk_manager_memory = FinancialSituationMemory("legacy_risk_manager_memory")
+        memories = {role: FinancialSituationMemory(f"legacy_{role}") for role in MEMORY_ROLES}
     
     # Log graph creation
     logger.info(
@@ -255,7 +317,50 @@ def create_trading_graph(
         enable_memory=enable_memory,
         using_ticker_specific_memory=ticker is not None
     )
+    return _build_trading_graph(memories, quick_mode=quick_mode, ticker=ticker)
 
+# Compiled graphs shared across runs, keyed by (quick_mode, quick model, deep model)
+_compiled_graphs: Dict[tuple, Any] = {}
+
+def get_trading_graph(quick_mode: bool = False, checkpointer: Optional[Any] = None):
+    """
+    Return the process-wide compiled trading graph for this mode.
+
+    The graph, its LLM clients and callbacks are built on first use and reused
+    by every later run. It holds no ticker state: pass the run's memories via
+    TradingContext.ticker_memories (see create_ticker_memories) in the
+    "configurable" section of the invoke config.
+
+    Args:
+        quick_mode: If True, thinking agents use the quick model
+        checkpointer: Optional LangGraph checkpointer for this run (see
+                      checkpoints.open_checkpointer); the invoke config must
+                      then carry a thread_id
+
+    Returns:
+        Compiled LangGraph StateGraph ready for execution
+    """
+    key = (quick_mode, app_config.quick_think_llm, app_config.deep_think_llm)
+    graph = _compiled_graphs.get(key)
+    if graph is None:
+        logger.info("compiling_shared_trading_graph", quick_mode=quick_mode)
+        graph = _build_trading_graph({}, quick_mode=quick_mode)
+        _compiled_graphs[key] = graph
+    if checkpointer is not None:
+        # Shallow copy: shares nodes and LLM clients, only the checkpointer differs
+        return graph.copy(update={"checkpointer": checkpointer})
+    return graph
+
+def _build_trading_graph(memories: Dict[str, Any], quick_mode: bool = False, ticker: Optional[str] = None):
+    """
+    Build and compile the workflow.
+
+    Args:
+        memories: Role -> memory instances baked into the nodes. Empty for the
+                  shared graph; nodes then use TradingContext.ticker_memories.
+        quick_mode: If True, thinking agents use the quick model
+        ticker: Ticker for logging only (None for the shared graph)
+    """
     # Create LLMs with token tracking callbacks
     tracker = get_tracker()
 
@@ -285,30 +390,31 @@ def create_trading_graph(
     # Consultant LLM (OpenAI - optional, may be None if disabled/unavailable)
     consultant_llm = get_consultant_llm(callbacks=[TokenTrackingCallback("Consultant", tracker)], quick_mode=quick_mode)
 
-    # Nodes
-    market = create_analyst_node(market_llm, "market_analyst", toolkit.get_technical_tools(), "market_report")
-    social = create_analyst_node(social_llm, "sentiment_analyst", toolkit.get_sentiment_tools(), "sentiment_report")
-    news = create_analyst_node(news_llm, "news_analyst", toolkit.get_news_tools(), "news_report")
-    fund = create_analyst_node(fund_llm, "fundamentals_analyst", toolkit.get_fundamental_tools(), "fundamentals_report")
+    # Analyst branches (each with its own message scope and ToolNode)
+    market = create_analyst_branch(market_llm, "market_analyst", toolkit.get_technical_tools(), "market_report")
+    social = create_analyst_branch(social_llm, "sentiment_analyst", toolkit.get_sentiment_tools(), "sentiment_report")
+    news = create_analyst_branch(news_llm, "news_analyst", toolkit.get_news_tools(), "news_report")
+    fund = create_analyst_branch(fund_llm, "fundamentals_analyst", toolkit.get_fundamental_tools(), "fundamentals_report")
+    # Fundamentals needs the News report: both run in one node of the analysts' superstep
+    news_fund = chain_branches(news, fund)
 
-    cleaner = create_state_cleaner_node()
-    # Standard ToolNode initialized with all tools
-    tool_node = ToolNode(toolkit.get_all_tools())
+    # Speculative data prefetch (runs at graph entry alongside the analysts)
+    prefetch = create_prefetch_node()
 
     # Red-flag pre-screening validator (runs after fundamentals, before debate)
     validator = create_financial_health_validator_node()
 
     # Research & Execution Nodes (now using ticker-specific or legacy memories)
-    bull = create_researcher_node(bull_llm, bull_memory, "bull_researcher")
-    bear = create_researcher_node(bear_llm, bear_memory, "bear_researcher")
-    res_mgr = create_research_manager_node(res_mgr_llm, invest_judge_memory)
-    trader = create_trader_node(trader_llm, trader_memory)
+    bull = create_researcher_node(bull_llm, memories.get("bull_memory"), "bull_researcher")
+    bear = create_researcher_node(bear_llm, memories.get("bear_memory"), "bear_researcher")
+    res_mgr = create_research_manager_node(res_mgr_llm, memories.get("invest_judge_memory"))
+    trader = create_trader_node(trader_llm, memories.get("trader_memory"))
 
     # Risk Nodes
     risky = create_risk_debater_node(risky_llm, "risky_analyst")
     safe = create_risk_debater_node(safe_llm, "safe_analyst")
     neutral = create_risk_debater_node(neutral_llm, "neutral_analyst")
-    pm = create_portfolio_manager_node(pm_llm, risk_manager_memory)
+    pm = create_portfolio_manager_node(pm_llm, memories.get("risk_manager_memory"))
 
     # Consultant Node (optional - only if consultant_llm is available)
     consultant = None
@@ -328,12 +434,10 @@ def create_trading_graph(
 
     workflow = StateGraph(AgentState)
     
+    workflow.add_node("Data Prefetch", prefetch)
     workflow.add_node("Market Analyst", market)
     workflow.add_node("Social Analyst", social)
-    workflow.add_node("News Analyst", news)
-    workflow.add_node("Fundamentals Analyst", fund)
-    workflow.add_node("tools", tool_node)
-    workflow.add_node("Cleaner", cleaner)
+    workflow.add_node("News & Fundamentals Analysts", news_fund)
 
     # Add red-flag validator (pre-screening layer)
     workflow.add_node("Financial Validator", validator)
@@ -354,27 +458,21 @@ def create_trading_graph(
     workflow.add_node("Portfolio Manager", pm)
 
     # Flow
-    workflow.set_entry_point("Market Analyst")
-    
-    # 1. Market Flow
-    workflow.add_conditional_edges("Market Analyst", should_continue_analyst, {"tools": "tools", "continue": "Cleaner"})
-    
-    # 2. Social Flow (via cleaner nodes to reset history)
-    workflow.add_node("Clean1", cleaner)
-    workflow.add_edge("Cleaner", "Clean1")
-    workflow.add_edge("Clean1", "Social Analyst")
-    
-    workflow.add_conditional_edges("Social Analyst", should_continue_analyst, {"tools": "tools", "continue": "News Analyst"})
-    workflow.add_conditional_edges("News Analyst", should_continue_analyst, {"tools": "tools", "continue": "Fundamentals Analyst"})
-    workflow.add_conditional_edges("Fundamentals Analyst", should_continue_analyst, {"tools": "tools", "continue": "Financial Validator"})
-
-    # Tool Return Logic
-    workflow.add_conditional_edges("tools", route_tools, {
-        "Market Analyst": "Market Analyst",
-        "Social Analyst": "Social Analyst",
-        "News Analyst": "News Analyst",
-        "Fundamentals Analyst": "Fundamentals Analyst"
-    })
+    # 1. Analyst DAG: Market, Social and News start together; Fundamentals
+    #    needs the News report, so it follows News inside the same node
+    #    (critical path max(Market, Social, News + Fundamentals)).
+    workflow.add_edge(START, "Market Analyst")
+    workflow.add_edge(START, "Social Analyst")
+    workflow.add_edge(START, "News & Fundamentals Analysts")
+
+    # Prefetch starts the analysts' usual tool calls without waiting for their
+    # first LLM turn. It hands them to the run's tool cache and returns at once,
+    # so it adds nothing to the analysts' superstep; it writes no state
+    workflow.add_edge(START, "Data Prefetch")
+    workflow.add_edge("Data Prefetch", END)
+
+    # 2. Join barrier: the validator runs once every branch has reported
+    workflow.add_edge(["Market Analyst", "Social Analyst", "News & Fundamentals Analysts"], "Financial Validator")
 
     # Validator Routing (Red-Flag Detection)
     # - If REJECT: Skip debate, go straight to Portfolio Manager
@@ -417,17 +515,17 @@ def create_trading_graph(
     else:
         workflow.add_edge("Research Manager", "Trader")
 
-    workflow.add_edge("Trader", "Risky Analyst")
-    
-    # Risk Flow
-    workflow.add_edge("Risky Analyst", "Safe Analyst")
-    workflow.add_edge("Safe Analyst", "Neutral Analyst")
-    workflow.add_edge("Neutral Analyst", "Portfolio Manager")
+    # Risk Flow: the three debaters only read the trader plan and consultant
+    # review, so they fan out together and join before the Portfolio Manager
+    risk_panel = ["Risky Analyst", "Safe Analyst", "Neutral Analyst"]
+    for debater in risk_panel:
+        workflow.add_edge("Trader", debater)
+    workflow.add_edge(risk_panel, "Portfolio Manager")
     workflow.add_edge("Portfolio Manager", END)
 
     logger.info(
         "trading_graph_created",
         ticker=ticker,
-        using_ticker_specific_memory=ticker is not None
+        using_ticker_specific_memory=bool(memories)
     )
     return workflow.compile()
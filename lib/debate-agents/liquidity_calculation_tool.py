@@ -3,7 +3,7 @@ import pandas as pd
 import structlog
 from langchain_core.tools import tool
 from src.ticker_utils import normalize_ticker
-from src.data.fetcher import fetcher as market_data_fetcher
+from src.data.fetcher import get_fetcher
 from src.fx_normalization import get_fx_rate
 
 logger = structlog.get_logger(__name__)
@@ -94,7 +94,7 @@ async def calculate_liquidity_metrics(ticker: Annotated[Optional[str], "Stock ti
     
     try:
         # Use the robust fetcher for history
-        hist = await market_data_fetcher.get_historical_prices(normalized_symbol, period="3mo")
+        hist = await get_fetcher().get_historical_prices(normalized_symbol, period="3mo")
         
         if hist.empty:
             logger.warning("no_history_found", ticker=ticker)
@@ -153,9 +153,28 @@ def create_deep_thinking_llm(
         callbacks=callbacks, thinking_level=thinking_level
     )
 
-# Initialize default instances
-quick_thinking_llm = create_quick_thinking_llm()
-deep_thinking_llm = create_deep_thinking_llm()
+# Default instances (lazy initialization: importing this module builds no clients)
+_default_llms = {}
+
+def get_quick_thinking_llm() -> BaseChatModel:
+    """Shared default quick thinking LLM, created on first use."""
+    if "quick" not in _default_llms:
+        _default_llms["quick"] = create_quick_thinking_llm()
+    return _default_llms["quick"]
+
+def get_deep_thinking_llm() -> BaseChatModel:
+    """Shared default deep thinking LLM, created on first use."""
+    if "deep" not in _default_llms:
+        _default_llms["deep"] = create_deep_thinking_llm()
+    return _default_llms["deep"]
+
+def __getattr__(name: str):
+    # Backward compatibility: `from src.llms import quick_thinking_llm`
+    if name == "quick_thinking_llm":
+        return get_quick_thinking_llm()
+    if name == "deep_thinking_llm":
+        return get_deep_thinking_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ... (rest of the file is the same)
 def create_consultant_llm(
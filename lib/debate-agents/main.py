@@ -80,6 +80,17 @@ Examples:
   # Brief mode (header, summary, decision only)
   python -m src.main --ticker AAPL --brief
   
+  # Batch mode (concurrent runs sharing the RPM budget and data caches)
+  python -m src.main --tickers AAPL,NVDA,MSFT --quick
+  python -m src.main --tickers-file universe.txt
+
+  # Warm worker: preload once, then POST jobs to http://127.0.0.1:8765/jobs
+  python -m src.main --serve
+
+  # Resume the latest interrupted run for a ticker, or a specific run
+  python -m src.main --ticker AAPL --resume
+  python -m src.main --resume --run-id 3f2a9c1e7b4d
+
   # Custom models
   python -m src.main --ticker TSLA --quick-model gemini-2.5-flash --deep-model gemini-3-pro-preview
   
@@ -88,12 +99,47 @@ Examples:
         """
     )
     
-    parser.add_argument(
+    # Not required=True: "--resume --run-id X" also names the target (the run's own ticker)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
         "--ticker",
         type=str,
-        required=True,
         help="Stock ticker symbol to analyze (e.g., AAPL, NVDA, TSLA)"
     )
+
+    target.add_argument(
+        "--tickers",
+        type=str,
+        default=None,
+        help="Batch mode: comma-separated tickers analysed concurrently (e.g., AAPL,NVDA,0005.HK)"
+    )
+
+    target.add_argument(
+        "--tickers-file",
+        type=str,
+        default=None,
+        help="Batch mode: file with one ticker per line ('#' comments allowed)"
+    )
+
+    target.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a warm worker serving analysis jobs over local HTTP (see worker.py)"
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Worker mode: port to listen on (default: WORKER_PORT or 8765)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Batch/worker mode: tickers in flight (default: derived from GEMINI_RPM_LIMIT)"
+    )
     
     parser.add_argument(
         "--quick",
@@ -138,8 +184,25 @@ Examples:
         action="store_true",
         help="Disable persistent memory (ChromaDB)"
     )
+
+    parser.add_argument(
+        "--run-id",
+        type=str,
+        default=None,
+        help="Checkpoint id for this run (default: generated); with --resume, the run to continue"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume a failed or interrupted run from its last checkpoint "
+             "(the run given by --run-id, else the latest unfinished run for --ticker)"
+    )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not (args.ticker or args.tickers or args.tickers_file or args.serve or (args.resume and args.run_id)):
+        parser.error("one of --ticker, --tickers, --tickers-file, --serve or --resume --run-id is required")
+    return args
 
 
 def display_welcome_banner(ticker: str, quick_mode: bool):
@@ -198,6 +261,15 @@ def display_memory_statistics(ticker: str):
                 memory_table.add_row(display_name, available, total, status)
         
         console.print(memory_table)
+
+        from src.embedding_cache import get_embedding_cache
+        embedding_cache = get_embedding_cache()
+        if embedding_cache:
+            cache_stats = embedding_cache.get_stats()
+            console.print(
+                f"[dim]Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"(hit rate {cache_stats['hit_rate']:.0%}), {cache_stats['entries']} vectors stored[/dim]"
+            )
         console.print()
         
     except Exception as e:
@@ -362,10 +434,11 @@ def save_results_to_file(result: dict, ticker: str) -> Path:
         except Exception as e:
             logger.warning(f"Could not get memory stats: {e}")
     
-    # Get token usage stats
-    from src.token_tracker import get_tracker
-    tracker = get_tracker()
-    token_stats = tracker.get_total_stats()
+    # Token usage of this run (the shared tracker spans overlapping batch/worker runs)
+    token_stats = result.get("token_usage")
+    if token_stats is None:
+        from src.token_tracker import get_tracker
+        token_stats = get_tracker().get_total_stats()
 
     save_data = {
         "metadata": {
@@ -377,7 +450,8 @@ def save_results_to_file(result: dict, ticker: str) -> Path:
             "deep_model": config.deep_think_llm,
             "memory_enabled": config.enable_memory,
             "online_tools_enabled": config.online_tools,
-            "llm_provider": config.llm_provider
+            "llm_provider": config.llm_provider,
+            "run": result.get("run_info", {})
         },
         "token_usage": token_stats,
         "prompts_metadata": {
@@ -389,6 +463,7 @@ def save_results_to_file(result: dict, ticker: str) -> Path:
             "note": "system_message field contains the actual prompt text used by each agent"
         },
         "memory_statistics": memory_stats,
+        "tool_cache": result.get("tool_cache_stats", {}),
         "reports": {
             "market_report": result.get("market_report", ""),
             "sentiment_report": result.get("sentiment_report", ""),
@@ -435,131 +510,249 @@ def save_results_to_file(result: dict, ticker: str) -> Path:
     return filepath
 
 
-async def run_analysis(ticker: str, quick_mode: bool) -> Optional[dict]:
-    """Run the multi-agent analysis workflow."""
+async def run_analysis(
+    ticker: str,
+    quick_mode: bool,
+    run_id: Optional[str] = None,
+    resume: bool = False,
+    reset_tracker: bool = True
+) -> Optional[dict]:
+    """
+    Run the multi-agent analysis workflow.
+
+    With checkpoints enabled every run is stored under a run id. resume=True
+    continues run_id (or the latest unfinished run for ticker) from its last
+    completed step instead of starting over. Batch mode passes
+    reset_tracker=False so concurrent runs accumulate into one token summary;
+    each run's own usage is returned in result["token_usage"].
+    """
+    run_index = None
     try:
-        from src.graph import create_trading_graph, TradingContext
+        from src.graph import get_trading_graph, create_ticker_memories, TradingContext
         from src.agents import AgentState, InvestDebateState, RiskDebateState
         from langchain_core.messages import HumanMessage
         from src.token_tracker import get_tracker
+        from src.tool_cache import tool_cache_scope
+        from src.token_tracker import token_usage_scope
+        from src.checkpoints import (
+            CHECKPOINTS_AVAILABLE, RUN_COMPLETED, RUN_FAILED,
+            get_run_index, new_run_id, open_checkpointer
+        )
 
         # Reset token tracker for fresh analysis
-        tracker = get_tracker()
-        tracker.reset()
-
-        logger.info(f"Starting analysis for {ticker} (quick_mode={quick_mode})")
+        if reset_tracker:
+            tracker = get_tracker()
+            tracker.reset()
+
+        checkpointing = config.checkpoints_enabled and CHECKPOINTS_AVAILABLE
+        if resume and not checkpointing:
+            console.print("\n[bold red]Cannot resume:[/bold red] checkpoints are disabled or langgraph-checkpoint-sqlite is not installed\n")
+            return None
+        if checkpointing:
+            run_index = get_run_index()
+
+        initial_state = None
+        if resume:
+            record = run_index.get(run_id) if run_id else run_index.latest_unfinished(ticker)
+            if record is None:
+                console.print(f"\n[bold red]No resumable run found for {run_id or ticker}[/bold red]\n")
+                return None
+            # Resume with the run's own ticker, date and mode so the checkpointed state stays consistent
+            run_id = record["run_id"]
+            ticker = record["ticker"]
+            real_date = record["trade_date"]
+            quick_mode = bool(record["quick_mode"])
+            logger.info(f"Resuming run {run_id} for {ticker} ({real_date}, quick_mode={quick_mode})")
+        else:
+            logger.info(f"Starting analysis for {ticker} (quick_mode={quick_mode})")
 
-        # CRITICAL FIX: Enforce real-world date to prevent "Time Travel" hallucinations
-        # This overrides potentially stale system prompts or environment defaults
-        real_date = datetime.now().strftime("%Y-%m-%d")
+            # CRITICAL FIX: Enforce real-world date to prevent "Time Travel" hallucinations
+            # This overrides potentially stale system prompts or environment defaults
+            real_date = datetime.now().strftime("%Y-%m-%d")
 
-        # CRITICAL FIX: Fetch and verify company name BEFORE graph execution
-        # This prevents LLM hallucination when tickers are similar (e.g., 0291.HK vs 0293.HK)
-        company_name = ticker  # Default fallback
-        try:
-            import yfinance as yf
-            ticker_obj = yf.Ticker(ticker)
-            info = ticker_obj.info
-            company_name = info.get('longName') or info.get('shortName') or ticker
-            logger.info(
-                "company_name_verified",
-                ticker=ticker,
-                company_name=company_name,
-                source="yfinance"
-            )
-        except Exception as e:
-            logger.warning(
-                "company_name_fetch_failed",
-                ticker=ticker,
-                error=str(e),
-                fallback=ticker
+            # CRITICAL FIX: Fetch and verify company name BEFORE graph execution
+            # This prevents LLM hallucination when tickers are similar (e.g., 0291.HK vs 0293.HK)
+            company_name = ticker  # Default fallback
+            try:
+                from src.data.fetcher import get_fetcher
+                info = await get_fetcher().get_ticker_info(ticker)
+                company_name = info.get('longName') or info.get('shortName') or ticker
+                logger.info(
+                    "company_name_verified",
+                    ticker=ticker,
+                    company_name=company_name,
+                    source="yfinance"
+                )
+            except Exception as e:
+                logger.warning(
+                    "company_name_fetch_failed",
+                    ticker=ticker,
+                    error=str(e),
+                    fallback=ticker
+                )
+
+            initial_state = AgentState(
+                messages=[HumanMessage(content=f"Analyze {ticker} ({company_name}) for investment decision. Current Date: {real_date}")],
+                company_of_interest=ticker,
+                company_name=company_name,  # ADDED: Anchor verified company name in state
+                trade_date=real_date,
+                sender="user",
+                market_report="",
+                sentiment_report="",
+                news_report="",
+                fundamentals_report="",
+                investment_debate_state=InvestDebateState(
+                    bull_history="",
+                    bear_history="",
+                    history="",
+                    current_response="",
+                    judge_decision="",
+                    count=0
+                ),
+                investment_plan="",
+                trader_investment_plan="",
+                risk_debate_state=RiskDebateState(
+                    risky_history="",
+                    safe_history="",
+                    neutral_history="",
+                    history="",
+                    latest_speaker="",
+                    current_risky_response="",
+                    current_safe_response="",
+                    current_neutral_response="",
+                    judge_decision="",
+                    count=0
+                ),
+                final_trade_decision="",
+                tools_called={},
+                prompts_used={},
+                red_flags=[],
+                pre_screening_result=""
             )
 
-        graph = create_trading_graph(
-            ticker=ticker,  # BUG FIX #1: Pass ticker for isolation
-            cleanup_previous=True,  # BUG FIX #1: Cleanup to prevent contamination
-            max_debate_rounds=1 if quick_mode else 2,
-            max_risk_discuss_rounds=1,
-            enable_memory=config.enable_memory,
-            recursion_limit=100,
-            quick_mode=quick_mode  # Pass quick_mode for consultant LLM selection
-        )
-        
-        initial_state = AgentState(
-            messages=[HumanMessage(content=f"Analyze {ticker} ({company_name}) for investment decision. Current Date: {real_date}")],
-            company_of_interest=ticker,
-            company_name=company_name,  # ADDED: Anchor verified company name in state
-            trade_date=real_date,
-            sender="user",
-            market_report="",
-            sentiment_report="",
-            news_report="",
-            fundamentals_report="",
-            investment_debate_state=InvestDebateState(
-                bull_history="",
-                bear_history="",
-                history="",
-                current_response="",
-                judge_decision="",
-                count=0
-            ),
-            investment_plan="",
-            trader_investment_plan="",
-            risk_debate_state=RiskDebateState(
-                risky_history="",
-                safe_history="",
-                neutral_history="",
-                history="",
-                latest_speaker="",
-                current_risky_response="",
-                current_safe_response="",
-                current_neutral_response="",
-                judge_decision="",
-                count=0
-            ),
-            final_trade_decision="",
-            tools_called={},
-            prompts_used={},
-            red_flags=[],
-            pre_screening_result=""
-        )
-        
+        ticker_memories = None
+        if config.enable_memory:
+            from src.memory import check_embedding_health
+            # The first run in a process probes the embedding API; keep it off the loop
+            await asyncio.to_thread(check_embedding_health)
+            # BUG FIX #1: Ticker-scoped memories with cleanup to prevent contamination
+            # (a resumed run already cleaned up when it started)
+            ticker_memories = create_ticker_memories(ticker, cleanup_previous=not resume)
+
         context = TradingContext(
             ticker=ticker,
             trade_date=real_date,
             quick_mode=quick_mode,
             enable_memory=config.enable_memory,
             max_debate_rounds=1 if quick_mode else 2,
-            max_risk_rounds=1
+            max_risk_rounds=1,
+            ticker_memories=ticker_memories
         )
-        
-        logger.info(f"Starting multi-agent analysis for {ticker} on {real_date}")
-        
-        result = await graph.ainvoke(
-            initial_state,
-            config={
-                "recursion_limit": 100,
-                "configurable": {
-                    "context": context
-                }
+        run_config = {
+            "recursion_limit": 100,
+            "configurable": {
+                "context": context
             }
-        )
-        
+        }
+
+        async with open_checkpointer() as checkpointer:
+            # Compiled once per process; only the ticker memories are built per run
+            graph = get_trading_graph(quick_mode=quick_mode, checkpointer=checkpointer)
+            if checkpointer is not None:
+                if not resume:
+                    run_id = run_id or new_run_id()
+                    run_index.start(run_id, ticker, real_date, quick_mode)
+                run_config["configurable"]["thread_id"] = run_index.get(run_id)["thread_id"]
+                # Failing nodes now stop the run instead of finishing it with "Error:" outputs
+                context.resumable = True
+                logger.info(f"Checkpointing run {run_id} (resume with --resume --run-id {run_id})")
+
+            logger.info(f"Starting multi-agent analysis for {ticker} on {real_date}")
+
+            # A None input makes LangGraph continue the thread from its last checkpoint
+            # Tool results are memoized per run and shared by the parallel analysts
+            # Token usage is attributed to this run even when other runs overlap
+            with tool_cache_scope(ticker) as tool_cache, token_usage_scope(ticker) as run_usage:
+                result = await graph.ainvoke(initial_state, config=run_config)
+            result["tool_cache_stats"] = tool_cache.get_stats()
+            result["token_usage"] = run_usage.get_total_stats()
+        # What actually ran: a resumed run uses the checkpointed ticker and mode
+        result["run_info"] = {"run_id": run_id, "ticker": ticker, "quick_mode": quick_mode, "resumed": resume}
+
+        if run_index is not None and run_id:
+            run_index.set_status(run_id, RUN_COMPLETED)
+
         logger.info(f"Analysis completed for {ticker}")
 
         # Log token usage summary
-        from src.token_tracker import get_tracker
-        tracker = get_tracker()
-        tracker.print_summary()
+        if reset_tracker:
+            tracker = get_tracker()
+            tracker.print_summary()
 
         return result
 
     except Exception as e:
+        if run_index is not None and run_id and run_index.get(run_id):
+            run_index.set_status(run_id, RUN_FAILED, error=str(e))
+            console.print(f"\n[yellow]Run {run_id} was checkpointed; resume with --resume --run-id {run_id}[/yellow]")
         logger.error(f"Analysis failed for {ticker}: {str(e)}", exc_info=True)
         console.print(f"\n[bold red]Error during analysis:[/bold red] {str(e)}\n")
         return None
 
 
+async def run_batch_analysis(tickers: list, quick_mode: bool, concurrency: Optional[int] = None) -> int:
+    """
+    Analyse many tickers concurrently in this event loop (see batch.py).
+
+    Each ticker's results file is written as soon as its run completes, and
+    a batch_<timestamp>.jsonl summary line is appended for it.
+
+    Returns:
+        Number of tickers whose analysis failed
+    """
+    from src.batch import run_batch
+    from src.report_generator import QuietModeReporter
+    from src.token_tracker import get_tracker
+
+    tracker = get_tracker()
+    tracker.reset()
+
+    results_dir = Path(config.results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = results_dir / f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+    async def run_one(ticker: str) -> Optional[dict]:
+        return await run_analysis(ticker, quick_mode, reset_tracker=False)
+
+    async def on_result(ticker: str, result: Optional[dict], elapsed: float) -> None:
+        entry = {"ticker": ticker, "status": "failed", "seconds": round(elapsed, 1)}
+        if result:
+            # File writes and memory stats are blocking; keep the loop free for the other runs
+            filepath = await asyncio.to_thread(save_results_to_file, result, ticker)
+            decision = QuietModeReporter(ticker).extract_decision(result.get("final_trade_decision", "") or "")
+            entry.update(
+                status="completed",
+                decision=decision,
+                results_file=str(filepath),
+                tokens=result.get("token_usage", {}).get("total_tokens", 0)
+            )
+            console.print(f"[green]✓[/green] {ticker}: {decision} ({elapsed:.0f}s) → [cyan]{filepath}[/cyan]")
+        else:
+            console.print(f"[red]✗[/red] {ticker}: analysis failed ({elapsed:.0f}s)")
+        with open(summary_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    results = await run_batch(tickers, run_one, on_result=on_result, concurrency=concurrency)
+    tracker.print_summary()
+
+    failed = sum(1 for result in results.values() if result is None)
+    console.print(
+        f"\n[bold]Batch complete:[/bold] {len(results) - failed}/{len(results)} succeeded. "
+        f"Summary: [cyan]{summary_path}[/cyan]\n"
+    )
+    return failed
+
+
 async def main():
     """Main entry point for the application."""
     args = None
@@ -604,30 +797,50 @@ async def main():
                 console.print("Please check your .env file and ensure all required API keys are set.\n")
             sys.exit(1)
         
+        if args.serve:
+            from src.worker import serve, WORKER_HOST, WORKER_PORT
+            await serve(WORKER_HOST, args.port or WORKER_PORT, concurrency=args.concurrency)
+            return
+
+        if args.tickers or args.tickers_file:
+            from src.batch import load_tickers
+            tickers = load_tickers(args.tickers, args.tickers_file)
+            if not tickers:
+                console.print("\n[bold red]No tickers given for batch mode.[/bold red]\n")
+                sys.exit(1)
+            if not args.quiet and not args.brief:
+                display_welcome_banner(f"{len(tickers)} tickers (batch)", args.quick)
+            failed = await run_batch_analysis(tickers, args.quick, concurrency=args.concurrency)
+            sys.exit(1 if failed else 0)
+
         if not args.quiet and not args.brief:
-            display_welcome_banner(args.ticker, args.quick)
+            display_welcome_banner(args.ticker or f"run {args.run_id}", args.quick)
         
-        result = await run_analysis(args.ticker, args.quick)
+        result = await run_analysis(args.ticker, args.quick, run_id=args.run_id, resume=args.resume)
         
         if result:
+            # A resumed run reports under its own ticker and mode, not the CLI's
+            run_info = result.get("run_info", {})
+            ticker = run_info.get("ticker") or args.ticker
+            quick_mode = run_info.get("quick_mode", args.quick)
+
             if args.brief or args.quiet:
                 company_name = None
                 try:
-                    import yfinance as yf
-                    ticker_obj = yf.Ticker(args.ticker)
-                    info = ticker_obj.info
+                    from src.data.fetcher import get_fetcher
+                    info = await get_fetcher().get_ticker_info(ticker)
                     company_name = info.get('longName') or info.get('shortName')
                 except:
                     pass
                 
-                reporter = QuietModeReporter(args.ticker, company_name, quick_mode=args.quick)
+                reporter = QuietModeReporter(ticker, company_name, quick_mode=quick_mode)
                 report = reporter.generate_report(result, brief_mode=args.brief)
                 print(report)
             else:
-                display_results(result, args.ticker)
+                display_results(result, ticker)
             
             try:
-                filepath = save_results_to_file(result, args.ticker)
+                filepath = save_results_to_file(result, ticker)
                 if not args.quiet and not args.brief:
                     console.print(f"\n[green]Results saved to:[/green] [cyan]{filepath}[/cyan]\n")
             except Exception as e:
@@ -656,6 +869,9 @@ async def main():
         else:
             console.print(f"\n[bold red]Unexpected error:[/bold red] {str(e)}\n")
         sys.exit(1)
+    finally:
+        from src.data.http_session import close_http_session
+        await close_http_session()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,12 @@ FIXED: ChromaDB v0.6.0 compatibility (list_collections returns strings).
 UPDATED: Cleanup is now scoped to specific tickers to avoid wiping entire DB.
 FIXED: get_stats() now gracefully handles deleted collections (zombie memories).
 CLEANUP: Removed legacy global memory instances.
+UPDATED: Embeddings go through a content-addressed cache (see embedding_cache.py).
+UPDATED: One shared Chroma client and embeddings model per process; collections
+         open lazily and a live embedding health probe gates memory use.
+UPDATED: Ticker memories live in one collection per role, partitioned by
+         ticker_key/role metadata (see memory_migration.py for old data).
+UPDATED: Cleanup delegates to the retention engine (memory_retention.py).
 
 This module provides vector-based memory storage for financial debate history,
 allowing agents to learn from past analyses and decisions.
@@ -15,16 +21,200 @@ allowing agents to learn from past analyses and decisions.
 import asyncio
 import os
 import re
+import threading
+import time
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Any
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from src.config import config
+from src.embedding_cache import get_embedding_cache
 
 logger = structlog.get_logger(__name__)
 
+# Texts per batchEmbedContents request (Gemini API limit: 100)
+EMBED_BATCH_SIZE = int(os.environ.get("MEMORY_EMBED_BATCH_SIZE", "100"))
+# Characters kept per embedded text (token limit of the embedding model)
+EMBED_MAX_CHARS = 9000
+EMBEDDING_MODEL = "models/text-embedding-004"
+EMBEDDING_TASK_TYPE = "retrieval_document"
+EMBEDDING_HEALTH_PROBE = "initialization test"
+# A failed health probe disables memory until it is retried after this long
+EMBEDDING_HEALTH_RETRY_SECONDS = int(os.environ.get("MEMORY_EMBEDDING_HEALTH_RETRY_SECONDS", "300"))
+
+# Agent memory roles; each has one collection shared by all tickers
+MEMORY_ROLES = ("bull_memory", "bear_memory", "invest_judge_memory", "trader_memory", "risk_manager_memory")
+PARTITIONED_COLLECTION_PREFIX = "partitioned_"
+PARTITIONED_COLLECTIONS = {f"{PARTITIONED_COLLECTION_PREFIX}{role}" for role in MEMORY_ROLES}
+
+# Process-wide registries: Chroma clients per persist directory, embeddings
+# models per API key and open collection handles per name
+_registry_lock = threading.Lock()
+_chroma_clients: Dict[str, Any] = {}
+_embeddings_models: Dict[str, Any] = {}
+_collections: Dict[str, Any] = {}
+_embedding_health: Optional[bool] = None
+_embedding_health_checked_at = 0.0
+
+
+def get_chroma_client(path: Optional[str] = None):
+    """
+    Shared PersistentClient for the persist directory (opened once per process).
+
+    Returns:
+        The client, or None if ChromaDB is unavailable
+    """
+    path = str(path or config.chroma_persist_directory)
+    with _registry_lock:
+        if path in _chroma_clients:
+            return _chroma_clients[path]
+        try:
+            # CRITICAL: Disable telemetry to prevent ClientStartEvent errors
+            # Required for ChromaDB v0.5.x (may not be needed in v0.6.x+)
+            # Set multiple environment variables for maximum compatibility
+            os.environ["ANONYMIZED_TELEMETRY"] = "False"
+            os.environ["CHROMA_TELEMETRY_ENABLED"] = "False"
+
+            import chromadb
+            from chromadb.config import Settings
+
+            # Initialize persistent client with telemetry explicitly disabled
+            client = chromadb.PersistentClient(
+                path=path,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
+            )
+        except Exception as e:
+            logger.warning("chromadb_init_failed", error=str(e), persist_dir=path)
+            return None
+        _chroma_clients[path] = client
+        logger.info("chromadb_initialized", persist_dir=path)
+        return client
+
+
+def get_embeddings_model(api_key: str):
+    """
+    Shared GoogleGenerativeAIEmbeddings for the API key (no network call).
+
+    Returns:
+        The embeddings model, or None if it could not be created
+    """
+    with _registry_lock:
+        if api_key in _embeddings_models:
+            return _embeddings_models[api_key]
+        try:
+            # Imported here: the Google embeddings stack is heavy and only needed once memory is used
+            from langchain_google_genai import GoogleGenerativeAIEmbeddings
+            model = GoogleGenerativeAIEmbeddings(
+                model=EMBEDDING_MODEL,
+                google_api_key=api_key,
+                task_type=EMBEDDING_TASK_TYPE  # Optimized for semantic search
+            )
+        except Exception as e:
+            logger.warning("embeddings_init_failed", error=str(e))
+            return None
+        _embeddings_models[api_key] = model
+        logger.info("embeddings_initialized", model="text-embedding-004")
+        return model
+
+
+def get_collection(name: str):
+    """Open (or create) a collection once and reuse the handle."""
+    with _registry_lock:
+        collection = _collections.get(name)
+    if collection is not None:
+        return collection
+
+    client = get_chroma_client()
+    if client is None:
+        return None
+    collection = client.get_or_create_collection(
+        name=name,
+        metadata={
+            "description": f"Financial debate memory for {name}",
+            "embedding_model": "text-embedding-004",
+            "embedding_dimension": 768,
+            "created_at": datetime.now().isoformat(),
+            "version": "2.0"
+        }
+    )
+    with _registry_lock:
+        _collections[name] = collection
+    return collection
+
+
+def role_collection_name(role: str) -> str:
+    """Name of the collection holding every ticker's memories for role."""
+    return f"{PARTITIONED_COLLECTION_PREFIX}{role}"
+
+
+def partition_where(ticker_key: str, metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Chroma `where` clause restricting a query to one ticker's partition.
+
+    A "ticker" condition in metadata_filter must belong to the partition: a
+    different ticker yields None (nothing may match). A matching one is kept,
+    so documents are checked against their own ticker as well as the
+    partition they were filed under.
+    """
+    conditions: List[Dict[str, Any]] = [{"ticker_key": ticker_key}]
+    for key, value in (metadata_filter or {}).items():
+        if key == "ticker" and (not isinstance(value, str) or sanitize_ticker_for_collection(value) != ticker_key):
+            return None
+        conditions.append({key: value})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def forget_collection(name: str) -> None:
+    """Drop a cached handle (after its collection was deleted)."""
+    with _registry_lock:
+        _collections.pop(name, None)
+
+
+def mark_embedding_health(healthy: bool) -> None:
+    """Record the embedding API's health (any real API call settles it)."""
+    global _embedding_health, _embedding_health_checked_at
+    _embedding_health = healthy
+    _embedding_health_checked_at = time.monotonic()
+
+
+def check_embedding_health() -> bool:
+    """
+    Validate the embeddings API with a live probe call (never the embedding
+    cache), once per process. A successful embedding call anywhere in the
+    process also counts as a pass; a failure is re-probed after
+    EMBEDDING_HEALTH_RETRY_SECONDS, as it might be transient.
+
+    Memory instances are only available while this returns True.
+
+    Returns:
+        True if embeddings work (or were seen working), False otherwise
+    """
+    if _embedding_health or (
+        _embedding_health is False
+        and time.monotonic() - _embedding_health_checked_at < EMBEDDING_HEALTH_RETRY_SECONDS
+    ):
+        return _embedding_health
+
+    api_key = config.get_google_api_key()
+    embeddings = get_embeddings_model(api_key) if api_key else None
+    if embeddings is None:
+        mark_embedding_health(False)
+        return False
+
+    try:
+        probe = embeddings.embed_query(EMBEDDING_HEALTH_PROBE)
+        if not probe:
+            raise ValueError("Embedding test returned empty result")
+        mark_embedding_health(True)
+    except Exception as e:
+        logger.warning("embedding_health_check_failed", error=str(e), retry_seconds=EMBEDDING_HEALTH_RETRY_SECONDS)
+        mark_embedding_health(False)
+    return _embedding_health
+
 
 class FinancialSituationMemory:
     """
@@ -39,16 +229,30 @@ class FinancialSituationMemory:
     - Ticker-specific isolation to prevent cross-contamination
     """
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, ticker: Optional[str] = None, role: Optional[str] = None):
         """
         Initialize a memory collection.
+
+        Construction is cheap: the Chroma client and embeddings model are
+        shared process-wide, the collection is opened on first use, and the
+        embedding health probe (check_embedding_health) runs once per
+        process. The memory is only available if that probe passed.
+
+        With ticker and role, the memory is a partition of the role's shared
+        collection: writes are tagged with ticker_key/role metadata and reads
+        are restricted to this ticker. Without them it owns collection `name`.
         
         Args:
-            name: Unique identifier for this memory collection (e.g., "0005_HK_bull_memory")
+            name: Unique identifier for this memory (e.g., "0005_HK_bull_memory")
+            ticker: Stock ticker symbol of the partition (e.g., "0005.HK")
+            role: Memory role of the partition (e.g., "bull_memory")
         """
         self.name = name
+        self.ticker = ticker
+        self.role = role
+        self.ticker_key = sanitize_ticker_for_collection(ticker) if ticker else None
+        self.collection_name = role_collection_name(role) if ticker and role else name
         self.available = False
-        self.situation_collection = None
         self.embeddings = None
         
         # Check for API key via config
@@ -61,96 +265,39 @@ class FinancialSituationMemory:
             )
             return
         
-        # Initialize Google embeddings
-        try:
-            self.embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/text-embedding-004",
-                google_api_key=api_key,
-                task_type="retrieval_document"  # Optimized for semantic search
-            )
-            
-            # Validate embeddings work with a test query (Sync call for init)
-            try:
-                test_embedding = self.embeddings.embed_query("initialization test")
-                if not test_embedding or len(test_embedding) == 0:
-                    raise ValueError("Embedding test returned empty result")
-            except Exception as e:
-                logger.warning(f"Embedding initialization test failed: {e}")
-                # Don't fail completely, might be transient
-            
-            logger.info(
-                "embeddings_initialized",
-                model="text-embedding-004",
-                collection=name
-            )
-            
-        except Exception as e:
-            logger.warning(
-                "embeddings_init_failed",
-                error=str(e),
-                collection=name
-            )
+        self.embeddings = get_embeddings_model(api_key)
+        if self.embeddings is None or get_chroma_client() is None:
             return
-        
-        # Initialize ChromaDB
-        try:
-            # CRITICAL: Disable telemetry to prevent ClientStartEvent errors
-            # Required for ChromaDB v0.5.x (may not be needed in v0.6.x+)
-            # Set multiple environment variables for maximum compatibility
-            os.environ["ANONYMIZED_TELEMETRY"] = "False"
-            os.environ["CHROMA_TELEMETRY_ENABLED"] = "False"
-            
-            import chromadb
-            from chromadb.config import Settings
-            
-            # Initialize persistent client with telemetry explicitly disabled
-            self.chroma_client = chromadb.PersistentClient(
-                path=str(config.chroma_persist_directory),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
-            
-            # Create or get collection
-            self.situation_collection = self.chroma_client.get_or_create_collection(
-                name=self.name,
-                metadata={
-                    "description": f"Financial debate memory for {name}",
-                    "embedding_model": "text-embedding-004",
-                    "embedding_dimension": 768,
-                    "created_at": datetime.now().isoformat(),
-                    "version": "2.0"
-                }
-            )
-            
-            self.available = True
-            
-            # Log collection stats
-            count = self.situation_collection.count()
-            logger.info(
-                "chromadb_initialized",
-                collection=self.name,
-                persist_dir=str(config.chroma_persist_directory),
-                existing_documents=count
-            )
-            
-        except Exception as e:
+
+        if not check_embedding_health():
             logger.warning(
-                "chromadb_init_failed",
-                error=str(e),
+                "memory_disabled",
+                reason="embedding health check failed",
                 collection=name
             )
-            self.available = False
+            return
+
+        self.available = True
+
+    @property
+    def chroma_client(self):
+        """Shared process-wide Chroma client."""
+        return get_chroma_client()
+
+    @property
+    def situation_collection(self):
+        """Collection handle, opened (or created) on first use and then reused."""
+        if not self.available:
+            return None
+        return get_collection(self.collection_name)
+
+    @property
+    def partitioned(self) -> bool:
+        return self.ticker_key is not None and self.role is not None
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
-    )
     async def _get_embedding(self, text: str) -> List[float]:
         """
-        Get embedding vector for text with retry logic.
+        Get embedding vector for text, from the embedding cache when possible.
         
         Args:
             text: Text to embed (will be truncated to 9000 chars)
@@ -165,8 +312,28 @@ class FinancialSituationMemory:
             raise ValueError(f"Memory not available for {self.name}")
         
         # Truncate text to avoid token limits
-        truncated_text = text[:9000]
+        truncated_text = text[:EMBED_MAX_CHARS]
+
+        # A cached vector costs no API call and no rate-limiter token
+        # (the cache is SQLite, so it is read and written off the event loop)
+        cache = get_embedding_cache()
+        if cache:
+            cached = await asyncio.to_thread(cache.get, EMBEDDING_MODEL, EMBEDDING_TASK_TYPE, truncated_text)
+            if cached is not None:
+                return cached
 
+        embedding = await self._embed_query(truncated_text)
+        if cache:
+            await asyncio.to_thread(cache.put, EMBEDDING_MODEL, EMBEDDING_TASK_TYPE, truncated_text, embedding)
+        return embedding
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(Exception)
+    )
+    async def _embed_query(self, truncated_text: str) -> List[float]:
+        """Embed one (already truncated) text via the API, with retry logic."""
         # Import rate limiter here to avoid circular dependency
         # Use rate limiter to share RPM quota with LLM calls
         try:
@@ -181,8 +348,72 @@ class FinancialSituationMemory:
         if not embedding or len(embedding) == 0:
             raise ValueError("Empty embedding returned")
 
+        mark_embedding_health(True)
         return embedding
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type(Exception)
+    )
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed up to EMBED_BATCH_SIZE texts in one request, with retry logic.
+
+        One request takes one GLOBAL_RATE_LIMITER token, however many texts
+        it carries.
+        """
+        truncated = [text[:EMBED_MAX_CHARS] for text in texts]
+        try:
+            from src.llms import GLOBAL_RATE_LIMITER
+            async with GLOBAL_RATE_LIMITER:
+                embeddings = await self.embeddings.aembed_documents(truncated, batch_size=len(truncated))
+        except Exception:
+            # Same fallback as _get_embedding (rate limiter unavailable, e.g. in tests)
+            embeddings = await self.embeddings.aembed_documents(truncated, batch_size=len(truncated))
+
+        if len(embeddings) != len(texts) or any(not emb for emb in embeddings):
+            raise ValueError("Embedding batch returned missing vectors")
+        mark_embedding_health(True)
+        return embeddings
+
+    async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed many texts using batched requests chunked to EMBED_BATCH_SIZE.
+
+        Texts found in the embedding cache (and repeats within texts) are not
+        sent; only the remaining misses are batched.
+
+        Args:
+            texts: Texts to embed (each truncated to EMBED_MAX_CHARS chars)
+
+        Returns:
+            Embedding vectors, in input order
+
+        Raises:
+            Exception if a chunk still fails after retries
+        """
+        if not self.available or not self.embeddings:
+            raise ValueError(f"Memory not available for {self.name}")
+
+        truncated = [text[:EMBED_MAX_CHARS] for text in texts]
+        cache = get_embedding_cache()
+        if cache:
+            cached = await asyncio.to_thread(cache.get_many, EMBEDDING_MODEL, EMBEDDING_TASK_TYPE, truncated)
+        else:
+            cached = [None] * len(truncated)
+        missing = list(dict.fromkeys(text for text, vector in zip(truncated, cached) if vector is None))
+
+        fresh: Dict[str, List[float]] = {}
+        for start in range(0, len(missing), EMBED_BATCH_SIZE):
+            chunk = missing[start:start + EMBED_BATCH_SIZE]
+            vectors = await self._embed_batch(chunk)
+            fresh.update(zip(chunk, vectors))
+            if cache:
+                await asyncio.to_thread(cache.put_many, EMBEDDING_MODEL, EMBEDDING_TASK_TYPE, chunk, vectors)
+
+        return [vector if vector is not None else fresh[text] for text, vector in zip(truncated, cached)]
+
     async def add_situations(
         self, 
         situations: List[str], 
@@ -207,15 +438,16 @@ class FinancialSituationMemory:
             return False
         
         try:
-            # Generate embeddings for all situations
-            embeddings = []
-            for situation in situations:
-                emb = await self._get_embedding(situation)
-                embeddings.append(emb)
+            # Generate embeddings in batched requests (one rate-limiter token per chunk)
+            embeddings = await self._get_embeddings(situations)
             
-            # Prepare IDs (use timestamp + index)
-            timestamp = datetime.now().isoformat()
+            # Prepare IDs (use timestamp + index, prefixed by the partition)
+            now = datetime.now()
+            timestamp = now.isoformat()
+            timestamp_epoch = int(now.timestamp())
             ids = [f"{timestamp}_{i}" for i in range(len(situations))]
+            if self.partitioned:
+                ids = [f"{self.ticker_key}:{doc_id}" for doc_id in ids]
             
             # Prepare metadata
             if metadata is None:
@@ -225,14 +457,29 @@ class FinancialSituationMemory:
                 for meta in metadata:
                     if "timestamp" not in meta:
                         meta["timestamp"] = timestamp
-            
-            # Add to collection
-            self.situation_collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=situations,
-                metadatas=metadata
-            )
+            # Numeric copy of the timestamp for server-side retention filters
+            for meta in metadata:
+                meta.setdefault("timestamp_epoch", timestamp_epoch)
+
+            # Partition keys always win over caller metadata
+            if self.partitioned:
+                for meta in metadata:
+                    meta["ticker"] = self.ticker
+                    meta["ticker_key"] = self.ticker_key
+                    meta["role"] = self.role
+            
+            # Add to collection (chunked only beyond Chroma's max batch size)
+            max_batch = len(ids)
+            if hasattr(self.chroma_client, "get_max_batch_size"):
+                max_batch = self.chroma_client.get_max_batch_size()
+            for start in range(0, len(ids), max_batch):
+                end = start + max_batch
+                self.situation_collection.add(
+                    ids=ids[start:end],
+                    embeddings=embeddings[start:end],
+                    documents=situations[start:end],
+                    metadatas=metadata[start:end]
+                )
             
             logger.info(
                 "situations_added",
@@ -263,7 +510,9 @@ class FinancialSituationMemory:
         Args:
             query_text: Search query
             n_results: Number of results to return
-            metadata_filter: Optional metadata filter (e.g., {"ticker": "AAPL"})
+            metadata_filter: Optional metadata filter (e.g., {"ticker": "AAPL"}).
+                Partitioned memories only ever search their own ticker; a
+                filter naming another ticker returns no results.
             
         Returns:
             List of dicts with keys: document, metadata, distance
@@ -271,6 +520,12 @@ class FinancialSituationMemory:
         if not self.available:
             logger.debug("memory_query_skipped", collection=self.name)
             return []
+
+        if self.partitioned:
+            metadata_filter = partition_where(self.ticker_key, metadata_filter)
+            if metadata_filter is None:
+                logger.warning("memory_query_cross_ticker_blocked", collection=self.name)
+                return []
         
         try:
             # Get query embedding
@@ -368,104 +623,13 @@ class FinancialSituationMemory:
         
         Args:
             days_to_keep: Delete memories older than this many days (0 = delete ALL)
-            ticker: If provided, ONLY clean collections starting with this ticker's ID.
+            ticker: If provided, ONLY clean this ticker's memories.
                     If None, clean ALL collections in the database.
         
         Returns:
             Dict of collection_name -> documents_deleted
         """
-        results = {}
-        
-        try:
-            import chromadb
-            from chromadb.config import Settings
-            
-            client = chromadb.PersistentClient(
-                path=str(config.chroma_persist_directory),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
-            
-            collections = client.list_collections()
-            
-            # Calculate ticker prefix if provided
-            target_prefix = None
-            if ticker:
-                target_prefix = sanitize_ticker_for_collection(ticker)
-                logger.info(f"Scoping memory cleanup to ticker prefix: {target_prefix}")
-            
-            for collection_item in collections:
-                try:
-                    # --- FIX FOR CHROMA 0.6.0+ COMPATIBILITY ---
-                    if isinstance(collection_item, str):
-                        collection = client.get_collection(collection_item)
-                        collection_name = collection_item
-                    else:
-                        collection = collection_item
-                        collection_name = collection.name
-                    # -------------------------------------------
-                    
-                    # Filter by ticker if requested
-                    if target_prefix and not collection_name.startswith(target_prefix):
-                        continue
-
-                    if days_to_keep == 0:
-                        # Delete entire collection
-                        count = collection.count()
-                        client.delete_collection(collection_name)
-                        results[collection_name] = count
-                        logger.info(
-                            "collection_deleted",
-                            name=collection_name,
-                            documents_deleted=count
-                        )
-                    else:
-                        # Delete old documents
-                        from datetime import timedelta
-                        
-                        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-                        cutoff_iso = cutoff_date.isoformat()
-                        
-                        all_docs = collection.get()
-                        ids_to_delete = []
-                        
-                        if all_docs and 'metadatas' in all_docs:
-                            for doc_id, metadata in zip(all_docs['ids'], all_docs['metadatas']):
-                                timestamp = metadata.get('timestamp', '')
-                                if timestamp and timestamp < cutoff_iso:
-                                    ids_to_delete.append(doc_id)
-                        
-                        if ids_to_delete:
-                            collection.delete(ids=ids_to_delete)
-                            results[collection_name] = len(ids_to_delete)
-                            logger.info(
-                                "old_documents_deleted",
-                                collection=collection_name,
-                                count=len(ids_to_delete),
-                                days_kept=days_to_keep
-                            )
-                        else:
-                            results[collection_name] = 0
-                            
-                except Exception as e:
-                    # Try to get name for logging
-                    name = getattr(collection_item, 'name', str(collection_item))
-                    logger.error(
-                        "collection_cleanup_failed",
-                        collection=name,
-                        error=str(e)
-                    )
-                    results[name] = 0
-                    
-        except Exception as e:
-            logger.error(
-                "cleanup_all_memories_failed",
-                error=str(e)
-            )
-        
-        return results
+        return cleanup_all_memories(days=days_to_keep, ticker=ticker)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -482,7 +646,10 @@ class FinancialSituationMemory:
             }
         
         try:
-            count = self.situation_collection.count()
+            if self.partitioned:
+                count = len(self.situation_collection.get(where={"ticker_key": self.ticker_key}, include=[])["ids"])
+            else:
+                count = self.situation_collection.count()
             return {
                 "available": True,
                 "name": self.name,
@@ -495,6 +662,7 @@ class FinancialSituationMemory:
                     "collection_deleted_externally",
                     collection=self.name
                 )
+                forget_collection(self.collection_name)
                 return {
                     "available": False,
                     "name": self.name,
@@ -557,11 +725,15 @@ def create_memory_instances(ticker: str) -> Dict[str, FinancialSituationMemory]:
     """
     Create ticker-specific memory instances to prevent cross-contamination.
     
-    CRITICAL: This creates separate memory collections for each ticker.
+    CRITICAL: Each instance is a strictly isolated ticker partition of its
+    role's shared collection ("partitioned_bull_memory", ...). Instance names
+    keep the per-ticker form used by callers.
     Example: HSBC (0005.HK) gets "0005_HK_bull_memory", "0005_HK_bear_memory", etc.
              Canon (7915.T) gets "7915_T_bull_memory", "7915_T_bear_memory", etc.
     
-    This prevents Canon's analysis from contaminating HSBC's memory and vice versa.
+    This prevents Canon's analysis from contaminating HSBC's memory and vice
+    versa, while the number of collections stays fixed however many tickers
+    are analyzed.
     
     Args:
         ticker: Stock ticker symbol (e.g., "0005.HK", "AAPL", "7915.T")
@@ -572,18 +744,11 @@ def create_memory_instances(ticker: str) -> Dict[str, FinancialSituationMemory]:
     # Sanitize ticker for use in collection names
     safe_ticker = sanitize_ticker_for_collection(ticker)
     
-    memory_configs = [
-        f"{safe_ticker}_bull_memory",
-        f"{safe_ticker}_bear_memory",
-        f"{safe_ticker}_trader_memory",
-        f"{safe_ticker}_invest_judge_memory",
-        f"{safe_ticker}_risk_manager_memory"
-    ]
-    
     instances = {}
-    for name in memory_configs:
+    for role in MEMORY_ROLES:
+        name = f"{safe_ticker}_{role}"
         try:
-            instances[name] = FinancialSituationMemory(name)
+            instances[name] = FinancialSituationMemory(name, ticker=ticker, role=role)
             logger.info(
                 "ticker_memory_created",
                 ticker=ticker,
@@ -598,7 +763,7 @@ def create_memory_instances(ticker: str) -> Dict[str, FinancialSituationMemory]:
                 error=str(e)
             )
             # Create a disabled instance
-            instances[name] = FinancialSituationMemory(name)
+            instances[name] = FinancialSituationMemory(name, ticker=ticker, role=role)
     
     return instances
 
@@ -611,104 +776,16 @@ def cleanup_all_memories(days: int = 0, ticker: Optional[str] = None) -> Dict[st
     
     Args:
         days: Delete memories older than this many days (0 = delete ALL)
-        ticker: If provided, ONLY clean collections starting with this ticker's ID.
+        ticker: If provided, ONLY clean this ticker's memories (its partition
+                of the shared role collections and its per-ticker collections).
                 If None, clean ALL collections in the database.
     
     Returns:
         Dict of collection_name -> documents_deleted
     """
-    results = {}
-    
-    try:
-        import chromadb
-        from chromadb.config import Settings
-        
-        client = chromadb.PersistentClient(
-            path=str(config.chroma_persist_directory),
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
-        
-        collections = client.list_collections()
-        
-        # Calculate ticker prefix if provided
-        target_prefix = None
-        if ticker:
-            target_prefix = sanitize_ticker_for_collection(ticker)
-            logger.info(f"Scoping memory cleanup to ticker prefix: {target_prefix}")
-        
-        for collection_item in collections:
-            try:
-                # --- FIX FOR CHROMA 0.6.0+ COMPATIBILITY ---
-                if isinstance(collection_item, str):
-                    collection = client.get_collection(collection_item)
-                    collection_name = collection_item
-                else:
-                    collection = collection_item
-                    collection_name = collection.name
-                # -------------------------------------------
-                
-                # Filter by ticker if requested
-                if target_prefix and not collection_name.startswith(target_prefix):
-                    continue
-
-                if days == 0:
-                    # Delete entire collection
-                    count = collection.count()
-                    client.delete_collection(collection_name)
-                    results[collection_name] = count
-                    logger.info(
-                        "collection_deleted",
-                        name=collection_name,
-                        documents_deleted=count
-                    )
-                else:
-                    # Delete old documents
-                    from datetime import timedelta
-                    
-                    cutoff_date = datetime.now() - timedelta(days=days)
-                    cutoff_iso = cutoff_date.isoformat()
-                    
-                    all_docs = collection.get()
-                    ids_to_delete = []
-                    
-                    if all_docs and 'metadatas' in all_docs:
-                        for doc_id, metadata in zip(all_docs['ids'], all_docs['metadatas']):
-                            timestamp = metadata.get('timestamp', '')
-                            if timestamp and timestamp < cutoff_iso:
-                                ids_to_delete.append(doc_id)
-                    
-                    if ids_to_delete:
-                        collection.delete(ids=ids_to_delete)
-                        results[collection_name] = len(ids_to_delete)
-                        logger.info(
-                            "old_documents_deleted",
-                            collection=collection_name,
-                            count=len(ids_to_delete),
-                            days_kept=days
-                        )
-                    else:
-                        results[collection_name] = 0
-                        
-            except Exception as e:
-                # Try to get name for logging
-                name = getattr(collection_item, 'name', str(collection_item))
-                logger.error(
-                    "collection_cleanup_failed",
-                    collection=name,
-                    error=str(e)
-                )
-                results[name] = 0
-                
-    except Exception as e:
-        logger.error(
-            "cleanup_all_memories_failed",
-            error=str(e)
-        )
-    
-    return results
+    # Imported here: memory_retention builds on this module
+    from src.memory_retention import apply_retention
+    return apply_retention(days=days, ticker=ticker)
 
 
 def get_all_memory_stats() -> Dict[str, Dict[str, Any]]:
@@ -721,16 +798,9 @@ def get_all_memory_stats() -> Dict[str, Dict[str, Any]]:
     stats = {}
     
     try:
-        import chromadb
-        from chromadb.config import Settings
-        
-        client = chromadb.PersistentClient(
-            path=str(config.chroma_persist_directory),
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
-        )
+        client = get_chroma_client()
+        if client is None:
+            return stats
         
         collections = client.list_collections()
         
@@ -0,0 +1,215 @@
+"""
+Memory Layout Migration
+Moves memories from the old per-ticker collections ("0005_HK_bull_memory",
+...) into the partitioned role collections ("partitioned_bull_memory", ...)
+that create_memory_instances() now uses.
+
+Documents are copied page by page with their stored embeddings (nothing is
+re-embedded) and tagged with ticker_key/role metadata. A document's own
+`ticker` metadata decides its partition, so an entry that had leaked into
+another ticker's collection is filed under its real ticker; documents
+without one go to the collection's ticker and keep no `ticker` field (the
+sanitized collection prefix is not a symbol). IDs are prefixed with the
+ticker key and written with upsert, so an interrupted migration can simply
+be run again.
+
+--backfill-epochs adds the numeric `timestamp_epoch` field used by the
+retention engine (memory_retention.py) to documents that only carry the ISO
+`timestamp`, in every collection.
+
+Usage (from lib/debate-agents, with the package importable as `src`):
+    python -m src.memory_migration [--dry-run] [--delete-legacy] [--backfill-epochs]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import structlog
+
+from src.memory import (
+    MEMORY_ROLES, PARTITIONED_COLLECTIONS, forget_collection, get_chroma_client,
+    get_collection, role_collection_name, sanitize_ticker_for_collection
+)
+
+logger = structlog.get_logger(__name__)
+
+# Documents read and written per round trip
+MIGRATION_PAGE_SIZE = 500
+
+
+def parse_legacy_name(name: str) -> Optional[Tuple[str, str]]:
+    """(ticker_key, role) of a per-ticker collection name, or None for other collections."""
+    if name in PARTITIONED_COLLECTIONS:
+        return None
+    for role in MEMORY_ROLES:
+        suffix = f"_{role}"
+        if name.endswith(suffix) and len(name) > len(suffix):
+            ticker_key = name[:-len(suffix)]
+            # Non-ticker memories created without a ticker (graph legacy mode)
+            if ticker_key == "legacy":
+                return None
+            return ticker_key, role
+    return None
+
+
+def epoch_from_iso(timestamp: str) -> Optional[int]:
+    """Epoch seconds of an ISO timestamp (local time, as written), or None if unparsable."""
+    try:
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+def with_epoch(metadata: Dict) -> bool:
+    """Add timestamp_epoch from the ISO timestamp if missing; True if metadata changed."""
+    if "timestamp_epoch" in metadata:
+        return False
+    epoch = epoch_from_iso(metadata.get("timestamp", ""))
+    if epoch is None:
+        return False
+    metadata["timestamp_epoch"] = epoch
+    return True
+
+
+def migrate_collection(client, name: str, ticker_key: str, role: str, dry_run: bool = False) -> int:
+    """Copy one per-ticker collection into its role collection; returns documents copied."""
+    source = client.get_collection(name)
+    total = source.count()
+    if dry_run or total == 0:
+        return total
+
+    target = get_collection(role_collection_name(role))
+    copied = 0
+    for offset in range(0, total, MIGRATION_PAGE_SIZE):
+        page = source.get(
+            limit=MIGRATION_PAGE_SIZE,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        if not page["ids"]:
+            break
+
+        ids, metadatas = [], []
+        for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+            metadata = dict(metadata or {})
+            doc_ticker = metadata.get("ticker")
+            doc_key = sanitize_ticker_for_collection(doc_ticker) if isinstance(doc_ticker, str) and doc_ticker else ticker_key
+            if doc_key != ticker_key:
+                logger.warning("memory_migration_misfiled_document", collection=name, id=doc_id, ticker=doc_ticker)
+            metadata["ticker_key"] = doc_key
+            metadata["role"] = role
+            with_epoch(metadata)
+            ids.append(f"{doc_key}:{doc_id}")
+            metadatas.append(metadata)
+
+        target.upsert(
+            ids=ids,
+            embeddings=page["embeddings"],
+            documents=page["documents"],
+            metadatas=metadatas
+        )
+        copied += len(page["ids"])
+    return copied
+
+
+def migrate_legacy_collections(dry_run: bool = False, delete_legacy: bool = False) -> Dict[str, int]:
+    """
+    Migrate every per-ticker collection into the partitioned layout.
+
+    Args:
+        dry_run: Only report what would be migrated
+        delete_legacy: Delete each per-ticker collection once it is copied
+
+    Returns:
+        Dict of legacy collection name -> documents copied (or to copy)
+    """
+    client = get_chroma_client()
+    if client is None:
+        raise RuntimeError("ChromaDB is not available")
+
+    report: Dict[str, int] = {}
+    for item in client.list_collections():
+        # Chroma 0.6+ returns names, older versions collection objects
+        name = item if isinstance(item, str) else item.name
+        parsed = parse_legacy_name(name)
+        if parsed is None:
+            continue
+        ticker_key, role = parsed
+
+        try:
+            report[name] = migrate_collection(client, name, ticker_key, role, dry_run=dry_run)
+        except Exception as e:
+            logger.error("memory_migration_failed", collection=name, error=str(e))
+            continue
+
+        if delete_legacy and not dry_run:
+            client.delete_collection(name)
+            forget_collection(name)
+        logger.info(
+            "memory_collection_migrated",
+            collection=name,
+            ticker_key=ticker_key,
+            role=role,
+            documents=report[name],
+            dry_run=dry_run,
+            deleted=delete_legacy and not dry_run
+        )
+    return report
+
+
+def backfill_epoch_timestamps(dry_run: bool = False) -> Dict[str, int]:
+    """
+    Add timestamp_epoch to documents that lack it, in every collection.
+
+    Returns:
+        Dict of collection name -> documents updated (or to update)
+    """
+    client = get_chroma_client()
+    if client is None:
+        raise RuntimeError("ChromaDB is not available")
+
+    report: Dict[str, int] = {}
+    for item in client.list_collections():
+        name = item if isinstance(item, str) else item.name
+        collection = client.get_collection(name)
+        updated = 0
+        for offset in range(0, collection.count(), MIGRATION_PAGE_SIZE):
+            page = collection.get(limit=MIGRATION_PAGE_SIZE, offset=offset, include=["metadatas"])
+            ids, metadatas = [], []
+            for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+                metadata = dict(metadata or {})
+                if with_epoch(metadata):
+                    ids.append(doc_id)
+                    metadatas.append(metadata)
+            if ids and not dry_run:
+                collection.update(ids=ids, metadatas=metadatas)
+            updated += len(ids)
+        report[name] = updated
+        logger.info("memory_epochs_backfilled", collection=name, documents=updated, dry_run=dry_run)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be migrated without writing")
+    parser.add_argument("--delete-legacy", action="store_true", help="Delete per-ticker collections after copying")
+    parser.add_argument("--backfill-epochs", action="store_true", help="Also add timestamp_epoch to older documents")
+    args = parser.parse_args()
+
+    report = migrate_legacy_collections(dry_run=args.dry_run, delete_legacy=args.delete_legacy)
+    for name, count in sorted(report.items()):
+        print(f"{name:<64}{count:>8}")
+    verb = "to migrate" if args.dry_run else "migrated"
+    print(f"{len(report)} collections, {sum(report.values())} documents {verb}")
+
+    if args.backfill_epochs:
+        backfilled = backfill_epoch_timestamps(dry_run=args.dry_run)
+        verb = "to backfill" if args.dry_run else "backfilled"
+        print(f"{sum(backfilled.values())} documents {verb} with timestamp_epoch")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Memory Retention Engine
+Deletes expired memories without pulling collections into Python. Documents
+carry an epoch-second `timestamp_epoch` metadata field, so expiry is a
+server-side `where` filter: each round fetches at most
+MEMORY_RETENTION_BATCH_SIZE matching IDs (no documents, embeddings or
+metadata) and deletes them, until nothing matches. Collections are processed
+concurrently by a small thread pool, and a dry run reports what would be
+deleted without deleting it.
+
+Scope (as before): days=0 deletes everything in scope, days>0 deletes
+documents older than that; a ticker limits the run to that ticker's
+partition of the shared role collections and its old per-ticker
+collections.
+
+Documents written before epoch timestamps existed only have the ISO
+`timestamp` and are not matched by days>0 runs; backfill them once with
+`python -m src.memory_migration --backfill-epochs`.
+
+Usage (from lib/debate-agents, with the package importable as `src`):
+    python -m src.memory_retention --days 90 [--ticker 0005.HK] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from src.memory import (
+    MEMORY_ROLES, PARTITIONED_COLLECTIONS, forget_collection, get_chroma_client,
+    sanitize_ticker_for_collection
+)
+
+logger = structlog.get_logger(__name__)
+
+# IDs fetched and deleted per round trip
+RETENTION_BATCH_SIZE = int(os.environ.get("MEMORY_RETENTION_BATCH_SIZE", "500"))
+# Collections processed in parallel
+RETENTION_CONCURRENCY = int(os.environ.get("MEMORY_RETENTION_CONCURRENCY", "4"))
+
+SECONDS_PER_DAY = 86400
+
+
+def retention_where(days: int, ticker_key: Optional[str] = None, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """`where` clause for documents to delete (None = the whole collection)."""
+    conditions: List[Dict[str, Any]] = []
+    if ticker_key:
+        conditions.append({"ticker_key": ticker_key})
+    if days > 0:
+        cutoff = int((now or time.time()) - days * SECONDS_PER_DAY)
+        conditions.append({"timestamp_epoch": {"$lt": cutoff}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def count_matching(collection, where: Optional[Dict[str, Any]]) -> int:
+    """Count documents matching where, paging IDs only."""
+    if where is None:
+        return collection.count()
+    total, offset = 0, 0
+    while True:
+        ids = collection.get(where=where, limit=RETENTION_BATCH_SIZE, offset=offset, include=[])["ids"]
+        total += len(ids)
+        if len(ids) < RETENTION_BATCH_SIZE:
+            return total
+        offset += len(ids)
+
+
+def delete_matching(collection, where: Dict[str, Any]) -> int:
+    """Delete documents matching where in batches of RETENTION_BATCH_SIZE IDs."""
+    deleted = 0
+    while True:
+        ids = collection.get(where=where, limit=RETENTION_BATCH_SIZE, include=[])["ids"]
+        if not ids:
+            return deleted
+        collection.delete(ids=ids)
+        deleted += len(ids)
+
+
+def plan_retention(client, ticker: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+    """(collection name, ticker_key filter) pairs in scope for a run."""
+    ticker_key = sanitize_ticker_for_collection(ticker) if ticker else None
+    # Exact names, so BRK does not also match BRK_B's collections
+    legacy_names = {f"{ticker_key}_{role}" for role in MEMORY_ROLES} if ticker_key else set()
+    plan = []
+    for item in client.list_collections():
+        # Chroma 0.6+ returns names, older versions collection objects
+        name = item if isinstance(item, str) else item.name
+        if name in PARTITIONED_COLLECTIONS:
+            plan.append((name, ticker_key))
+        elif ticker_key is None or name in legacy_names:
+            plan.append((name, None))
+    return plan
+
+
+def _apply_to_collection(client, name: str, ticker_key: Optional[str], days: int, dry_run: bool, now: float) -> int:
+    collection = client.get_collection(name)
+    where = retention_where(days, ticker_key, now)
+    if dry_run:
+        return count_matching(collection, where)
+
+    if where is None:
+        # Everything goes: dropping the collection beats deleting its documents
+        count = collection.count()
+        client.delete_collection(name)
+        forget_collection(name)
+        logger.info("collection_deleted", name=name, documents_deleted=count)
+        return count
+
+    deleted = delete_matching(collection, where)
+    if deleted:
+        logger.info(
+            "old_documents_deleted",
+            collection=name,
+            ticker_key=ticker_key,
+            count=deleted,
+            days_kept=days
+        )
+    return deleted
+
+
+def apply_retention(days: int = 0, ticker: Optional[str] = None, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Apply the retention policy to every collection in scope.
+
+    Args:
+        days: Delete memories older than this many days (0 = delete ALL)
+        ticker: If provided, only this ticker's memories are affected
+        dry_run: Only count what would be deleted
+
+    Returns:
+        Dict of collection_name -> documents deleted (or that would be)
+    """
+    client = get_chroma_client()
+    if client is None:
+        return {}
+
+    start = time.monotonic()
+    now = time.time()
+    try:
+        plan = plan_retention(client, ticker)
+    except Exception as e:
+        logger.error("cleanup_all_memories_failed", error=str(e))
+        return {}
+
+    def run(entry: Tuple[str, Optional[str]]) -> int:
+        name, ticker_key = entry
+        try:
+            return _apply_to_collection(client, name, ticker_key, days, dry_run, now)
+        except Exception as e:
+            logger.error("collection_cleanup_failed", collection=name, error=str(e))
+            return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, RETENTION_CONCURRENCY)) as pool:
+        counts = list(pool.map(run, plan))
+
+    results = {name: count for (name, _), count in zip(plan, counts)}
+    logger.info(
+        "memory_retention_complete",
+        days=days,
+        ticker=ticker,
+        dry_run=dry_run,
+        collections=len(results),
+        documents=sum(results.values()),
+        seconds=round(time.monotonic() - start, 2)
+    )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--days", type=int, required=True, help="Keep memories newer than this many days (0 = delete ALL)")
+    parser.add_argument("--ticker", help="Only apply to this ticker's memories")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+    args = parser.parse_args()
+
+    report = apply_retention(days=args.days, ticker=args.ticker, dry_run=args.dry_run)
+    for name, count in sorted(report.items()):
+        print(f"{name:<64}{count:>8}")
+    verb = "would be deleted" if args.dry_run else "deleted"
+    print(f"{len(report)} collections, {sum(report.values())} documents {verb}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Speculative Data Prefetch
+Analysts only discover their data needs after a first LLM turn emits tool
+calls, so without help every fetch starts one LLM round-trip late. The
+prefetch node runs at graph entry, alongside the analysts, and starts the
+tool calls they almost always make for the ticker. It calls the same cached
+tool wrappers the analysts use (see tool_cache.py), so a later identical call
+either joins the in-flight fetch or is answered from the run's cache, and
+the fetcher / price store / search caches underneath are warm for the rest.
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+import structlog
+from langgraph.types import RunnableConfig
+
+from src.agents import get_context_from_config
+from src.tool_cache import current_tool_cache
+
+logger = structlog.get_logger(__name__)
+
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "true").lower() == "true"
+
+
+# Tools that spend Tavily search credits; not prefetched in quick mode
+TAVILY_TOOLS = {"get_news", "get_fundamental_analysis", "get_macroeconomic_news"}
+
+
+def prefetch_calls(ticker: str, trade_date: str, quick_mode: bool = False) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (tool name, args) the analysts are expected to issue for this run.
+
+    Price history is covered by get_technical_indicators: its 2y fetch fills
+    the price store, which then serves get_yfinance_data's shorter default
+    period (and any start/end inside it) as a local slice. Prefetching both
+    concurrently would only race two backfills for the same symbol.
+    """
+    calls = [
+        ("get_financial_metrics", {"ticker": ticker}),      # Fundamentals
+        ("get_technical_indicators", {"symbol": ticker}),   # Market (2y history)
+        ("calculate_liquidity_metrics", {"ticker": ticker}),  # Market
+        ("get_social_media_sentiment", {"ticker": ticker}), # Sentiment (StockTwits)
+        ("get_news", {"ticker": ticker}),                   # News + Fundamentals
+        ("get_fundamental_analysis", {"ticker": ticker}),   # Fundamentals
+    ]
+    if trade_date:
+        calls.append(("get_macroeconomic_news", {"trade_date": trade_date}))  # News
+    if quick_mode:
+        # Speculative searches are not worth Tavily credits on a quick run
+        calls = [(name, args) for name, args in calls if name not in TAVILY_TOOLS]
+    return calls
+
+
+def create_prefetch_node():
+    """
+    Factory for the graph-entry prefetch node.
+
+    The node writes nothing to the state; its effect is the warmed caches.
+    It only starts the fetches, as background work of the run's tool cache,
+    and returns at once, so it never holds up the analysts' superstep. The
+    tool cache scope logs their outcome and cancels any still running when
+    the run ends. Outside a scope there is no run cache to warm, so nothing
+    is prefetched.
+    """
+    async def prefetch_node(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        ticker = state.get("company_of_interest", "")
+        cache = current_tool_cache()
+        if not PREFETCH_ENABLED or not ticker or cache is None:
+            return {}
+
+        context = get_context_from_config(config)
+        quick_mode = bool(context and context.quick_mode)
+
+        from src.toolkit import toolkit
+        tools = {t.name: t for t in toolkit.get_all_tools()}
+        calls = [
+            (name, args) for name, args in prefetch_calls(ticker, state.get("trade_date", ""), quick_mode)
+            if name in tools
+        ]
+        if not calls:
+            return {}
+
+        for name, args in calls:
+            cache.spawn(tools[name].ainvoke(args), name=name)
+        logger.info(
+            "prefetch_started",
+            ticker=ticker,
+            tools=[name for name, _ in calls],
+            quick_mode=quick_mode
+        )
+        return {}
+
+    return prefetch_node
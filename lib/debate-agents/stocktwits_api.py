@@ -1,7 +1,8 @@
-import aiohttp
 import structlog
 from typing import Dict, Any, List
 
+from src.data.http_session import get_http_session
+
 logger = structlog.get_logger(__name__)
 
 class StockTwitsAPI:
@@ -32,24 +33,24 @@ class StockTwitsAPI:
             "User-Agent": "Mozilla/5.0 (compatible; TradingBot/1.0)"
         }
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    if response.status == 404:
-                        return {"error": "Symbol not found on StockTwits"}
-                    if response.status == 429:
-                        return {"error": "Rate limit exceeded"}
-                    if response.status != 200:
-                        return {"error": f"HTTP {response.status}"}
-                    
-                    data = await response.json()
-                    messages = data.get('messages', [])
-                    
-                    return self._process_messages(messages, clean_ticker)
-                    
-            except Exception as e:
-                logger.error("stocktwits_fetch_failed", ticker=ticker, error=str(e))
-                return {"error": str(e)}
+        session = get_http_session()
+        try:
+            async with session.get(url, headers=headers, timeout=10) as response:
+                if response.status == 404:
+                    return {"error": "Symbol not found on StockTwits"}
+                if response.status == 429:
+                    return {"error": "Rate limit exceeded"}
+                if response.status != 200:
+                    return {"error": f"HTTP {response.status}"}
+                
+                data = await response.json()
+                messages = data.get('messages', [])
+                
+                return self._process_messages(messages, clean_ticker)
+                
+        except Exception as e:
+            logger.error("stocktwits_fetch_failed", ticker=ticker, error=str(e))
+            return {"error": str(e)}
 
     def _process_messages(self, messages: List[Dict], ticker: str) -> Dict[str, Any]:
         """Analyze messages for Bullish/Bearish tags."""
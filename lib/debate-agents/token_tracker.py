@@ -1,12 +1,19 @@
 """
 Token usage tracking and cost estimation module.
 Provides comprehensive logging of LLM token consumption across all agents.
+
+The process-wide TokenTracker aggregates every call. Runs that overlap in one
+process (batch / worker mode) also open a token_usage_scope(); usage recorded
+inside it is attributed to that run as well, so each results file carries
+its own run's tokens rather than the process total.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 import structlog
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.outputs import LLMResult
@@ -124,6 +131,66 @@ class AgentTokenStats:
         self.total_cost_usd += usage.estimated_cost_usd
 
 
+def summarize_usage(agent_stats: Dict[str, AgentTokenStats], all_usages: List[TokenUsage], session_start: str) -> Dict[str, Any]:
+    """Aggregate statistics across agents (shared by the tracker and run scopes)."""
+    total_prompt = sum(stats.total_prompt_tokens for stats in agent_stats.values())
+    total_completion = sum(stats.total_completion_tokens for stats in agent_stats.values())
+    total_cost = sum(stats.total_cost_usd for stats in agent_stats.values())
+
+    return {
+        "total_calls": len(all_usages),
+        "total_agents": len(agent_stats),
+        "total_prompt_tokens": total_prompt,
+        "total_completion_tokens": total_completion,
+        "total_tokens": total_prompt + total_completion,
+        "total_cost_usd": total_cost,
+        "session_start": session_start,
+        "agents": {
+            name: {
+                "calls": stats.total_calls,
+                "prompt_tokens": stats.total_prompt_tokens,
+                "completion_tokens": stats.total_completion_tokens,
+                "total_tokens": stats.total_tokens,
+                "cost_usd": stats.total_cost_usd
+            }
+            for name, stats in agent_stats.items()
+        }
+    }
+
+
+class RunTokenUsage:
+    """Token usage attributed to one run (see token_usage_scope)."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.agent_stats: Dict[str, AgentTokenStats] = {}
+        self.all_usages: List[TokenUsage] = []
+        self.session_start = datetime.now().isoformat()
+
+    def add(self, usage: TokenUsage) -> None:
+        if usage.agent_name not in self.agent_stats:
+            self.agent_stats[usage.agent_name] = AgentTokenStats(agent_name=usage.agent_name)
+        self.agent_stats[usage.agent_name].add_usage(usage)
+        self.all_usages.append(usage)
+
+    def get_total_stats(self) -> Dict[str, Any]:
+        return summarize_usage(self.agent_stats, self.all_usages, self.session_start)
+
+
+_current_run_usage: ContextVar[Optional[RunTokenUsage]] = ContextVar("run_token_usage", default=None)
+
+
+@contextmanager
+def token_usage_scope(label: str = "") -> Iterator[RunTokenUsage]:
+    """Attribute LLM usage recorded inside the block (and its tasks) to one run."""
+    usage = RunTokenUsage(label)
+    token = _current_run_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_run_usage.reset(token)
+
+
 class TokenTracker:
     """
     Global token tracker that aggregates usage across all agents.
@@ -181,6 +248,10 @@ class TokenTracker:
         self.agent_stats[agent_name].add_usage(usage)
         self.all_usages.append(usage)
 
+        run_usage = _current_run_usage.get()
+        if run_usage is not None:
+            run_usage.add(usage)
+
         if not self._quiet_mode:
             logger.info(
                 "token_usage_recorded",
@@ -198,29 +269,17 @@ class TokenTracker:
 
     def get_total_stats(self) -> Dict[str, Any]:
         """Get aggregate statistics across all agents."""
-        total_prompt = sum(stats.total_prompt_tokens for stats in self.agent_stats.values())
-        total_completion = sum(stats.total_completion_tokens for stats in self.agent_stats.values())
-        total_cost = sum(stats.total_cost_usd for stats in self.agent_stats.values())
-
-        return {
-            "total_calls": len(self.all_usages),
-            "total_agents": len(self.agent_stats),
-            "total_prompt_tokens": total_prompt,
-            "total_completion_tokens": total_completion,
-            "total_tokens": total_prompt + total_completion,
-            "total_cost_usd": total_cost,
-            "session_start": self.session_start,
-            "agents": {
-                name: {
-                    "calls": stats.total_calls,
-                    "prompt_tokens": stats.total_prompt_tokens,
-                    "completion_tokens": stats.total_completion_tokens,
-                    "total_tokens": stats.total_tokens,
-                    "cost_usd": stats.total_cost_usd
-                }
-                for name, stats in self.agent_stats.items()
-            }
-        }
+        return summarize_usage(self.agent_stats, self.all_usages, self.session_start)
+
+    def tokens_in_window(self, seconds: float = 60.0) -> int:
+        """Tokens recorded (all agents and runs) in the last `seconds`."""
+        cutoff = (datetime.now() - timedelta(seconds=seconds)).isoformat()
+        total = 0
+        for usage in reversed(self.all_usages):
+            if usage.timestamp < cutoff:
+                break
+            total += usage.total_tokens
+        return total
 
     def reset(self):
         """Reset all tracking data (useful for new analysis runs)."""
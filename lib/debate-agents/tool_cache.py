@@ -0,0 +1,261 @@
+"""
+Run-Scoped Tool Result Cache
+Memoizes analyst tool calls for one graph run, keyed by (tool name,
+normalized args). News and Fundamentals analysts both call get_news, and
+LLMs often re-issue an identical call inside their tool loops; with the
+cache those repeats are served from memory, and identical calls that are
+in flight at the same time share a single execution (see SingleFlight).
+
+A run opens a scope with `tool_cache_scope()`; the scope lives in a
+ContextVar, so the parallel analyst branches of that run (tasks created
+inside the scope) share it while concurrent runs in the same process
+(batch / worker mode) stay isolated. Outside a scope the wrapped tools
+behave exactly like the originals.
+
+Background work started for the run (the graph-entry prefetch) is tracked
+on the cache with `spawn()`; whatever is still running when the scope
+closes is cancelled, so no task outlives its run.
+
+Optionally (TOOL_CACHE_TTL > 0) successful results are also persisted to
+SQLite under DATA_CACHE_DIR and reused across runs until they expire.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Iterator, List, Optional, Set
+
+import structlog
+
+from src.config import config
+from src.data.executor import run_blocking
+from src.data.singleflight import SingleFlight
+
+logger = structlog.get_logger(__name__)
+
+TOOL_CACHE_DB_FILENAME = "tool_results.sqlite"
+# Cross-run persistence of tool results in seconds (0 = run-scoped only)
+TOOL_CACHE_TTL_SECONDS = int(os.environ.get("TOOL_CACHE_TTL", "0"))
+
+# Arguments compared case-insensitively (symbols)
+CASE_INSENSITIVE_ARGS = {"ticker", "symbol"}
+
+# Tool outputs that report a failure rather than data; never cached
+ERROR_PREFIXES = ("Error", "Tool unavailable", "News tool unavailable")
+
+_current_cache: ContextVar[Optional["ToolResultCache"]] = ContextVar("tool_result_cache", default=None)
+
+
+def make_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Cache key for a tool call: name plus canonical JSON of the normalized args."""
+    normalized = {}
+    for name, value in args.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if name in CASE_INSENSITIVE_ARGS:
+                value = value.upper()
+        normalized[name] = value
+    return f"{tool_name}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+def is_cacheable(result: Any) -> bool:
+    """Only keep results that carry data (tools report failures as strings)."""
+    if result is None:
+        return False
+    if isinstance(result, str):
+        return bool(result.strip()) and not result.startswith(ERROR_PREFIXES)
+    return True
+
+
+class ToolResultStore:
+    """SQLite persistence for tool results shared across runs (TTL-bound)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Path(config.data_cache_dir) / TOOL_CACHE_DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_results ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM tool_results WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, result: Any, ttl: float) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tool_results (key, payload, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result, default=str), time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning("tool_result_store_write_failed", key=key[:120], error=str(e))
+
+
+_store: Optional[ToolResultStore] = None
+
+
+def get_tool_result_store() -> ToolResultStore:
+    """Process-wide ToolResultStore (lazy initialization)."""
+    global _store
+    if _store is None:
+        _store = ToolResultStore()
+    return _store
+
+
+class ToolResultCache:
+    """Tool results for one run, with in-flight deduplication."""
+
+    def __init__(self, label: str = "", persist_ttl: float = TOOL_CACHE_TTL_SECONDS):
+        self.label = label
+        self.persist_ttl = persist_ttl
+        self._results: Dict[str, Any] = {}
+        self._flight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'persisted_hits': 0}
+        self.background_stats = {'started': 0, 'finished': 0, 'failed': 0}
+
+    async def call(self, tool_name: str, args: Dict[str, Any], factory: Callable[[], Awaitable[Any]]) -> Any:
+        key = make_key(tool_name, args)
+        if key in self._results:
+            self.stats['hits'] += 1
+            logger.debug("tool_cache_hit", tool=tool_name, run=self.label)
+            return self._results[key]
+
+        # The caller that executes is counted in _execute; joiners count as coalesced
+        result, shared = await self._flight.do_shared(key, lambda: self._execute(key, factory))
+        if shared:
+            self.stats['coalesced'] += 1
+        return result
+
+    async def _execute(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        if self.persist_ttl > 0:
+            # SQLite I/O stays off the event loop
+            persisted = await run_blocking(get_tool_result_store().get, key)
+            if persisted is not None:
+                self.stats['persisted_hits'] += 1
+                self._results[key] = persisted
+                return persisted
+
+        self.stats['misses'] += 1
+        result = await factory()
+        if is_cacheable(result):
+            self._results[key] = result
+            if self.persist_ttl > 0:
+                await run_blocking(get_tool_result_store().put, key, result, self.persist_ttl)
+        return result
+
+    def spawn(self, coro: Coroutine[Any, Any, Any], name: str = "") -> asyncio.Task:
+        """Start run-scoped background work; cancelled if still running when the scope closes."""
+        task = asyncio.create_task(coro, name=name or None)
+        self._background.add(task)
+        self.background_stats['started'] += 1
+        task.add_done_callback(self._background_done)
+        return task
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if task.cancelled():
+            return
+        # Retrieve the outcome so a failure is logged here, not as "Task exception was never retrieved"
+        if task.exception() is not None:
+            self.background_stats['failed'] += 1
+            logger.debug("tool_cache_background_failed", run=self.label, task=task.get_name(), error=str(task.exception()))
+        else:
+            self.background_stats['finished'] += 1
+
+    def cancel_background(self) -> int:
+        """
+        Cancel background work still running; returns how many tasks were
+        cancelled. Tool executions it left in flight are cancelled too (they
+        are shielded from their callers' cancellation).
+        """
+        pending = [task for task in self._background if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self._flight.cancel_inflight()
+        return len(pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        calls = stats['hits'] + stats['misses'] + stats['coalesced'] + stats['persisted_hits']
+        stats['calls'] = calls
+        stats['hit_rate'] = round((calls - stats['misses']) / calls, 3) if calls else 0.0
+        return stats
+
+
+@contextmanager
+def tool_cache_scope(label: str = "") -> Iterator[ToolResultCache]:
+    """Open a tool cache for the code (and tasks) run inside the block."""
+    cache = ToolResultCache(label)
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
+        cancelled = cache.cancel_background()
+        logger.info(
+            "tool_cache_stats",
+            run=label,
+            background={**cache.background_stats, 'cancelled': cancelled},
+            **cache.get_stats()
+        )
+
+
+def current_tool_cache() -> Optional[ToolResultCache]:
+    """The active run's cache, or None outside a tool_cache_scope()."""
+    return _current_cache.get()
+
+
+def cached_tool(base):
+    """
+    Wrap a LangChain tool so calls go through the active run's cache.
+
+    The wrapper keeps the original name, description and args schema, so the
+    LLM sees the same tool.
+    """
+    from langchain_core.tools import StructuredTool
+
+    async def _run(**kwargs: Any) -> Any:
+        cache = _current_cache.get()
+        if cache is None:
+            return await base.ainvoke(kwargs)
+        return await cache.call(base.name, kwargs, lambda: base.ainvoke(kwargs))
+
+    return StructuredTool.from_function(
+        coroutine=_run,
+        name=base.name,
+        description=base.description,
+        args_schema=base.args_schema,
+    )
+
+
+_wrapped: Dict[str, Any] = {}
+
+
+def cached_tools(tools: List[Any]) -> List[Any]:
+    """Cached wrappers for tools, one shared wrapper per tool name."""
+    result = []
+    for base in tools:
+        if base.name not in _wrapped:
+            _wrapped[base.name] = cached_tool(base)
+        result.append(_wrapped[base.name])
+    return result
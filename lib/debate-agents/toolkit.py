@@ -22,30 +22,44 @@ from src.ticker_utils import normalize_ticker, normalize_company_name
 from src.enhanced_sentiment_toolkit import get_multilingual_sentiment_search
 from src.liquidity_calculation_tool import calculate_liquidity_metrics
 from src.stocktwits_api import StockTwitsAPI
-from src.data.fetcher import fetcher as market_data_fetcher
+from src.data.fetcher import get_fetcher
+from src.tool_cache import cached_tools
 
 logger = structlog.get_logger(__name__)
 stocktwits_api = StockTwitsAPI()
 
-# --- Modernized Tavily Import Pattern ---
-TAVILY_AVAILABLE = False
-tavily_tool = None
-try:
-    from langchain_tavily import TavilySearch
-    tavily_tool = TavilySearch(max_results=5)
-    TAVILY_AVAILABLE = True
-except ImportError:
+# --- Modernized Tavily Import Pattern (lazy: resolved on first search) ---
+_tavily_tool = None
+_tavily_resolved = False
+
+def get_tavily_tool():
+    """Tavily search tool, created on first use; None if no Tavily package is installed."""
+    global _tavily_tool, _tavily_resolved
+    if _tavily_resolved:
+        return _tavily_tool
+    _tavily_resolved = True
     try:
-        from langchain_community.tools import TavilySearchResults
-        tavily_tool = TavilySearchResults(max_results=5)
-        TAVILY_AVAILABLE = True
+        from langchain_tavily import TavilySearch
+        _tavily_tool = TavilySearch(max_results=5)
     except ImportError:
         try:
-            from langchain_community.tools.tavily_search import TavilySearchResults
-            tavily_tool = TavilySearchResults(max_results=5)
-            TAVILY_AVAILABLE = True
+            from langchain_community.tools import TavilySearchResults
+            _tavily_tool = TavilySearchResults(max_results=5)
         except ImportError:
-            logger.warning("Tavily tools not available. Install langchain-tavily or langchain-community.")
+            try:
+                from langchain_community.tools.tavily_search import TavilySearchResults
+                _tavily_tool = TavilySearchResults(max_results=5)
+            except ImportError:
+                logger.warning("Tavily tools not available. Install langchain-tavily or langchain-community.")
+    return _tavily_tool
+
+def __getattr__(name: str):
+    # Backward compatibility for module-level `tavily_tool` / `TAVILY_AVAILABLE`
+    if name == "tavily_tool":
+        return get_tavily_tool()
+    if name == "TAVILY_AVAILABLE":
+        return get_tavily_tool() is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 async def fetch_with_timeout(coroutine, timeout_seconds=10, error_msg="Timeout"):
     try:
@@ -69,7 +83,7 @@ async def extract_company_name_async(ticker_obj) -> str:
             
         # 2. Try standard info with timeout
         info = await fetch_with_timeout(
-            asyncio.to_thread(lambda: ticker_obj.info), 
+            get_fetcher().get_ticker_info(ticker_str),
             timeout_seconds=5, error_msg="Name Extraction"
         )
         
@@ -124,7 +138,7 @@ async def get_financial_metrics(ticker: Annotated[str, "Stock ticker symbol"]) -
     """Get key financial ratios and metrics."""
     try:
         normalized_symbol = normalize_ticker(ticker)
-        data = await market_data_fetcher.get_financial_metrics(normalized_symbol)
+        data = await get_fetcher().get_financial_metrics(normalized_symbol)
         
         if 'error' in data:
             return f"Data Unavailable: {data.get('error')}"
@@ -196,6 +210,7 @@ async def get_news(
     Get recent news using Tavily with ENHANCED multi-query strategy.
     Structures output for News Analyst prompt ingestion.
     """
+    tavily_tool = get_tavily_tool()
     if not tavily_tool: return "News tool unavailable."
     
     try:
@@ -261,7 +276,10 @@ async def get_yfinance_data(symbol: str, start_date: str = None, end_date: str =
     """Get historical stock price data."""
     try:
         normalized = normalize_ticker(symbol)
-        hist = await market_data_fetcher.get_historical_prices(normalized)
+        if start_date:
+            hist = await get_fetcher().get_historical_prices(normalized, start=start_date, end=end_date)
+        else:
+            hist = await get_fetcher().get_historical_prices(normalized)
         if hist.empty: return "No data"
         return hist.reset_index().to_csv(index=False)
     except Exception as e: return f"Error: {e}"
@@ -272,7 +290,7 @@ async def get_technical_indicators(symbol: str) -> str:
     try:
         normalized = normalize_ticker(symbol)
         # FIX: Fetch '2y' to ensure enough data for 200-day MA
-        hist = await market_data_fetcher.get_historical_prices(normalized, period="2y")
+        hist = await get_fetcher().get_historical_prices(normalized, period="2y")
         
         if hist.empty: return "No data"
         
@@ -311,6 +329,7 @@ async def get_social_media_sentiment(ticker: str) -> str:
 @tool
 async def get_macroeconomic_news(trade_date: str) -> str:
     """Get macroeconomic news context for a specific date."""
+    tavily_tool = get_tavily_tool()
     if not tavily_tool: return "Tool unavailable"
     return str(await tavily_tool.ainvoke({"query": f"macroeconomic news {trade_date}"}))
 
@@ -324,6 +343,7 @@ async def get_fundamental_analysis(ticker: Annotated[str, "Stock ticker symbol"]
     2. Check Success: If ticker search fails (insufficient data), do full fallback to Company Name search.
     3. Check ADR Miss: If ticker search succeeds but finds NO ADR info, perform SURGICAL append search using Company Name.
     """
+    tavily_tool = get_tavily_tool()
     if not tavily_tool: return "Tool unavailable"
     
     try:
@@ -386,21 +406,28 @@ async def get_fundamental_analysis(ticker: Annotated[str, "Stock ticker symbol"]
         return f"Error searching for fundamentals: {e}"
 
 class Toolkit:
-    def __init__(self):
-        self.market_data_fetcher = market_data_fetcher
+    """
+    Tool sets per analyst. Every tool is wrapped by the run-scoped result
+    cache (see tool_cache.py), so repeated identical calls within a run hit
+    the network once.
+    """
+
+    @property
+    def market_data_fetcher(self):
+        return get_fetcher()
     
-    def get_core_tools(self): return [get_yfinance_data, get_technical_indicators]
+    def get_core_tools(self): return cached_tools([get_yfinance_data, get_technical_indicators])
     
-    def get_technical_tools(self): return [
+    def get_technical_tools(self): return cached_tools([
         get_yfinance_data, 
         get_technical_indicators, 
         calculate_liquidity_metrics
-    ]
+    ])
     
-    def get_fundamental_tools(self): return [get_financial_metrics, get_news, get_fundamental_analysis] 
-    def get_sentiment_tools(self): return [get_social_media_sentiment, get_multilingual_sentiment_search]
-    def get_news_tools(self): return [get_news, get_macroeconomic_news]
-    def get_all_tools(self): return [
+    def get_fundamental_tools(self): return cached_tools([get_financial_metrics, get_news, get_fundamental_analysis])
+    def get_sentiment_tools(self): return cached_tools([get_social_media_sentiment, get_multilingual_sentiment_search])
+    def get_news_tools(self): return cached_tools([get_news, get_macroeconomic_news])
+    def get_all_tools(self): return cached_tools([
         get_yfinance_data, 
         get_technical_indicators, 
         get_financial_metrics, 
@@ -410,6 +437,6 @@ class Toolkit:
         calculate_liquidity_metrics, 
         get_macroeconomic_news, 
         get_fundamental_analysis
-    ]
+    ])
 
 toolkit = Toolkit()
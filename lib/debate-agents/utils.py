@@ -8,7 +8,7 @@ import structlog
 from typing import Callable, Any
 
 from src.config import Config
-from src.llms import quick_thinking_llm
+from src.llms import get_quick_thinking_llm
 from src.memory import FinancialSituationMemory
 from src.agents import AgentState
 
@@ -21,7 +21,7 @@ class SignalProcessor:
     """
     def __init__(self, config: Config):
         self.config = config
-        self.llm = quick_thinking_llm
+        self.llm = get_quick_thinking_llm()
 
     async def process_signal(self, full_signal: str) -> str:
         """
@@ -62,7 +62,7 @@ class Reflector:
     """
     def __init__(self, config: Config):
         self.config = config
-        self.llm = quick_thinking_llm
+        self.llm = get_quick_thinking_llm()
         self.reflection_prompt = """You are an expert financial analyst reviewing a past decision.
         Your goal is to generate a concise, one-sentence lesson from this experience to improve future performance.
 
@@ -0,0 +1,272 @@
+"""
+Warm Analysis Worker
+Long-lived process that preloads the analysis stack once and serves jobs over
+a local HTTP interface, so each request skips the cold start (langchain /
+langgraph / chromadb / yfinance imports, prompt loading, LLM clients, graph
+compilation, fetcher and Tavily setup) and reuses warm caches.
+
+Endpoints (JSON, bound to 127.0.0.1 by default):
+    POST   /jobs               {"ticker": "AAPL", "quick_mode": false} -> 202 {"job_id": ...}
+    GET    /jobs               list jobs
+    GET    /jobs/{id}          job status
+    GET    /jobs/{id}/result   saved results file of a completed job
+    DELETE /jobs/{id}          cancel a queued or running job
+    GET    /health             liveness and job counts
+
+Run with `python -m src.worker` or `python -m src.main --serve`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import structlog
+from aiohttp import web
+
+logger = structlog.get_logger(__name__)
+
+WORKER_HOST = os.environ.get("WORKER_HOST", "127.0.0.1")
+WORKER_PORT = int(os.environ.get("WORKER_PORT", "8765"))
+# Finished jobs kept for status polling before the oldest are dropped
+WORKER_MAX_FINISHED_JOBS = int(os.environ.get("WORKER_MAX_FINISHED_JOBS", "1000"))
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+
+
+@dataclass
+class Job:
+    """One analysis request and its lifecycle."""
+    job_id: str
+    ticker: str
+    quick_mode: bool = False
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    decision: Optional[str] = None
+    results_file: Optional[str] = None
+    error: Optional[str] = None
+    total_tokens: Optional[int] = None
+    cost_usd: Optional[float] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "ticker": self.ticker,
+            "quick_mode": self.quick_mode,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "decision": self.decision,
+            "results_file": self.results_file,
+            "error": self.error,
+            "total_tokens": self.total_tokens,
+            "cost_usd": self.cost_usd,
+        }
+
+
+def preload() -> None:
+    """
+    Import and build everything a run needs, once per process: both compiled
+    graphs (with their LLM clients), prompts, toolkit / Tavily, the fetcher
+    singleton and the memory stack.
+    """
+    start = time.monotonic()
+    from src.prompts import get_all_prompts
+    from src.graph import get_trading_graph
+    from src.toolkit import get_tavily_tool
+    from src.data.fetcher import get_fetcher
+    from src.config import config
+    from src.memory import check_embedding_health, get_chroma_client
+
+    get_all_prompts()
+    get_trading_graph(quick_mode=False)
+    get_trading_graph(quick_mode=True)
+    # Both are lazy singletons: importing the toolkit builds neither
+    get_fetcher()
+    get_tavily_tool()
+    if config.enable_memory:
+        get_chroma_client()
+        check_embedding_health()
+    logger.info("worker_preloaded", seconds=round(time.monotonic() - start, 2))
+
+
+class JobManager:
+    """Runs submitted jobs with bounded concurrency and tracks their state."""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        from src.batch import default_concurrency
+        self.concurrency = concurrency or default_concurrency()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.jobs: Dict[str, Job] = {}
+
+    def submit(self, ticker: str, quick_mode: bool = False) -> Job:
+        job = Job(job_id=uuid.uuid4().hex[:12], ticker=ticker.strip().upper(), quick_mode=quick_mode)
+        self.jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job))
+        self._prune()
+        logger.info("worker_job_submitted", job_id=job.job_id, ticker=job.ticker, quick_mode=quick_mode)
+        return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.jobs.get(job_id)
+        if job is not None and job.status not in FINISHED_STATES and job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def _run(self, job: Job) -> None:
+        from src.main import run_analysis, save_results_to_file
+        from src.report_generator import QuietModeReporter
+
+        try:
+            async with self._semaphore:
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                # Jobs overlap, so the shared tracker is never reset; each job's own
+                # usage comes back in result["token_usage"] (and its results file)
+                result = await run_analysis(job.ticker, job.quick_mode, reset_tracker=False)
+                if result is None:
+                    job.status = JOB_FAILED
+                    job.error = "Analysis failed (see worker logs)"
+                    return
+                filepath = await asyncio.to_thread(save_results_to_file, result, job.ticker)
+                job.results_file = str(filepath)
+                token_usage = result.get("token_usage", {})
+                job.total_tokens = token_usage.get("total_tokens")
+                job.cost_usd = token_usage.get("total_cost_usd")
+                job.decision = QuietModeReporter(job.ticker).extract_decision(
+                    result.get("final_trade_decision", "") or ""
+                )
+                job.status = JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            logger.error("worker_job_failed", job_id=job.job_id, ticker=job.ticker, error=str(e))
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.task = None
+            logger.info("worker_job_finished", job_id=job.job_id, ticker=job.ticker, status=job.status)
+
+    def _prune(self) -> None:
+        finished = [j for j in self.jobs.values() if j.status in FINISHED_STATES]
+        excess = len(finished) - WORKER_MAX_FINISHED_JOBS
+        if excess > 0:
+            for job in sorted(finished, key=lambda j: j.finished_at or 0)[:excess]:
+                del self.jobs[job.job_id]
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+
+def create_app(manager: JobManager) -> web.Application:
+    """aiohttp application exposing the job API."""
+    routes = web.RouteTableDef()
+
+    def _job_or_404(request: web.Request) -> Job:
+        job = manager.jobs.get(request.match_info["job_id"])
+        if job is None:
+            raise web.HTTPNotFound(text=json.dumps({"error": "unknown job_id"}), content_type="application/json")
+        return job
+
+    @routes.get("/health")
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "concurrency": manager.concurrency, "jobs": manager.counts()})
+
+    @routes.post("/jobs")
+    async def submit(request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, ValueError):
+            return web.json_response({"error": "body must be JSON"}, status=400)
+        ticker = str(body.get("ticker", "")).strip()
+        if not ticker:
+            return web.json_response({"error": "ticker is required"}, status=400)
+        job = manager.submit(ticker, quick_mode=bool(body.get("quick_mode", False)))
+        return web.json_response(job.to_dict(), status=202)
+
+    @routes.get("/jobs")
+    async def list_jobs(request: web.Request) -> web.Response:
+        return web.json_response([job.to_dict() for job in manager.jobs.values()])
+
+    @routes.get("/jobs/{job_id}")
+    async def status(request: web.Request) -> web.Response:
+        return web.json_response(_job_or_404(request).to_dict())
+
+    @routes.get("/jobs/{job_id}/result")
+    async def result(request: web.Request) -> web.Response:
+        job = _job_or_404(request)
+        if job.status != JOB_COMPLETED or not job.results_file:
+            return web.json_response({"error": f"job is {job.status}"}, status=409)
+        content = await asyncio.to_thread(lambda: json.loads(Path(job.results_file).read_text()))
+        return web.json_response(content)
+
+    @routes.delete("/jobs/{job_id}")
+    async def cancel(request: web.Request) -> web.Response:
+        job = manager.cancel(request.match_info["job_id"])
+        if job is None:
+            return web.json_response({"error": "unknown job_id"}, status=404)
+        return web.json_response(job.to_dict())
+
+    app = web.Application()
+    app.add_routes(routes)
+    return app
+
+
+async def serve(host: str = WORKER_HOST, port: int = WORKER_PORT, concurrency: Optional[int] = None) -> None:
+    """Preload the stack and serve jobs until cancelled."""
+    from src.data.http_session import close_http_session
+
+    preload()
+    manager = JobManager(concurrency=concurrency)
+    runner = web.AppRunner(create_app(manager))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    logger.info("worker_listening", host=host, port=port, concurrency=manager.concurrency)
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for job in list(manager.jobs.values()):
+            if job.task is not None:
+                job.task.cancel()
+        await runner.cleanup()
+        await close_http_session()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm analysis worker")
+    parser.add_argument("--host", default=WORKER_HOST, help=f"Bind address (default: {WORKER_HOST})")
+    parser.add_argument("--port", type=int, default=WORKER_PORT, help=f"Port (default: {WORKER_PORT})")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="Jobs run at once (default: derived from GEMINI_RPM_LIMIT)")
+    args = parser.parse_args()
+
+    from src.config import validate_environment_variables
+    validate_environment_variables()
+    try:
+        asyncio.run(serve(args.host, args.port, args.concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()